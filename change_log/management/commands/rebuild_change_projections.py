@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from change_log.models import Change, ChangeProjection
+
+
+class Command(BaseCommand):
+    help = "Rebuild the change projections from the change history"
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        ChangeProjection.objects.all().delete()
+
+        projections = {}
+
+        changes = Change.objects.order_by("timestamp", "pk").values_list(
+            "content_type_id", "object_id", "changes"
+        )
+
+        for content_type_id, object_id, changes in changes.iterator():
+            key = (content_type_id, object_id)
+
+            if key not in projections:
+                projections[key] = ChangeProjection(
+                    content_type_id=content_type_id,
+                    object_id=object_id,
+                    previous_values={},
+                )
+
+            projections[key].previous_values |= changes
+
+        ChangeProjection.objects.bulk_create(projections.values(), batch_size=500)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully rebuilt the change projections ({len(projections)})"
+            )
+        )
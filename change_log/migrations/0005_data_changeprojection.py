@@ -0,0 +1,39 @@
+# Generated by Django 3.2.13 on 2026-10-18 16:20
+
+from django.db import migrations
+
+
+def populate_change_projections(apps, schema_editor):
+    Change = apps.get_model("change_log", "Change")
+    ChangeProjection = apps.get_model("change_log", "ChangeProjection")
+
+    projections = {}
+
+    changes = Change.objects.order_by("timestamp", "pk").values_list(
+        "content_type_id", "object_id", "changes"
+    )
+
+    for content_type_id, object_id, changes in changes.iterator():
+        key = (content_type_id, object_id)
+
+        if key not in projections:
+            projections[key] = ChangeProjection(
+                content_type_id=content_type_id,
+                object_id=object_id,
+                previous_values={},
+            )
+
+        projections[key].previous_values |= changes
+
+    ChangeProjection.objects.bulk_create(projections.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("change_log", "0004_changeprojection"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_change_projections, migrations.RunPython.noop)
+    ]
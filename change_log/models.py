@@ -1,18 +1,21 @@
-from collections import ChainMap
+import copy
+import weakref
+from collections import ChainMap, defaultdict
 
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models, transaction
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_save, pre_save
 
+from change_log.signals import changes_applied
 from change_log.utils import get_instance_value
 
 
 class ChangeQuerySet(models.QuerySet):
     def get_changes(self):
         return ChainMap(
-            *self.all().order_by("-timestamp").values_list("changes", flat=True)
+            *self.all().order_by("-timestamp", "-pk").values_list("changes", flat=True)
         )
 
 
@@ -31,35 +34,268 @@ class Change(models.Model):
     objects = ChangeQuerySet.as_manager()
 
 
+class ChangeProjectionQuerySet(models.QuerySet):
+    def get_previous_values(self, instance) -> dict:
+        """Return the previous value of each field which has changed."""
+        previous_values = (
+            self.filter(
+                content_type=ContentType.objects.get_for_model(instance),
+                object_id=instance.pk,
+            )
+            .values_list("previous_values", flat=True)
+            .first()
+        )
+
+        return previous_values or {}
+
+    def apply_changes(self, changes: list[Change]) -> None:
+        """Merge the changes, oldest first, into the projections."""
+        keys = {(change.content_type_id, change.object_id) for change in changes}
+
+        # Another transaction might be creating the same projections, so any which
+        # already exist are skipped, and then they are all locked and updated.
+        self.bulk_create(
+            [
+                ChangeProjection(
+                    content_type_id=content_type_id,
+                    object_id=object_id,
+                    previous_values={},
+                )
+                for content_type_id, object_id in keys
+            ],
+            ignore_conflicts=True,
+        )
+
+        lookup = models.Q()
+
+        for content_type_id, object_id in keys:
+            lookup |= models.Q(content_type_id=content_type_id, object_id=object_id)
+
+        projections = {
+            (projection.content_type_id, projection.object_id): projection
+            for projection in self.select_for_update().filter(lookup)
+        }
+
+        for change in changes:
+            key = (change.content_type_id, change.object_id)
+            projections[key].previous_values |= change.changes
+
+        self.bulk_update(projections.values(), ["previous_values"])
+
+
+class ChangeProjection(models.Model):
+    """The merged previous values of an object, kept in step with its changes.
+
+    Reading this is a single lookup, where as `ChangeQuerySet.get_changes` has to
+    read the object's whole history.
+    """
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id"],
+                name="unique_change_projection",
+            )
+        ]
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+
+    previous_values = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+
+    objects = ChangeProjectionQuerySet.as_manager()
+
+
+class ChangeBuffer:
+    """Collect the changes made in a transaction and write them on commit.
+
+    Related objects are recorded by id, and their labels are resolved with one
+    lookup per related model when the buffer is flushed.
+    """
+
+    def __init__(self):
+        self.changes = []
+        self.flushed = False
+
+    def add(self, instance, changes, related_changes):
+        self.changes.append((instance, changes, related_changes))
+
+    def flush(self):
+        self.flushed = True
+
+        related_pks = defaultdict(set)
+
+        for _, _, related_changes in self.changes:
+            for related_model, pk in related_changes.values():
+                related_pks[related_model].add(pk)
+
+        labels = {
+            related_model: {
+                pk: str(obj)
+                for pk, obj in related_model._base_manager.in_bulk(pks).items()
+            }
+            for related_model, pks in related_pks.items()
+        }
+
+        with transaction.atomic():
+            new_changes = Change.objects.bulk_create(
+                [
+                    Change(
+                        content_type=ContentType.objects.get_for_model(instance),
+                        object_id=instance.pk,
+                        changes=changes
+                        | {
+                            name: labels[related_model].get(pk, str(pk))
+                            for name, (related_model, pk) in related_changes.items()
+                        },
+                    )
+                    for instance, changes, related_changes in self.changes
+                ]
+            )
+
+            ChangeProjection.objects.apply_changes(new_changes)
+
+            changes_applied.send(
+                sender=ChangeBuffer,
+                instances=[instance for instance, _, _ in self.changes],
+            )
+
+    @classmethod
+    def add_change(cls, instance, changes, related_changes):
+        """Add a change to the buffer for the current savepoint.
+
+        Each savepoint has its own buffer, flushed by an on commit callback added
+        inside the savepoint. Rolling the savepoint back discards the callback, and
+        so the changes made in it go too.
+        """
+        connection = transaction.get_connection()
+        # A block without a savepoint can only be rolled back along with the
+        # savepoint or transaction around it.
+        savepoint_id = next(
+            (sid for sid in reversed(connection.savepoint_ids) if sid is not None),
+            None,
+        )
+        # Only the on commit callbacks hold on to the buffers, the connection just
+        # finds them.
+        buffers = getattr(connection, "change_log_buffers", None)
+
+        if buffers is None:
+            buffers = connection.change_log_buffers = weakref.WeakValueDictionary()
+
+        buffer = buffers.get(savepoint_id)
+
+        if buffer is not None and not buffer.flushed:
+            buffer.add(instance, changes, related_changes)
+
+            return
+
+        buffer = cls()
+        buffer.add(instance, changes, related_changes)
+        buffers[savepoint_id] = buffer
+
+        # Outside of a transaction this flushes straight away.
+        transaction.on_commit(buffer.flush)
+
+
 class ChangeLogRelation(GenericRelation):
+    """A generic relation to the changes made to a model.
+
+    The concrete field values are snapshotted when an instance is loaded from the
+    database, so saving an instance can work out what changed without fetching the
+    previous row.
+    """
+
     # Django provides this method as a hook for modifying the model class.
     def contribute_to_class(self, cls, name, **kwargs):
         super().contribute_to_class(cls, name, **kwargs)
 
+        if cls._meta.abstract:
+            return
+
+        from_db = cls.from_db.__func__
+
+        def from_db_with_snapshot(model, db, field_names, values):
+            instance = from_db(model, db, field_names, values)
+            self.take_snapshot(instance)
+
+            return instance
+
+        cls.from_db = classmethod(from_db_with_snapshot)
+
+        refresh_from_db = cls.refresh_from_db
+
+        def refresh_from_db_with_snapshot(instance, using=None, fields=None):
+            refresh_from_db(instance, using=using, fields=fields)
+            self.take_snapshot(instance, fields=fields)
+
+        cls.refresh_from_db = refresh_from_db_with_snapshot
+
         pre_save.connect(self.pre_save, sender=cls, weak=False)
+        post_save.connect(self.post_save, sender=cls, weak=False)
+
+    @staticmethod
+    def take_snapshot(instance, fields=None):
+        snapshot = getattr(instance, "_change_log_snapshot", {})
+
+        for field in instance._meta.concrete_fields:
+            if fields is not None and not {field.name, field.attname} & set(fields):
+                continue
+
+            if field.attname in instance.__dict__:
+                # Copied so that changes made in place to JSON values are detected.
+                snapshot[field.attname] = copy.deepcopy(
+                    instance.__dict__[field.attname]
+                )
 
-    def pre_save(self, sender, instance, **kwargs):
+        instance._change_log_snapshot = snapshot
+
+    def get_snapshot(self, sender, instance):
+        snapshot = getattr(instance, "_change_log_snapshot", {})
+        attnames = [field.attname for field in sender._meta.concrete_fields]
+
+        # Some fields were deferred when the instance was loaded.
+        if any(attname not in snapshot for attname in attnames):
+            snapshot = sender._base_manager.values(*attnames).get(pk=instance.pk)
+
+        return snapshot
+
+    def pre_save(self, sender, instance, update_fields=None, **kwargs):
         is_new = instance._state.adding
 
         if is_new:
             return
 
-        prev_instance = sender.objects.get(pk=instance.pk)
+        snapshot = self.get_snapshot(sender, instance)
+
+        # An instance holding the previous values, used to get the display values.
+        prev_instance = copy.copy(instance)
+        prev_instance.__dict__.update(snapshot)
 
         changes = {}
+        related_changes = {}
 
-        for field in instance._meta.get_fields():
-            prev_value = get_instance_value(prev_instance, field)
-            next_value = get_instance_value(instance, field)
+        for field in sender._meta.concrete_fields:
+            if field.primary_key:
+                continue
 
-            if prev_value != next_value:
-                changes[field.name] = prev_value
+            if update_fields is not None and field.name not in update_fields:
+                continue
 
-        def add_change():
-            change = Change.objects.create(
-                content_object=instance,
-                changes=changes,
-            )
-            getattr(instance, self.name).add(change)
+            prev_value = snapshot[field.attname]
+
+            if prev_value == getattr(instance, field.attname):
+                continue
+
+            if prev_value is None:
+                changes[field.name] = None
+            elif field.is_relation:
+                related_changes[field.name] = (field.related_model, prev_value)
+            else:
+                changes[field.name] = get_instance_value(prev_instance, field)
+
+        if changes or related_changes:
+            ChangeBuffer.add_change(instance, changes, related_changes)
 
-        transaction.on_commit(add_change)
+    def post_save(self, sender, instance, update_fields=None, **kwargs):
+        self.take_snapshot(instance, fields=update_fields)
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+
+# Sent once a transaction's changes, and the projections of their objects, have been
+# written. Receives `instances`, the objects which were changed.
+changes_applied = Signal()
@@ -1,12 +1,14 @@
 from django.template.defaulttags import register
 
+from change_log.models import ChangeProjection
+
 
 @register.filter
 def get_changes(instance, field_name="change_log"):
     if not hasattr(instance, field_name):
         return {}
 
-    return getattr(instance, field_name).get_changes()
+    return ChangeProjection.objects.get_previous_values(instance)
 
 
 @register.filter
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ChartofaccountConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "chartofaccount"
+
+    def ready(self):
+        from chartofaccount import signals
+
+        signals.connect()
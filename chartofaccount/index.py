@@ -0,0 +1,160 @@
+import bisect
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+
+from chartofaccount.models import (
+    CostCentre,
+    DepartmentalGroup,
+    Directorate,
+    ProgrammeCode,
+    ProjectCode,
+)
+
+
+# Kept in the shared cache, so that every process moves on to a new version of the
+# index together, and gives the same ETags for it.
+VERSION_CACHE_KEY = "chartofaccount:index:version"
+# The index is rebuilt at least this often, in case the chart of accounts was
+# changed by a process which doesn't share our cache.
+MAX_AGE = 60 * 60
+
+Choice = tuple[str, str]
+
+
+class ChoiceSearch:
+    """Search choices by their code and label, for a typeahead.
+
+    Matches on the start of the code come first, found by bisecting the sorted
+    codes, followed by matches anywhere in the code or label. The scan for the
+    latter stops as soon as there are enough matches.
+    """
+
+    def __init__(self, choices: list[Choice]):
+        self.choices = sorted(choices, key=lambda x: x[0].casefold())
+        self.codes = [code.casefold() for code, _ in self.choices]
+        self.search_text = [
+            f"{code} {label}".casefold() for code, label in self.choices
+        ]
+
+    def __len__(self):
+        return len(self.choices)
+
+    def search(self, query: str, limit: int) -> list[Choice]:
+        query = query.strip().casefold()
+        matches = []
+
+        start = bisect.bisect_left(self.codes, query)
+
+        for i in range(start, len(self.codes)):
+            if len(matches) == limit or not self.codes[i].startswith(query):
+                break
+
+            matches.append(i)
+
+        if len(matches) < limit:
+            prefix_matches = set(matches)
+
+            for i, text in enumerate(self.search_text):
+                if query in text and i not in prefix_matches:
+                    matches.append(i)
+
+                    if len(matches) == limit:
+                        break
+
+        return [self.choices[i] for i in matches]
+
+
+@dataclass
+class ChartOfAccountIndex:
+    """The chart of accounts, held in memory for the dropdowns and typeaheads."""
+
+    version: int
+    built_at: float
+    groups: list[Choice]
+    # Keyed by group code.
+    directorates: dict[str, list[Choice]]
+    cost_centres: ChoiceSearch
+    programme_codes: ChoiceSearch
+    project_codes: ChoiceSearch
+    # Anything rendered from this version of the index, see `render`.
+    rendered: dict[str, str] = field(default_factory=dict)
+
+    def render(self, key: str, render_func: Callable[[], str]) -> str:
+        """Return what `render_func` renders, rendering it once per version."""
+        if key not in self.rendered:
+            self.rendered[key] = render_func()
+
+        return self.rendered[key]
+
+
+_index: Optional[ChartOfAccountIndex] = None
+
+
+def _get_choices(queryset) -> list[Choice]:
+    return [(obj.pk, str(obj)) for obj in queryset]
+
+
+def build_index(version: int) -> ChartOfAccountIndex:
+    directorates = defaultdict(list)
+
+    for directorate in Directorate.objects.order_by("directorate_name"):
+        directorates[directorate.group_id].append((directorate.pk, str(directorate)))
+
+    return ChartOfAccountIndex(
+        version=version,
+        built_at=time.monotonic(),
+        groups=_get_choices(DepartmentalGroup.objects.all()),
+        directorates=dict(directorates),
+        cost_centres=ChoiceSearch(_get_choices(CostCentre.objects.all())),
+        programme_codes=ChoiceSearch(_get_choices(ProgrammeCode.objects.all())),
+        project_codes=ChoiceSearch(_get_choices(ProjectCode.objects.all())),
+    )
+
+
+def get_version() -> int:
+    # Seeded with the time so a lost version key can't bring back an earlier
+    # version of the index.
+    return cache.get_or_set(VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+
+
+def get_index() -> ChartOfAccountIndex:
+    """Return the chart of accounts index, rebuilding it if it has changed.
+
+    Once the index is built, reading it only needs a cache lookup for its version.
+    """
+    global _index
+
+    version = get_version()
+    index = _index
+
+    if (
+        index is None
+        or index.version != version
+        or time.monotonic() - index.built_at > MAX_AGE
+    ):
+        index = _index = build_index(version)
+
+    return index
+
+
+def _increment_version() -> None:
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        # The version key has gone, so the next read will start a new version.
+        pass
+
+
+def invalidate_index(**kwargs) -> None:
+    global _index
+
+    _index = None
+    _increment_version()
+    # Another process could rebuild the index from what it reads before the change
+    # is committed, so the version is moved on again once it is.
+    transaction.on_commit(_increment_version)
@@ -0,0 +1,340 @@
+import csv
+import itertools
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import ProtectedError
+
+from chartofaccount.index import invalidate_index
+
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+# The number of errors shown before the rest are summarised.
+MAX_ERRORS = 20
+
+
+@dataclass
+class SyncResult:
+    inserted: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    retired: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+
+class Command(BaseCommand):
+    help = (
+        "Synchronise a chart of accounts model with a CSV or JSON lines file. "
+        "The columns are the model's field names, e.g. directorate_code, "
+        "directorate_name and group for a directorate."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "model",
+            choices=[
+                model._meta.model_name
+                for model in apps.get_app_config("chartofaccount").get_models()
+            ],
+        )
+        parser.add_argument("path", type=Path)
+        parser.add_argument(
+            "--format",
+            choices=sorted(set(FORMATS.values())),
+            help="The format of the file, by default taken from its extension",
+        )
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--delete-retired",
+            action="store_true",
+            help=(
+                "Delete the codes which are not in the file, unless they are used "
+                "outside of the chart of accounts"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        model = apps.get_model("chartofaccount", options["model"])
+        path = options["path"]
+        file_format = options["format"] or FORMATS.get(path.suffix.lower())
+
+        if file_format is None:
+            raise CommandError(f"Unknown file format for {path}, use --format")
+
+        with path.open(newline="", encoding="utf-8-sig") as f:
+            rows = read_csv(f) if file_format == "csv" else read_jsonl(f)
+
+            try:
+                with transaction.atomic():
+                    result = sync(
+                        model,
+                        rows,
+                        batch_size=options["batch_size"],
+                        delete_retired=options["delete_retired"],
+                    )
+
+                    if result.errors:
+                        # Roll back the batches which have been written.
+                        raise CommandError(self.format_errors(result.errors))
+            except ProtectedError as e:
+                raise CommandError(f"Retired codes are still in use: {e}") from e
+
+        # Bulk writes don't send the signals which invalidate the index.
+        invalidate_index()
+
+        self.report(model, result, verbosity=options["verbosity"])
+
+    def format_errors(self, errors: list[str]) -> str:
+        lines = errors[:MAX_ERRORS]
+
+        if len(errors) > MAX_ERRORS:
+            lines.append(f"... and {len(errors) - MAX_ERRORS} more")
+
+        return "Nothing was synchronised:\n" + "\n".join(lines)
+
+    def report(self, model, result: SyncResult, verbosity: int) -> None:
+        if verbosity > 1:
+            for label, codes in [
+                ("Inserted", result.inserted),
+                ("Updated", result.updated),
+                ("Deleted", result.deleted),
+            ]:
+                for code in codes:
+                    self.stdout.write(f"{label} {code}")
+
+        # Retired codes need following up, so they are always listed.
+        kept = sorted(set(result.retired) - set(result.deleted))
+
+        for code in kept:
+            self.stdout.write(self.style.WARNING(f"Retired {code}"))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully synchronised {model._meta.verbose_name_plural} "
+                f"({len(result.inserted)} inserted, {len(result.updated)} updated, "
+                f"{result.unchanged} unchanged, {len(result.retired)} retired, "
+                f"{len(result.deleted)} deleted)"
+            )
+        )
+
+
+def read_csv(f) -> Iterator[tuple[int, dict]]:
+    reader = csv.DictReader(f)
+
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_jsonl(f) -> Iterator[tuple[int, dict]]:
+    for line_num, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            row = e
+
+        yield line_num, row
+
+
+def sync(model, rows, *, batch_size: int, delete_retired: bool = False) -> SyncResult:
+    """Upsert the rows into the model, one batch at a time.
+
+    Only the codes seen so far are held in memory, so a file of any size can be
+    synchronised. Once a row fails validation nothing more is written, but the rest
+    of the rows are still validated so that every error can be reported.
+
+    Args:
+        rows: The line number and values of each row. A row which could not be
+            parsed is given as the exception raised.
+    """
+    result = SyncResult()
+    seen = set()
+    pk_name = model._meta.pk.attname
+    fields = model._meta.concrete_fields
+    foreign_keys = [f for f in fields if f.is_relation]
+    # The codes which foreign keys are known to refer to, by field.
+    known = {f.name: set() for f in foreign_keys}
+
+    rows = iter(rows)
+
+    while batch := list(itertools.islice(rows, batch_size)):
+        values_by_pk = {}
+        line_nums = {}
+
+        for line_num, row in batch:
+            try:
+                values = clean_row(fields, row)
+            except ValidationError as e:
+                result.errors.extend(
+                    f"Line {line_num}: {message}" for message in format_error(e)
+                )
+                continue
+
+            pk = values[pk_name]
+
+            if pk in seen:
+                result.errors.append(f"Line {line_num}: Duplicate {pk_name} {pk}")
+                continue
+
+            seen.add(pk)
+            values_by_pk[pk] = values
+            line_nums[pk] = line_num
+
+        for f in foreign_keys:
+            codes = {values[f.attname] for values in values_by_pk.values()}
+            codes -= known[f.name]
+            known[f.name] |= set(
+                f.related_model._base_manager.filter(pk__in=codes).values_list(
+                    "pk", flat=True
+                )
+            )
+
+            for pk, values in values_by_pk.items():
+                if values[f.attname] not in known[f.name]:
+                    result.errors.append(
+                        f"Line {line_nums[pk]}: Unknown {f.name} {values[f.attname]}"
+                    )
+
+        if not result.errors:
+            write_batch(model, values_by_pk, result)
+
+    if result.errors:
+        return result
+
+    result.retired = [
+        pk
+        for pk in model._base_manager.values_list("pk", flat=True).iterator()
+        if pk not in seen
+    ]
+
+    if delete_retired and result.retired:
+        in_use = get_codes_in_use(model, result.retired)
+        result.deleted = [pk for pk in result.retired if pk not in in_use]
+
+        for i in range(0, len(result.deleted), batch_size):
+            model._base_manager.filter(
+                pk__in=result.deleted[i : i + batch_size]
+            ).delete()
+
+    return result
+
+
+def clean_row(fields, row) -> dict:
+    """Return the cleaned values of the row by attname, raising if it isn't valid.
+
+    The fields are cleaned without building a model instance, as most rows of a
+    refresh don't change and are never saved. Foreign keys are only checked to
+    exist, for a whole batch at once.
+    """
+    if isinstance(row, Exception):
+        raise ValidationError(f"Invalid row: {row}")
+
+    if not isinstance(row, dict):
+        raise ValidationError("Invalid row: expected an object")
+
+    missing = [f.name for f in fields if f.name not in row]
+
+    if missing:
+        raise ValidationError(f"Missing {', '.join(missing)}")
+
+    values = {}
+    errors = {}
+
+    for f in fields:
+        value = row[f.name]
+
+        if isinstance(value, str):
+            value = value.strip()
+
+        if f.is_relation:
+            values[f.attname] = f.target_field.to_python(value)
+            continue
+
+        try:
+            values[f.attname] = f.clean(value, None)
+        except ValidationError as e:
+            errors[f.name] = e.error_list
+
+    if errors:
+        raise ValidationError(errors)
+
+    return values
+
+
+def format_error(error: ValidationError) -> list[str]:
+    if not hasattr(error, "error_dict"):
+        return error.messages
+
+    return [
+        f"{name}: {message}"
+        for name, messages in error.message_dict.items()
+        for message in messages
+    ]
+
+
+def write_batch(model, values_by_pk: dict, result: SyncResult) -> None:
+    attnames = [f.attname for f in model._meta.concrete_fields]
+    existing = {
+        row[0]: dict(zip(attnames, row))
+        for row in model._base_manager.filter(pk__in=values_by_pk).values_list(
+            *attnames
+        )
+    }
+
+    new_objs = []
+    changed_objs = []
+
+    for pk, values in values_by_pk.items():
+        if pk not in existing:
+            new_objs.append(model(**values))
+        elif values != existing[pk]:
+            changed_objs.append(model(**values))
+        else:
+            result.unchanged += 1
+
+    model._base_manager.bulk_create(new_objs)
+    model._base_manager.bulk_update(
+        changed_objs,
+        [f.name for f in model._meta.concrete_fields if not f.primary_key],
+        # Each row is a CASE branch, which Postgres evaluates in turn.
+        batch_size=250,
+    )
+
+    result.inserted.extend(obj.pk for obj in new_objs)
+    result.updated.extend(obj.pk for obj in changed_objs)
+
+
+def get_codes_in_use(model, codes: list[str]) -> set[str]:
+    """Return the codes which are referred to from outside the chart of accounts."""
+    in_use = set()
+
+    # Hidden relations are included, as most foreign keys to the chart of accounts
+    # have no related name.
+    relations = [
+        f
+        for f in model._meta.get_fields(include_hidden=True)
+        if f.auto_created and not f.concrete and (f.one_to_many or f.one_to_one)
+    ]
+
+    for relation in relations:
+        related_model = relation.related_model
+
+        if related_model._meta.app_label == model._meta.app_label:
+            continue
+
+        in_use |= set(
+            related_model._base_manager.filter(
+                **{f"{relation.field.name}__in": codes}
+            ).values_list(relation.field.attname, flat=True)
+        )
+
+    return in_use
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+
+from chartofaccount.index import invalidate_index
+from chartofaccount.models import (
+    CostCentre,
+    DepartmentalGroup,
+    Directorate,
+    ProgrammeCode,
+    ProjectCode,
+)
+
+
+def connect():
+    for model in [
+        DepartmentalGroup,
+        Directorate,
+        CostCentre,
+        ProgrammeCode,
+        ProjectCode,
+    ]:
+        post_save.connect(invalidate_index, sender=model)
+        post_delete.connect(invalidate_index, sender=model)
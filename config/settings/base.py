@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 import os
+from datetime import timedelta
 from pathlib import Path
 
 import dj_database_url
@@ -50,6 +51,14 @@ VCAP_SERVICES = env.json("VCAP_SERVICES", {})
 
 REDIS_CREDENTIALS = VCAP_SERVICES["redis"][0]["credentials"] if VCAP_SERVICES else None
 
+# VCAP application
+# See https://docs.cloudfoundry.org/devguide/deploy-apps/environment-variable.html#VCAP-APPLICATION
+
+VCAP_APPLICATION = env.json("VCAP_APPLICATION", {})
+
+# Changes with every deploy, e.g. so pages cached by browsers are not reused.
+APP_VERSION = VCAP_APPLICATION.get("application_version", "")
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
@@ -222,6 +231,22 @@ if REDIS_CREDENTIALS:
         )
     )
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Shared by every process, so that anything invalidated, such as a user's
+# permissions, is invalidated everywhere.
+if REDIS_CREDENTIALS:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": (
+                "rediss://:{password}@{host}:{port}/1?ssl_cert_reqs=required".format(
+                    **REDIS_CREDENTIALS
+                )
+            ),
+        }
+    }
+
 
 # GOV.UK Notify
 GOVUK_NOTIFY_API_KEY = env("GOVUK_NOTIFY_API_KEY")
@@ -236,12 +261,32 @@ GOVUK_NOTIFY_FINISHED_AMENDMENTS_REVIEW_TEMPLATE_ID = env(
 )
 GOVUK_NOTIFY_COMMENT_LEFT_TEMPLATE_ID = env("GOVUK_NOTIFY_COMMENT_LEFT_TEMPLATE_ID")
 GOVUK_NOTIFY_APPROVAL_TEMPLATE_ID = env("GOVUK_NOTIFY_APPROVAL_TEMPLATE_ID")
+# The number of notifications a worker sends at once.
+GOVUK_NOTIFY_MAX_WORKERS = env.int("GOVUK_NOTIFY_MAX_WORKERS", default=10)
+# The template for digests, which takes a `notifications` list. Until it is set,
+# every notification is sent straight away.
+GOVUK_NOTIFY_DIGEST_TEMPLATE_ID = env("GOVUK_NOTIFY_DIGEST_TEMPLATE_ID", default=None)
+# How often, in minutes, the digests are sent.
+NOTIFICATION_DIGEST_INTERVAL = env.int("NOTIFICATION_DIGEST_INTERVAL", default=60)
+
+CELERY_BEAT_SCHEDULE = {
+    "send-notification-digests": {
+        "task": "main.tasks.send_notification_digests",
+        "schedule": timedelta(minutes=NOTIFICATION_DIGEST_INTERVAL),
+    },
+}
+
+# Direct uploads
+# When files are stored in S3, CEST documents are uploaded straight to the bucket.
+CEST_DOCUMENT_MAX_UPLOAD_SIZE = env.int(
+    "CEST_DOCUMENT_MAX_UPLOAD_SIZE", default=10 * 1024 * 1024
+)
 
 # Authentication
 # https://github.com/uktrade/django-staff-sso-client
 
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",
+    "user.backends.ModelBackend",
     "authbroker_client.backends.AuthbrokerBackend",
 ]
 
@@ -12,4 +12,11 @@ DATABASES["default"] = dj_database_url.parse(
 
 CELERY_BROKER_URL = "redis://redis:6379/0"
 
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": "redis://redis:6379/1",
+    }
+}
+
 MEDIA_ROOT = BASE_DIR / "media"
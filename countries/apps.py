@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class CountriesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "countries"
+
+    def ready(self):
+        from countries import signals
+
+        signals.connect()
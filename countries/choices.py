@@ -0,0 +1,94 @@
+import datetime
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from countries.models import Country
+
+
+# Kept in the shared cache, so that an end dated country stops being offered by
+# every process at once.
+VERSION_CACHE_KEY = "countries:choices:version"
+# The list is rebuilt at least this often, in case the countries were changed by a
+# process which doesn't share our cache.
+MAX_AGE = 60 * 60
+
+Choice = tuple[str, str]
+
+
+@dataclass
+class CountryList:
+    version: int
+    built_at: float
+    # The reference ID, label and end date of each country, ordered by name.
+    countries: list[tuple[str, str, Optional[datetime.date]]]
+
+
+_country_list: Optional[CountryList] = None
+
+
+def build_country_list(version: int) -> CountryList:
+    return CountryList(
+        version=version,
+        built_at=time.monotonic(),
+        countries=[
+            (country.pk, str(country), country.end_date)
+            for country in Country.objects.order_by("name")
+        ],
+    )
+
+
+def get_version() -> int:
+    # Seeded with the time so a lost version key can't bring back an earlier
+    # version of the list.
+    return cache.get_or_set(VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+
+
+def get_country_choices(include: Optional[str] = None) -> list[Choice]:
+    """Return the countries which haven't ended as choices, ordered by name.
+
+    Args:
+        include: The reference ID of a country to include even if it has ended,
+            such as the one already selected.
+    """
+    global _country_list
+
+    version = get_version()
+    country_list = _country_list
+
+    if (
+        country_list is None
+        or country_list.version != version
+        or time.monotonic() - country_list.built_at > MAX_AGE
+    ):
+        country_list = _country_list = build_country_list(version)
+
+    today = timezone.localdate()
+
+    return [
+        (pk, label)
+        for pk, label, end_date in country_list.countries
+        if end_date is None or end_date > today or pk == include
+    ]
+
+
+def _increment_version() -> None:
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        # The version key has gone, so the next read will start a new version.
+        pass
+
+
+def invalidate_country_choices(**kwargs) -> None:
+    global _country_list
+
+    _country_list = None
+    _increment_version()
+    # Another process could rebuild the list from what it reads before the change
+    # is committed, so the version is moved on again once it is.
+    transaction.on_commit(_increment_version)
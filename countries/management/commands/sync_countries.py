@@ -0,0 +1,219 @@
+import datetime
+import itertools
+import json
+from json.decoder import WHITESPACE
+from pathlib import Path
+from typing import Any, Iterator
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from countries.choices import invalidate_country_choices
+from countries.models import Country
+
+
+CHUNK_SIZE = 64 * 1024
+BATCH_SIZE = 500
+
+
+class JSONStream:
+    """Decode a JSON document from a file a value at a time.
+
+    Only the value being decoded and the rest of the current chunk are held in
+    memory, so the arrays in large documents can be iterated over.
+    """
+
+    decoder = json.JSONDecoder()
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ""
+        self.pos = 0
+
+    def _read(self) -> bool:
+        chunk = self.f.read(CHUNK_SIZE)
+
+        if not chunk:
+            return False
+
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+
+        return True
+
+    def peek(self) -> str:
+        """Return the next character which isn't whitespace."""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+
+            if not self._read():
+                raise ValueError("Unexpected end of document")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at {self.buffer[self.pos:][:20]!r}")
+
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The value may carry on in the next chunk.
+                if self._read():
+                    continue
+
+                raise
+
+            # So may a number.
+            if end == len(self.buffer) and self._read():
+                continue
+
+            self.pos = end
+
+            return value
+
+    def iter_array(self, key: str) -> Iterator[Any]:
+        """Iterate over the items of an array in the top level object."""
+        self.expect("{")
+
+        while self.peek() != "}":
+            name = self.value()
+            self.expect(":")
+
+            if name != key:
+                self.value()
+
+                if self.peek() == ",":
+                    self.expect(",")
+
+                continue
+
+            self.expect("[")
+
+            if self.peek() == "]":
+                return
+
+            while True:
+                yield self.value()
+
+                if self.peek() == "]":
+                    return
+
+                self.expect(",")
+
+        raise ValueError(f"Missing {key!r}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Synchronise the countries with the Data Workspace dataset, end dating the "
+        "countries which have been removed from it"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("src", type=Path)
+
+    def handle(self, *args, **options):
+        src: Path = options["src"]
+
+        with src.open() as f:
+            # There should be a top level "data" key.
+            objs = JSONStream(f).iter_array("data")
+
+            try:
+                with transaction.atomic():
+                    inserted, updated, ended = self._sync(objs)
+            except (ValueError, KeyError) as e:
+                raise CommandError(f"Invalid dataset: {e!r}") from e
+
+        invalidate_country_choices()
+
+        for name in ended:
+            self.stdout.write(self.style.WARNING(f"Ended {name}"))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully synchronised the countries ({inserted} inserted, "
+                f"{updated} updated, {len(ended)} ended)"
+            )
+        )
+
+    @classmethod
+    def _sync(cls, objs) -> tuple[int, int, list[str]]:
+        inserted = updated = 0
+        seen = set()
+        countries = (
+            country_values
+            for obj in objs
+            if (country_values := cls._get_country_values(obj))
+        )
+
+        while batch := list(itertools.islice(countries, BATCH_SIZE)):
+            new_countries, changed_countries = cls._split_batch(batch)
+
+            Country.objects.bulk_create(new_countries)
+            Country.objects.bulk_update(
+                changed_countries,
+                [f.name for f in Country._meta.concrete_fields if not f.primary_key],
+            )
+
+            inserted += len(new_countries)
+            updated += len(changed_countries)
+            seen.update(values["reference_id"] for values in batch)
+
+        removed = Country.objects.filter(end_date__isnull=True).exclude(pk__in=seen)
+        ended = list(removed.order_by("name").values_list("name", flat=True))
+        removed.update(end_date=timezone.localdate())
+
+        return inserted, updated, ended
+
+    @staticmethod
+    def _split_batch(batch) -> tuple[list[Country], list[Country]]:
+        attnames = [f.attname for f in Country._meta.concrete_fields]
+        existing = {
+            row[0]: dict(zip(attnames, row))
+            for row in Country.objects.filter(
+                pk__in=[values["reference_id"] for values in batch]
+            ).values_list(*attnames)
+        }
+
+        new_countries = []
+        changed_countries = []
+
+        for values in batch:
+            current = existing.get(values["reference_id"])
+
+            if current is None:
+                new_countries.append(Country(**values))
+            elif current != values:
+                changed_countries.append(Country(**values))
+
+        return new_countries, changed_countries
+
+    @staticmethod
+    def _get_country_values(obj):
+        if obj["type"] != "Country":
+            return None
+
+        return {
+            "reference_id": obj["reference_id"],
+            "name": obj["name"],
+            "iso_1_code": obj["iso1_code"],
+            "iso_2_code": obj["iso2_code"],
+            "iso_3_code": obj["iso3_code"],
+            "overseas_region": obj["overseas_region_overseas_region_name"],
+            "start_date": _parse_date(obj["start_date"]),
+            "end_date": _parse_date(obj["end_date"]),
+        }
+
+
+def _parse_date(value):
+    return datetime.date.fromisoformat(value) if value else None
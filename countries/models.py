@@ -10,8 +10,8 @@ class Country(models.Model):
     The data required to populate this model can be downloaded from here:
     https://data.trade.gov.uk/datasets/240d5034-6a83-451b-8307-5755672f881b/grid.
 
-    Use the provided `generate_countries_fixture` management command to produce a
-    fixture which is compatible with this model.
+    Use the provided `sync_countries` management command to synchronise this model
+    with a download of the dataset.
 
     This model was built against the 5.35 version of the dataset.
     """
@@ -0,0 +1,9 @@
+from django.db.models.signals import post_delete, post_save
+
+from countries.choices import invalidate_country_choices
+from countries.models import Country
+
+
+def connect():
+    post_save.connect(invalidate_country_choices, sender=Country)
+    post_delete.connect(invalidate_country_choices, sender=Country)
@@ -1,6 +1,14 @@
+import datetime
+import io
 import json
 
-from countries.management.commands.generate_countries_fixture import Command
+import pytest
+from django.core.management import CommandError, call_command
+
+from countries.choices import get_country_choices, get_version
+from countries.management.commands import sync_countries
+from countries.management.commands.sync_countries import JSONStream
+from countries.models import Country
 
 
 TEST_JSON = """
@@ -27,30 +35,65 @@ TEST_JSON = """
       "iso3_code": "ZZZ",
       "overseas_region_overseas_region_name": "Somewhere Else",
       "start_date": "1990-01-01",
-      "end_date": "2022-01-01",
+      "end_date": null,
       "region": "Somewhere Else"
     }
   ]
 }
 """
-TEST_SRC_DATA = json.loads(TEST_JSON)["data"]
-
-
-def test_generate_fixture_data():
-    fixture_data = Command._generate_fixture_data(TEST_SRC_DATA)
-
-    assert fixture_data == [
-        {
-            "model": "countries.Country",
-            "pk": "ZZZZZZ00002",
-            "fields": {
-                "name": "Country 2",
-                "iso_1_code": "00Z",
-                "iso_2_code": "ZZ",
-                "iso_3_code": "ZZZ",
-                "overseas_region": "Somewhere Else",
-                "start_date": "1990-01-01",
-                "end_date": "2022-01-01",
-            },
-        }
-    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_json_stream(monkeypatch, chunk_size):
+    monkeypatch.setattr(sync_countries, "CHUNK_SIZE", chunk_size)
+    document = json.dumps(
+        {"meta": {"items": [1, 2]}, "count": 12345, **json.loads(TEST_JSON)}
+    )
+
+    items = list(JSONStream(io.StringIO(document)).iter_array("data"))
+
+    assert items == json.loads(TEST_JSON)["data"]
+
+
+def test_json_stream_missing_key():
+    with pytest.raises(ValueError):
+        list(JSONStream(io.StringIO('{"rows": []}')).iter_array("data"))
+
+
+def test_sync_countries(db, tmp_path):
+    Country.objects.create(
+        reference_id="ZZZZZZ00003",
+        name="Country 3",
+        iso_1_code="00Y",
+        iso_2_code="ZY",
+        iso_3_code="ZZY",
+    )
+    src = tmp_path / "countries.json"
+    src.write_text(TEST_JSON)
+
+    assert ("ZZZZZZ00003", "Country 3 (ZY)") in get_country_choices()
+    version = get_version()
+
+    call_command("sync_countries", src)
+
+    assert not Country.objects.filter(pk="ZZZZZZ00001").exists()
+    assert Country.objects.get(pk="ZZZZZZ00002").start_date == datetime.date(1990, 1, 1)
+    assert Country.objects.get(pk="ZZZZZZ00003").end_date is not None
+    # The choices are invalidated by the sync, for the other processes too.
+    assert get_version() != version
+    choices = get_country_choices()
+    assert ("ZZZZZZ00002", "Country 2 (ZZ)") in choices
+    assert ("ZZZZZZ00003", "Country 3 (ZY)") not in choices
+    assert ("ZZZZZZ00003", "Country 3 (ZY)") in get_country_choices(
+        include="ZZZZZZ00003"
+    )
+
+
+def test_sync_countries_invalid(db, tmp_path):
+    src = tmp_path / "countries.json"
+    src.write_text(TEST_JSON[:-20])
+
+    with pytest.raises(CommandError):
+        call_command("sync_countries", src)
+
+    assert not Country.objects.filter(pk="ZZZZZZ00002").exists()
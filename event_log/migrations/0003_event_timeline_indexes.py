@@ -0,0 +1,30 @@
+# Generated by Django 3.2.13 on 2026-10-18 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event_log", "0002_alter_event_options"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["content_type", "object_id", "-timestamp", "-id"],
+                name="event_object_timeline_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["-timestamp", "-id"], name="event_timeline_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["user", "timestamp"], name="event_user_timestamp_idx"
+            ),
+        ),
+    ]
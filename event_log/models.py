@@ -18,6 +18,16 @@ class EventType(models.Model):
 class Event(models.Model):
     class Meta:
         ordering = ["-timestamp"]
+        indexes = [
+            # The timeline of an object.
+            models.Index(
+                fields=["content_type", "object_id", "-timestamp", "-id"],
+                name="event_object_timeline_idx",
+            ),
+            # The global timeline.
+            models.Index(fields=["-timestamp", "-id"], name="event_timeline_idx"),
+            models.Index(fields=["user", "timestamp"], name="event_user_timestamp_idx"),
+        ]
 
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveIntegerField()
@@ -1,15 +1,25 @@
+import datetime
+
 from django import forms
 from django.template.loader import render_to_string
 from django.urls import reverse_lazy
+from django.utils import timezone
 
+import event_log.models as event_log_models
+from chartofaccount.models import Directorate
+from main.constants import ApproverGroup
+from main.forms.widgets import TypeaheadInput
 from main.models import (
     CestDocument,
     FinancialInformation,
     JobDescription,
+    Profession,
     ResourcingRequest,
     SdsStatusDetermination,
+    approval_router,
 )
 from main.utils import syncronise_cost_centre_dropdowns
+from user.models import User
 
 
 class FormWithStartEndDates(forms.ModelForm):
@@ -78,6 +88,8 @@ class FinancialInformationForm(forms.ModelForm):
                     "hx-target": "#id_directorate",
                 }
             ),
+            "cost_centre_code": TypeaheadInput("cost-centres"),
+            "programme_code": TypeaheadInput("programme-codes"),
         }
 
     inside_ir35_fields = ["min_day_rate", "max_day_rate", "days_required"]
@@ -153,3 +165,132 @@ class SdsStatusDeterminationForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
 
         self.fields["resourcing_request"].disabled = True
+
+
+class ResourcingRequestFilterForm(forms.Form):
+    SORT_CHOICES = [
+        ("-pk", "Newest first"),
+        ("pk", "Oldest first"),
+        ("job_title", "Job title"),
+        ("project_name", "Project name"),
+        ("state", "Status"),
+        ("start_date", "Start date"),
+        ("-start_date", "Start date (latest first)"),
+        ("end_date", "End date"),
+        ("-end_date", "End date (latest first)"),
+    ]
+
+    state = forms.TypedChoiceField(
+        label="Status",
+        choices=[("", "Any"), *ResourcingRequest.State.choices],
+        coerce=int,
+        empty_value=None,
+        required=False,
+    )
+    current_stage = forms.TypedChoiceField(
+        label="Approval stage",
+        choices=[("", "Any"), *approval_router.get_stage_choices()],
+        coerce=int,
+        empty_value=None,
+        required=False,
+    )
+    profession = forms.ModelChoiceField(
+        Profession.objects.all(), empty_label="Any", required=False
+    )
+    chief = forms.ModelChoiceField(
+        User.objects.filter(groups__name=ApproverGroup.CHIEF.value),
+        label="Chief/SMT sponsor",
+        empty_label="Any",
+        required=False,
+    )
+    requestor = forms.ModelChoiceField(
+        User.objects.all(), empty_label="Any", required=False
+    )
+    directorate = forms.ModelChoiceField(
+        Directorate.objects.all(), empty_label="Any", required=False
+    )
+    start_date = forms.DateField(label="Starting on or after", required=False)
+    end_date = forms.DateField(label="Ending on or before", required=False)
+    sort = forms.ChoiceField(choices=SORT_CHOICES, required=False)
+
+    def filter(self, queryset):
+        """Apply the cleaned filters to the given resourcing request queryset.
+
+        Invalid filters aren't in the cleaned data, so only the valid ones apply.
+        """
+        data = self.cleaned_data
+
+        filters = {
+            "state": data.get("state"),
+            "current_stage": data.get("current_stage"),
+            "profession": data.get("profession"),
+            "chief": data.get("chief"),
+            "requestor": data.get("requestor"),
+            "financial_information__directorate": data.get("directorate"),
+            "start_date__gte": data.get("start_date"),
+            "end_date__lte": data.get("end_date"),
+        }
+
+        return queryset.filter(
+            **{lookup: value for lookup, value in filters.items() if value is not None}
+        )
+
+    def get_ordering(self) -> list[str]:
+        """Return a unique ordering for the selected sort."""
+        sort = self.cleaned_data.get("sort") or "-pk"
+
+        if sort in ("pk", "-pk"):
+            return [sort]
+
+        return [sort, "-pk" if sort.startswith("-") else "pk"]
+
+
+class ResourcingRequestSearchForm(forms.Form):
+    q = forms.CharField(
+        label="Search",
+        help_text=(
+            'Put phrases in quotes, and use "or" and "-" to match either word or to'
+            " leave a word out."
+        ),
+        max_length=255,
+        required=False,
+    )
+
+
+class EventFilterForm(forms.Form):
+    event_type = forms.ModelChoiceField(
+        event_log_models.EventType.objects.order_by("name"),
+        empty_label="Any",
+        required=False,
+    )
+    user = forms.ModelChoiceField(
+        User.objects.order_by("first_name", "last_name"),
+        empty_label="Anyone",
+        required=False,
+    )
+    start_date = forms.DateField(label="From", required=False)
+    end_date = forms.DateField(label="To", required=False)
+
+    def filter(self, queryset):
+        """Apply the cleaned filters to the given event queryset.
+
+        Invalid filters aren't in the cleaned data, so only the valid ones apply.
+        """
+        data = self.cleaned_data
+
+        # Filter on a range rather than the date so the timestamp indexes are used.
+        def start_of_day(date):
+            return timezone.make_aware(datetime.datetime.combine(date, datetime.time()))
+
+        filters = {
+            "event_type": data.get("event_type"),
+            "user": data.get("user"),
+            "timestamp__gte": data.get("start_date")
+            and start_of_day(data["start_date"]),
+            "timestamp__lt": data.get("end_date")
+            and start_of_day(data["end_date"] + datetime.timedelta(days=1)),
+        }
+
+        return queryset.filter(
+            **{lookup: value for lookup, value in filters.items() if value is not None}
+        )
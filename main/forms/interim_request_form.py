@@ -1,7 +1,10 @@
 from django import forms
 from django.forms import widgets
 
+from countries.choices import get_country_choices
+from countries.models import Country
 from main.models import InterimRequest
+from main.utils import set_index_choices
 
 
 class InterimRequestNewForm(forms.ModelForm):
@@ -17,6 +20,13 @@ class InterimRequestNewForm(forms.ModelForm):
 
         self.fields["resourcing_request"].disabled = True
 
+        # Countries which have ended can't be chosen, unless they already were.
+        country_choices = get_country_choices(include=self.instance.overseas_country_id)
+        self.fields["overseas_country"].queryset = Country.objects.filter(
+            pk__in=[pk for pk, _ in country_choices]
+        )
+        set_index_choices(self, "overseas_country", country_choices)
+
     def clean(self):
         cleaned_data = super().clean()
 
@@ -1,6 +1,7 @@
 from django import forms
 
 from main.forms.forms import FormWithStartEndDates
+from main.forms.widgets import TypeaheadInput
 from main.models import (
     StatementOfWork,
     StatementOfWorkModule,
@@ -12,7 +13,10 @@ class StatementOfWorkForm(forms.ModelForm):
     class Meta:
         model = StatementOfWork
         fields = "__all__"
-        widgets = {"resourcing_request": forms.HiddenInput}
+        widgets = {
+            "resourcing_request": forms.HiddenInput,
+            "project_code": TypeaheadInput("project-codes"),
+        }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -0,0 +1,33 @@
+from django import forms
+from django.urls import reverse
+
+
+class TypeaheadInput(forms.TextInput):
+    """A text input which suggests chart of accounts codes as you type.
+
+    The suggestions are fetched from the typeahead endpoint for the code type and
+    swapped into a datalist, so the page never holds the full list of codes.
+    """
+
+    template_name = "main/widgets/typeahead.html"
+
+    def __init__(self, code_type, attrs=None):
+        super().__init__(attrs)
+
+        self.code_type = code_type
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+
+        datalist_id = f"{context['widget']['attrs'].get('id', name)}_options"
+
+        context["widget"]["datalist_id"] = datalist_id
+        context["widget"]["attrs"] |= {
+            "list": datalist_id,
+            "autocomplete": "off",
+            "hx-get": reverse("htmx-typeahead", kwargs={"code_type": self.code_type}),
+            "hx-trigger": "focus once, keyup changed delay:250ms",
+            "hx-target": f"#{datalist_id}",
+        }
+
+        return context
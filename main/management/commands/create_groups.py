@@ -144,6 +144,7 @@ class Command(BaseCommand):
                 codename__in=[
                     "can_give_busops_approval",
                     "view_all_resourcingrequests",
+                    "export_resourcingrequests",
                 ],
                 content_type__app_label="main",
             )
@@ -159,12 +160,13 @@ class Command(BaseCommand):
         )
 
         finance_group.permissions.set(
-            [
-                Permission.objects.get(
-                    codename="can_give_finance_approval",
-                    content_type__app_label="main",
-                )
-            ]
+            Permission.objects.filter(
+                codename__in=[
+                    "can_give_finance_approval",
+                    "export_resourcingrequests",
+                ],
+                content_type__app_label="main",
+            )
         )
 
         commercial_group.permissions.set(
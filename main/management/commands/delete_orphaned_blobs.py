@@ -0,0 +1,53 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from main.models import Blob
+from main.storage import S3_DELETE_BATCH_SIZE, content_addressed_storage
+
+
+class Command(BaseCommand):
+    help = "Delete the stored blobs which are no longer referred to"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=24,
+            help=(
+                "Only delete blobs older than this many hours, so that a blob which "
+                "has just been stored isn't deleted before it's referred to"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        created_before = timezone.now() - datetime.timedelta(hours=options["min_age"])
+        orphans = Blob.objects.orphaned().filter(created_at__lt=created_before)
+        count = 0
+
+        while True:
+            # The rows stay locked until their files are deleted. A file saved with
+            # the same content meanwhile waits for the lock, and then finds the row
+            # gone and stores the file again, see `ContentAddressedStorage`. Blobs
+            # which are being saved are locked by the save, so they are skipped.
+            with transaction.atomic():
+                names = list(
+                    orphans.select_for_update(skip_locked=True, of=("self",))
+                    .order_by("pk")
+                    .values_list("name", flat=True)[:S3_DELETE_BATCH_SIZE]
+                )
+
+                if not names:
+                    break
+
+                Blob.objects.filter(name__in=names).delete()
+                # If this fails the rows are kept, and tried again next time.
+                content_addressed_storage.delete_many(names)
+
+            count += len(names)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully deleted the orphaned blobs ({count})")
+        )
@@ -0,0 +1,67 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.models import ResourcingRequest
+from main.services.export import ResourcingRequestExport
+
+
+STATES = {state.name.lower(): state for state in ResourcingRequest.State}
+
+
+class Command(BaseCommand):
+    help = "Export the resourcing requests with their financial and approval data"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=list(ResourcingRequestExport.FORMATS),
+            default="csv",
+        )
+        parser.add_argument("--state", choices=list(STATES))
+        parser.add_argument(
+            "--start-date",
+            type=datetime.date.fromisoformat,
+            help="Only export requests starting on or after this date (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--end-date",
+            type=datetime.date.fromisoformat,
+            help="Only export requests ending on or before this date (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--output", "-o", help="The file to write to, defaults to stdout"
+        )
+
+    def handle(self, *args, **options):
+        # The same filters as the requests page.
+        filters = {
+            "state": STATES[options["state"]] if options["state"] else None,
+            "start_date__gte": options["start_date"],
+            "end_date__lte": options["end_date"],
+        }
+
+        queryset = ResourcingRequest.objects.filter(
+            **{lookup: value for lookup, value in filters.items() if value is not None}
+        ).order_by("pk")
+
+        export = ResourcingRequestExport(queryset, options["format"])
+
+        if not options["output"]:
+            for chunk in export:
+                self.stdout.write(chunk, ending="")
+        else:
+            try:
+                # The csv module does its own newline handling.
+                with open(options["output"], "w", newline="") as f:
+                    for chunk in export:
+                        f.write(chunk)
+            except OSError as e:
+                raise CommandError(f"Could not write {options['output']}: {e}")
+
+        # Reported on stderr, so it isn't mixed into an export written to stdout.
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Successfully exported {export.row_count} resourcing requests"
+            )
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from main.services.approval_inbox import ApprovalInboxService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the approval inbox from the resourcing requests and approvals"
+
+    def handle(self, *args, **options):
+        count = ApprovalInboxService.rebuild()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully rebuilt the approval inbox ({count})")
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from main.models import CestDocument
+from main.storage import content_addressed_storage
+from main.tasks import store_cest_document_blob
+
+
+class Command(BaseCommand):
+    help = "Move the CEST documents stored before blobs were introduced into blobs"
+
+    def handle(self, *args, **options):
+        cest_documents = (
+            CestDocument.objects.filter(blob__isnull=True)
+            .exclude(file="")
+            .order_by("pk")
+            .values_list("pk", "file")
+        )
+        count = 0
+
+        for pk, name in cest_documents.iterator():
+            if not content_addressed_storage.exists(name):
+                self.stderr.write(f"Skipped CEST document {pk}, {name} is missing")
+                continue
+
+            store_cest_document_blob(pk, name)
+            count += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully stored the CEST documents ({count})")
+        )
@@ -0,0 +1,81 @@
+# Generated by Django 3.2.13 on 2026-10-18 14:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0068_data_add_approval_cleared_event"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ApprovalInboxItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "approval_type",
+                    models.CharField(
+                        choices=[
+                            ("head_of_profession", "Head of Profession"),
+                            ("chief", "Chief"),
+                            ("busops", "Workforce Planning"),
+                            ("hrbp", "HR Business Partners"),
+                            ("finance", "Finance"),
+                            ("commercial", "Commercial"),
+                            ("director", "Director"),
+                            ("dg_coo", "DG COO"),
+                        ],
+                        max_length=20,
+                        verbose_name="role",
+                    ),
+                ),
+                ("stage", models.PositiveSmallIntegerField()),
+                (
+                    "pending_since",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="approval",
+            index=models.Index(
+                fields=["user", "resourcing_request"],
+                name="main_approv_user_id_5ba51b_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="approvalinboxitem",
+            name="resourcing_request",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="approval_inbox",
+                to="main.resourcingrequest",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="approvalinboxitem",
+            index=models.Index(
+                fields=["approval_type", "resourcing_request"],
+                name="main_approv_approva_115a0c_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="approvalinboxitem",
+            constraint=models.UniqueConstraint(
+                fields=("resourcing_request", "approval_type"),
+                name="unique_approval_inbox_item",
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 3.2.13 on 2026-10-18 14:10
+
+from django.db import migrations
+
+
+AWAITING_APPROVALS = 1
+
+APPROVAL_ORDER = [
+    ["head_of_profession"],
+    ["chief"],
+    ["busops"],
+    ["hrbp", "finance", "commercial"],
+    ["director"],
+    ["dg_coo"],
+]
+
+
+def populate_approval_inbox(apps, schema_editor):
+    ResourcingRequest = apps.get_model("main", "ResourcingRequest")
+    ApprovalInboxItem = apps.get_model("main", "ApprovalInboxItem")
+
+    resourcing_requests = ResourcingRequest.objects.filter(
+        state=AWAITING_APPROVALS
+    ).select_related(*[f"{x}_approval" for stage in APPROVAL_ORDER for x in stage])
+
+    items = []
+
+    for resourcing_request in resourcing_requests.iterator():
+        for stage, approval_types in enumerate(APPROVAL_ORDER):
+            for approval_type in approval_types:
+                approval = getattr(resourcing_request, f"{approval_type}_approval")
+
+                if approval and approval.approved:
+                    continue
+
+                items.append(
+                    ApprovalInboxItem(
+                        resourcing_request=resourcing_request,
+                        approval_type=approval_type,
+                        stage=stage,
+                    )
+                )
+
+    ApprovalInboxItem.objects.bulk_create(items)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0069_approvalinboxitem"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_approval_inbox, migrations.RunPython.noop)
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.13 on 2026-10-18 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0070_data_approval_inbox"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="resourcingrequest",
+            name="state_index",
+        ),
+        migrations.AddIndex(
+            model_name="resourcingrequest",
+            index=models.Index(fields=["state", "id"], name="state_index"),
+        ),
+        migrations.AddIndex(
+            model_name="resourcingrequest",
+            index=models.Index(
+                fields=["start_date", "id"], name="main_resour_start_d_a9949d_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="resourcingrequest",
+            index=models.Index(
+                fields=["end_date", "id"], name="main_resour_end_dat_efe34d_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.13 on 2026-10-18 14:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0071_resourcing_request_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resourcingrequest",
+            name="completeness",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+    ]
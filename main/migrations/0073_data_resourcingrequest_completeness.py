@@ -0,0 +1,64 @@
+# Generated by Django 3.2.13 on 2026-10-18 15:02
+
+from django.db import migrations
+
+
+# Mirrors `main.models.Completeness` at the time of writing.
+FINANCIAL_INFORMATION = 1
+JOB_DESCRIPTION = 2
+STATEMENT_OF_WORK = 4
+INTERIM_REQUEST = 8
+CEST_DOCUMENT = 16
+SDS_STATUS_DETERMINATION = 32
+
+
+def populate_completeness(apps, schema_editor):
+    ResourcingRequest = apps.get_model("main", "ResourcingRequest")
+    StatementOfWork = apps.get_model("main", "StatementOfWork")
+
+    def get_ids(model_name):
+        model = apps.get_model("main", model_name)
+
+        return set(model.objects.values_list("resourcing_request_id", flat=True))
+
+    supporting_documents = {
+        FINANCIAL_INFORMATION: get_ids("FinancialInformation"),
+        JOB_DESCRIPTION: get_ids("JobDescription"),
+        INTERIM_REQUEST: get_ids("InterimRequest"),
+        CEST_DOCUMENT: get_ids("CestDocument"),
+        SDS_STATUS_DETERMINATION: get_ids("SdsStatusDetermination"),
+        STATEMENT_OF_WORK: {
+            statement_of_work.resourcing_request_id
+            for statement_of_work in StatementOfWork.objects.prefetch_related(
+                "modules__deliverables"
+            )
+            if statement_of_work.modules.all()
+            and all(
+                module.deliverables.all() for module in statement_of_work.modules.all()
+            )
+        },
+    }
+
+    resourcing_requests = list(ResourcingRequest.objects.only("pk"))
+
+    for resourcing_request in resourcing_requests:
+        resourcing_request.completeness = sum(
+            flag
+            for flag, ids in supporting_documents.items()
+            if resourcing_request.pk in ids
+        )
+
+    ResourcingRequest.objects.bulk_update(
+        resourcing_requests, ["completeness"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0072_resourcingrequest_completeness"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_completeness, migrations.RunPython.noop)
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.13 on 2026-10-18 14:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0074_pendingnotification"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resourcingrequest",
+            name="current_stage",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="resourcingrequest",
+            index=models.Index(
+                fields=["current_stage", "id"], name="main_resour_current_e0443d_idx"
+            ),
+        ),
+    ]
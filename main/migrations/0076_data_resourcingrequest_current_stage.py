@@ -0,0 +1,57 @@
+# Generated by Django 3.2.13 on 2026-10-18 16:10
+
+from django.db import migrations
+
+
+# Mirrors `main.models.Approval.ORDER` at the time of writing.
+ORDER = [
+    ["head_of_profession"],
+    ["chief"],
+    ["busops"],
+    ["hrbp", "finance", "commercial"],
+    ["director"],
+    ["dg_coo"],
+]
+
+
+def populate_current_stage(apps, schema_editor):
+    ResourcingRequest = apps.get_model("main", "ResourcingRequest")
+    Approval = apps.get_model("main", "Approval")
+
+    approved_pks = set(
+        Approval.objects.filter(approved=True).values_list("pk", flat=True)
+    )
+
+    approval_fields = [
+        f"{approval_type}_approval_id" for stage in ORDER for approval_type in stage
+    ]
+    resourcing_requests = list(ResourcingRequest.objects.only("pk", *approval_fields))
+
+    for resourcing_request in resourcing_requests:
+        resourcing_request.current_stage = next(
+            (
+                i
+                for i, stage in enumerate(ORDER)
+                if any(
+                    getattr(resourcing_request, f"{approval_type}_approval_id")
+                    not in approved_pks
+                    for approval_type in stage
+                )
+            ),
+            len(ORDER),
+        )
+
+    ResourcingRequest.objects.bulk_update(
+        resourcing_requests, ["current_stage"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0075_resourcingrequest_current_stage"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_current_stage, migrations.RunPython.noop),
+    ]
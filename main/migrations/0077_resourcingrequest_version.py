@@ -0,0 +1,18 @@
+# Generated by Django 3.2.13 on 2026-10-18 14:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0076_data_resourcingrequest_current_stage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resourcingrequest",
+            name="version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.13 on 2026-10-18 14:59
+
+import django.core.validators
+from django.db import migrations, models
+
+import main.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0077_resourcingrequest_version"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="cestdocument",
+            name="file",
+            field=models.FileField(
+                help_text='Use the <a class="govuk-link" target="_blank" href="https://www.gov.uk/guidance/check-employment-status-for-tax">CEST tool</a>, this will generate a PDF which should be uploaded here.',
+                upload_to=main.models.resourcing_request_directory_path,
+                validators=[django.core.validators.FileExtensionValidator(["pdf"])],
+            ),
+        ),
+    ]
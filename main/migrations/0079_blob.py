@@ -0,0 +1,64 @@
+# Generated by Django 3.2.13 on 2026-10-18 15:02
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+import main.models
+import main.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0078_alter_cestdocument_file"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Blob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sha256", models.CharField(max_length=64, unique=True)),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("size", models.PositiveBigIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="cestdocument",
+            name="file_name",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name="cestdocument",
+            name="file",
+            field=models.FileField(
+                help_text='Use the <a class="govuk-link" target="_blank" href="https://www.gov.uk/guidance/check-employment-status-for-tax">CEST tool</a>, this will generate a PDF which should be uploaded here.',
+                max_length=255,
+                storage=main.storage.ContentAddressedStorage(),
+                upload_to=main.models.resourcing_request_directory_path,
+                validators=[django.core.validators.FileExtensionValidator(["pdf"])],
+            ),
+        ),
+        migrations.AddField(
+            model_name="cestdocument",
+            name="blob",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="cest_documents",
+                to="main.blob",
+            ),
+        ),
+    ]
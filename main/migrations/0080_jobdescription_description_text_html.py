@@ -0,0 +1,63 @@
+# Generated by Django 3.2.13 on 2026-10-18 15:06
+
+from django.db import migrations, models
+
+import quill.db.models.fields
+from quill.renderer import render_html
+from quill.utils import extract_text
+
+
+BATCH_SIZE = 500
+
+
+def render_descriptions(apps, schema_editor):
+    JobDescription = apps.get_model("main", "JobDescription")
+
+    batch = []
+
+    for job_description in JobDescription.objects.only("description").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        job_description.description_text = extract_text(job_description.description)
+        job_description.description_html = "".join(
+            render_html(job_description.description)
+        )
+        batch.append(job_description)
+
+        if len(batch) == BATCH_SIZE:
+            JobDescription.objects.bulk_update(
+                batch, ["description_text", "description_html"]
+            )
+            batch = []
+
+    JobDescription.objects.bulk_update(batch, ["description_text", "description_html"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0079_blob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobdescription",
+            name="description_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="jobdescription",
+            name="description_text",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AlterField(
+            model_name="jobdescription",
+            name="description",
+            field=quill.db.models.fields.QuillField(
+                default=dict,
+                html_field="description_html",
+                text_field="description_text",
+            ),
+        ),
+        migrations.RunPython(render_descriptions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+from django.db import migrations
+
+
+# Mirrors `main.models.get_search_vector_expression` at the time of writing.
+INSERT_SEARCH_DOCUMENTS = """
+INSERT INTO main_searchdocument (resourcing_request_id, search_vector)
+SELECT
+    resourcing_request.id,
+    setweight(
+        to_tsvector(
+            'english',
+            concat_ws(' ', resourcing_request.job_title, resourcing_request.project_name)
+        ),
+        'A'
+    )
+    || setweight(
+        to_tsvector(
+            'english',
+            concat_ws(
+                ' ',
+                job_description.description_text,
+                statement_of_work.project_description
+            )
+        ),
+        'B'
+    )
+    || setweight(
+        to_tsvector(
+            'english',
+            concat_ws(
+                ' ',
+                statement_of_work.notice_period,
+                statement_of_work.fees,
+                statement_of_work.exceptional_expenses,
+                statement_of_work.deliverable_notes,
+                interim_request.part_b_business_case,
+                interim_request.part_b_impact,
+                interim_request.part_b_main_reason,
+                sds_status_determination.reasons
+            )
+        ),
+        'C'
+    )
+    || setweight(
+        to_tsvector(
+            'english',
+            coalesce(
+                (
+                    SELECT string_agg(comment.text, ' ')
+                    FROM main_comment comment
+                    WHERE comment.resourcing_request_id = resourcing_request.id
+                ),
+                ''
+            )
+        ),
+        'D'
+    )
+FROM main_resourcingrequest resourcing_request
+LEFT JOIN main_jobdescription job_description
+    ON job_description.resourcing_request_id = resourcing_request.id
+LEFT JOIN main_statementofwork statement_of_work
+    ON statement_of_work.resourcing_request_id = resourcing_request.id
+LEFT JOIN main_interimrequest interim_request
+    ON interim_request.resourcing_request_id = resourcing_request.id
+LEFT JOIN main_sdsstatusdetermination sds_status_determination
+    ON sds_status_determination.resourcing_request_id = resourcing_request.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0081_searchdocument"),
+    ]
+
+    operations = [
+        migrations.RunSQL(INSERT_SEARCH_DOCUMENTS, "DELETE FROM main_searchdocument")
+    ]
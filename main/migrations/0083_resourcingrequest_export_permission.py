@@ -0,0 +1,22 @@
+# Generated by Django 3.2.13 on 2026-10-18 15:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0082_data_searchdocument"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="resourcingrequest",
+            options={
+                "permissions": (
+                    ("view_all_resourcingrequests", "Can view all resourcing requests"),
+                    ("export_resourcingrequests", "Can export resourcing requests"),
+                )
+            },
+        ),
+    ]
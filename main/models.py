@@ -1,13 +1,25 @@
 import datetime
-import json
+import enum
+import functools
+import operator
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+)
 from django.core.validators import FileExtensionValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Cast
 from django.template.defaultfilters import date, truncatechars
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.safestring import mark_safe
 
 from change_log.models import ChangeLogRelation
@@ -18,10 +30,10 @@ from chartofaccount.models import (
     ProgrammeCode,
     ProjectCode,
 )
+from main.routing import ApprovalRouter, ApprovalState
+from main.storage import content_addressed_storage
 from main.templatetags.currency import currency
 from quill.db.models.fields import QuillField
-from quill.forms.widgets import QuillWidget
-from quill.utils import extract_text
 
 
 if TYPE_CHECKING:
@@ -41,15 +53,254 @@ class Profession(models.Model):
         return self.name
 
 
+class Completeness(enum.IntFlag):
+    """The supporting documents which have been provided for a resourcing request."""
+
+    FINANCIAL_INFORMATION = enum.auto()
+    JOB_DESCRIPTION = enum.auto()
+    # Only set if the statement of work has modules which all have deliverables.
+    STATEMENT_OF_WORK = enum.auto()
+    INTERIM_REQUEST = enum.auto()
+    CEST_DOCUMENT = enum.auto()
+    SDS_STATUS_DETERMINATION = enum.auto()
+
+
+def get_completeness_expression() -> models.Expression:
+    """Return an expression which computes the completeness of a resourcing request.
+
+    The expression has to be used in the context of a `ResourcingRequest` queryset.
+    """
+    modules = StatementOfWorkModule.objects.filter(
+        statement_of_work=models.OuterRef("pk")
+    )
+    # At least one module, and every module has at least one deliverable.
+    is_valid_statement_of_work = StatementOfWork.objects.filter(
+        models.Exists(modules),
+        ~models.Exists(modules.filter(deliverables__isnull=True)),
+    )
+
+    supporting_documents = {
+        Completeness.FINANCIAL_INFORMATION: FinancialInformation.objects,
+        Completeness.JOB_DESCRIPTION: JobDescription.objects,
+        Completeness.STATEMENT_OF_WORK: is_valid_statement_of_work,
+        Completeness.INTERIM_REQUEST: InterimRequest.objects,
+        Completeness.CEST_DOCUMENT: CestDocument.objects,
+        Completeness.SDS_STATUS_DETERMINATION: SdsStatusDetermination.objects,
+    }
+
+    return functools.reduce(
+        operator.add,
+        (
+            models.Case(
+                models.When(
+                    models.Exists(
+                        queryset.filter(resourcing_request=models.OuterRef("pk"))
+                    ),
+                    then=models.Value(flag.value),
+                ),
+                default=models.Value(0),
+            )
+            for flag, queryset in supporting_documents.items()
+        ),
+    )
+
+
+# The text search configuration used to build and query the search vectors.
+SEARCH_CONFIG = "english"
+
+
+class ConcatWS(models.Func):
+    """Join the non-null arguments with spaces."""
+
+    function = "CONCAT_WS"
+    output_field = models.TextField()
+
+    def __init__(self, *expressions, **extra):
+        super().__init__(models.Value(" "), *expressions, **extra)
+
+
+def get_search_vector_expression() -> models.Expression:
+    """Return an expression which computes the search vector of a resourcing request.
+
+    Everything is looked up by the primary key, so the expression can be used in the
+    context of either a `ResourcingRequest` or a `SearchDocument` queryset.
+    """
+
+    def get_text(queryset, *fields):
+        return models.Subquery(
+            queryset.filter(resourcing_request=models.OuterRef("pk")).values(
+                text=ConcatWS(*fields)
+            )[:1]
+        )
+
+    comments = (
+        Comment.objects.filter(resourcing_request=models.OuterRef("pk"))
+        .order_by()
+        .values("resourcing_request")
+        .annotate(
+            text=StringAgg("text", delimiter=" ", output_field=models.TextField())
+        )
+        .values("text")
+    )
+
+    return (
+        SearchVector(
+            models.Subquery(
+                ResourcingRequest.objects.filter(pk=models.OuterRef("pk")).values(
+                    text=ConcatWS("job_title", "project_name")
+                )
+            ),
+            config=SEARCH_CONFIG,
+            weight="A",
+        )
+        + SearchVector(
+            get_text(JobDescription.objects, "description_text"),
+            get_text(StatementOfWork.objects, "project_description"),
+            config=SEARCH_CONFIG,
+            weight="B",
+        )
+        + SearchVector(
+            get_text(
+                StatementOfWork.objects,
+                "notice_period",
+                "fees",
+                "exceptional_expenses",
+                "deliverable_notes",
+            ),
+            get_text(
+                InterimRequest.objects,
+                "part_b_business_case",
+                "part_b_impact",
+                "part_b_main_reason",
+            ),
+            get_text(SdsStatusDetermination.objects, "reasons"),
+            config=SEARCH_CONFIG,
+            weight="C",
+        )
+        + SearchVector(models.Subquery(comments), config=SEARCH_CONFIG, weight="D")
+    )
+
+
+APPROVAL_FIELDS = [
+    "head_of_profession_approval",
+    "chief_approval",
+    "busops_approval",
+    "hrbp_approval",
+    "finance_approval",
+    "commercial_approval",
+    "director_approval",
+    "dg_coo_approval",
+]
+
+# The parts of a resourcing request which can be loaded up front, see
+# `ResourcingRequestQuerySet.select_related_parts`.
+RESOURCING_REQUEST_PARTS = {
+    "people": {"select_related": ["requestor", "chief", "profession"]},
+    "approvals": {
+        "select_related": [
+            *APPROVAL_FIELDS,
+            *[f"{field}__user" for field in APPROVAL_FIELDS],
+        ],
+    },
+    "approval_history": {"prefetch_related": ["approvals__user", "approvals__reason"]},
+    "supporting_documents": {
+        "select_related": [
+            "financial_information",
+            "job_description",
+            "statement_of_work",
+            "interim_request",
+            "cest_document",
+            "sds_status_determination",
+        ],
+    },
+    "financial_codes": {
+        "select_related": [
+            "financial_information__group",
+            "financial_information__directorate",
+            "financial_information__cost_centre_code",
+            "financial_information__programme_code",
+            "statement_of_work__project_code",
+        ],
+    },
+    "comments": {"prefetch_related": ["comments__user"]},
+    "event_log": {"prefetch_related": ["event_log__user"]},
+}
+
+
 class ResourcingRequestQuerySet(models.QuerySet):
     def select_related_approvals(self):
-        return self.select_related(
-            "head_of_profession_approval",
-            "chief_approval",
-            "busops_approval",
-            "hrbp_approval",
-            "finance_approval",
-            "commercial_approval",
+        return self.select_related(*APPROVAL_FIELDS)
+
+    def select_related_parts(self, *parts: str):
+        """Load the given parts of the resourcing requests up front.
+
+        The `select_related` parts are all fetched in the same query, each
+        `prefetch_related` part adds one query.
+
+        Example:
+            ResourcingRequest.objects.select_related_parts("people", "comments")
+        """
+        queryset = self
+
+        for part in parts:
+            if part not in RESOURCING_REQUEST_PARTS:
+                raise ValueError(f"Unknown resourcing request part: {part}")
+
+            related = RESOURCING_REQUEST_PARTS[part]
+
+            # `select_related()` without any fields would follow every foreign key.
+            if "select_related" in related:
+                queryset = queryset.select_related(*related["select_related"])
+
+            if "prefetch_related" in related:
+                queryset = queryset.prefetch_related(*related["prefetch_related"])
+
+        return queryset
+
+    def annotate_completeness(self):
+        """Annotate the completeness as computed from the supporting documents.
+
+        This is the source of truth for the stored `completeness` field.
+        """
+        return self.annotate(
+            computed_completeness=models.ExpressionWrapper(
+                get_completeness_expression(),
+                output_field=models.PositiveSmallIntegerField(),
+            )
+        )
+
+    def refresh_completeness(self) -> int:
+        """Recompute and store the completeness of the resourcing requests."""
+        return self.update(completeness=get_completeness_expression())
+
+    def bump_version(self) -> int:
+        """Move the resourcing requests on from anything cached for them."""
+        return self.update(version=models.F("version") + 1)
+
+    def visible_to(self, user: "User"):
+        """Filter to the resourcing requests the user can access.
+
+        This mirrors `CanAccessResourcingRequestMixin`.
+        """
+        if user.is_approver or user.has_perm("main.view_all_resourcingrequests"):
+            return self
+
+        return self.filter(requestor=user)
+
+    def search(self, query: str):
+        """Filter to the resourcing requests matching the query.
+
+        The query uses the web search syntax, and the matches are annotated with
+        their `search_rank`.
+        """
+        search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+
+        return self.filter(search_document__search_vector=search_query).annotate(
+            # Cast so the rank survives the round trip through a pagination cursor.
+            search_rank=Cast(
+                SearchRank(models.F("search_document__search_vector"), search_query),
+                models.FloatField(),
+            )
         )
 
 
@@ -57,8 +308,15 @@ class ResourcingRequest(models.Model):
     class Meta:
         permissions = (
             ("view_all_resourcingrequests", "Can view all resourcing requests"),
+            ("export_resourcingrequests", "Can export resourcing requests"),
         )
-        indexes = [models.Index(name="state_index", fields=["state"])]
+        indexes = [
+            # The trailing id backs the keyset pagination in the list view.
+            models.Index(name="state_index", fields=["state", "id"]),
+            models.Index(fields=["start_date", "id"]),
+            models.Index(fields=["end_date", "id"]),
+            models.Index(fields=["current_stage", "id"]),
+        ]
 
     class State(models.IntegerChoices):
         DRAFT = 0, "Draft"
@@ -100,6 +358,13 @@ class ResourcingRequest(models.Model):
     chief = models.ForeignKey(
         "user.User", models.CASCADE, verbose_name="Chief/SMT sponsor", related_name="+"
     )
+    # Kept up to date by `main.signals`, see `Completeness`.
+    completeness = models.PositiveSmallIntegerField(default=0, editable=False)
+    # Kept up to date by `update_current_stage`, see `ApprovalRouter`.
+    current_stage = models.PositiveSmallIntegerField(default=0, editable=False)
+    # Bumped by `main.signals` whenever the resourcing request or anything shown with
+    # it changes, so it can be used to key cached fragments.
+    version = models.PositiveIntegerField(default=0, editable=False)
 
     # Approvals
     head_of_profession_approval = models.OneToOneField(
@@ -135,9 +400,27 @@ class ResourcingRequest(models.Model):
 
     objects = ResourcingRequestQuerySet.as_manager()
 
+    # Fields which are maintained with queryset updates and so must not be
+    # overwritten by saving a stale instance.
+    DENORMALISED_FIELDS = ["completeness", "version"]
+
     def __str__(self):
         return f"{self.get_type_display()} - {self.job_title} for {self.project_name}"
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.DENORMALISED_FIELDS
+            ]
+
+        super().save(*args, **kwargs)
+
+    def refresh_completeness(self) -> None:
+        ResourcingRequest.objects.filter(pk=self.pk).refresh_completeness()
+        self.refresh_from_db(fields=["completeness"])
+
     def get_absolute_url(self):
         return reverse(
             "resourcing-request-detail", kwargs={"resourcing_request_pk": self.pk}
@@ -174,26 +457,27 @@ class ResourcingRequest(models.Model):
         return self.state == self.State.COMPLETED
 
     @property
-    def required_supporting_forms(self):
-        yield hasattr(self, "financial_information")
+    def required_completeness(self) -> Completeness:
+        """Return the supporting documents required to send for approval."""
+        required = (
+            Completeness.FINANCIAL_INFORMATION
+            | Completeness.INTERIM_REQUEST
+            | Completeness.CEST_DOCUMENT
+            | Completeness.SDS_STATUS_DETERMINATION
+        )
 
         if self.is_ir35:
-            yield hasattr(self, "job_description")
+            required |= Completeness.JOB_DESCRIPTION
         else:
-            if hasattr(self, "statement_of_work"):
-                yield self.statement_of_work.is_statement_of_work_valid
-            else:
-                yield False
-
-        yield from (
-            hasattr(self, "interim_request"),
-            hasattr(self, "cest_document"),
-            hasattr(self, "sds_status_determination"),
-        )
+            required |= Completeness.STATEMENT_OF_WORK
+
+        return required
 
     @property
-    def is_complete(self):
-        return all(self.required_supporting_forms)
+    def is_complete(self) -> bool:
+        required = self.required_completeness
+
+        return Completeness(self.completeness) & required == required
 
     @property
     def can_send_for_approval(self) -> bool:
@@ -251,8 +535,18 @@ class ResourcingRequest(models.Model):
             Approval.Type.DG_COO: self.dg_coo_approval,
         }
 
+    def get_approval_state(self) -> ApprovalState:
+        return approval_router.get_state(self.get_approvals())
+
     def get_is_approved(self):
-        return all(x and x.approved for x in self.get_approvals().values())
+        return approval_router.route(self.get_approval_state()).is_approved
+
+    def update_current_stage(self) -> None:
+        """Set the current stage from the approvals, without saving it."""
+        self.current_stage = approval_router.route(self.get_approval_state()).stage
+
+    def get_current_stage_display(self) -> str:
+        return approval_router.get_stage_label(self.current_stage)
 
     def can_user_approve(self, user: "User") -> bool:
         """Return whether the user can approve this resourcing request."""
@@ -260,8 +554,9 @@ class ResourcingRequest(models.Model):
             if user.is_superuser:
                 return True
 
-            # Is the user the correct head of profession?
-            if user.is_head_of_profession and user.profession == self.profession:
+            # Is the user the correct head of profession? The ids are compared so
+            # that neither profession is loaded.
+            if user.is_head_of_profession and user.profession_id == self.profession_id:
                 return True
 
             # Is the user another type of approver?
@@ -298,7 +593,10 @@ class Approval(models.Model):
             ),
         )
         ordering = ["-timestamp"]
-        indexes = [models.Index(fields=["type"])]
+        indexes = [
+            models.Index(fields=["type"]),
+            models.Index(fields=["user", "resourcing_request"]),
+        ]
 
     class Type(models.TextChoices):
         HEAD_OF_PROFESSION = "head_of_profession", "Head of Profession"
@@ -345,6 +643,87 @@ class Approval(models.Model):
     approved = models.BooleanField(null=True)
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def get_stage(cls, approval_type: "Approval.Type") -> int:
+        """Return the index of the stage in `ORDER` the approval type belongs to."""
+        return approval_router.get_stage(approval_type)
+
+
+approval_router = ApprovalRouter(Approval.ORDER)
+
+
+class ApprovalInboxItem(models.Model):
+    """An approval which is pending on a resourcing request awaiting approvals.
+
+    There is one row per pending approval type, so the requests awaiting a user's
+    approval can be found with a single indexed lookup on `approval_type`. The rows are
+    kept in step by `ApprovalInboxService`.
+    """
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["resourcing_request", "approval_type"],
+                name="unique_approval_inbox_item",
+            )
+        ]
+        indexes = [models.Index(fields=["approval_type", "resourcing_request"])]
+
+    resourcing_request = models.ForeignKey(
+        "ResourcingRequest", models.CASCADE, related_name="approval_inbox"
+    )
+    approval_type = models.CharField(
+        "role", choices=Approval.Type.choices, max_length=20
+    )
+    stage = models.PositiveSmallIntegerField()
+    pending_since = models.DateTimeField(default=timezone.now)
+
+
+class PendingNotification(models.Model):
+    """A notification held back for a user who receives a digest.
+
+    The pending notifications are sent as one message per user, and removed, by the
+    `send_notification_digests` task.
+    """
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "created_at"])]
+
+    user = models.ForeignKey(
+        "user.User", models.CASCADE, related_name="pending_notifications"
+    )
+    template_id = models.CharField(max_length=255)
+    personalisation = models.JSONField(default=dict)
+    created_at = models.DateTimeField(default=timezone.now)
+
+
+class SearchDocumentQuerySet(models.QuerySet):
+    def refresh(self) -> int:
+        """Recompute and store the search vectors."""
+        return self.update(search_vector=get_search_vector_expression())
+
+
+class SearchDocument(models.Model):
+    """The searchable text of a resourcing request and its supporting documents.
+
+    The text is held as a weighted search vector, with the titles weighted highest and
+    the comments lowest. The rows are kept in step by `main.signals`, and are kept
+    apart from the resourcing requests so the vector isn't loaded with them.
+    """
+
+    class Meta:
+        indexes = [GinIndex(fields=["search_vector"])]
+
+    resourcing_request = models.OneToOneField(
+        "ResourcingRequest",
+        models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    search_vector = SearchVectorField(null=True)
+
+    objects = SearchDocumentQuerySet.as_manager()
+
 
 class SupportingInformation(models.Model):
     class Meta:
@@ -360,10 +739,15 @@ class JobDescription(models.Model):
         related_name="job_description",
     )
 
-    description = QuillField()
+    description = QuillField(
+        text_field="description_text", html_field="description_html"
+    )
+    # Derived from the description when it is saved.
+    description_text = models.TextField(blank=True, default="", editable=False)
+    description_html = models.TextField(blank=True, default="", editable=False)
 
     def __str__(self):
-        return truncatechars(extract_text(self.description).replace("\n", " "), 40)
+        return truncatechars(self.description_text.replace("\n", " "), 40)
 
     def get_absolute_url(self):
         return reverse(
@@ -375,11 +759,8 @@ class JobDescription(models.Model):
         )
 
     def get_description_display(self):
-        return QuillWidget().render(
-            "description",
-            json.dumps(self.description),
-            attrs={"read_only": True},
-        )
+        # Rendered from an allow-list of tags, see `quill.renderer`.
+        return mark_safe(self.description_html)
 
 
 class FinancialInformation(SupportingInformation):
@@ -698,6 +1079,28 @@ def resourcing_request_directory_path(instance, filename):
     return f"resourcing_request/{instance.resourcing_request.pk}/{filename}"
 
 
+class BlobQuerySet(models.QuerySet):
+    def with_ref_count(self):
+        return self.annotate(ref_count=models.Count("cest_documents"))
+
+    def orphaned(self):
+        return self.filter(cest_documents__isnull=True)
+
+
+class Blob(models.Model):
+    """A file stored by `ContentAddressedStorage` under the hash of its content."""
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = BlobQuerySet.as_manager()
+
+    def __str__(self):
+        return self.name
+
+
 class CestDocument(models.Model):
     resourcing_request = models.OneToOneField(
         "ResourcingRequest",
@@ -707,17 +1110,42 @@ class CestDocument(models.Model):
 
     file = models.FileField(
         upload_to=resourcing_request_directory_path,
+        storage=content_addressed_storage,
+        max_length=255,
         validators=[FileExtensionValidator(["pdf"])],
         help_text=mark_safe(
             'Use the <a class="govuk-link" target="_blank" href="https://www.gov.uk/guidance/check-employment-status-for-tax">CEST tool</a>'
             ", this will generate a PDF which should be uploaded here."
-            "<br>The link to the current file will time out after 5 minutes."
-            " If it has timed out, refresh the page to update the link."
         ),
     )
+    # The name of the file as it was uploaded.
+    file_name = models.CharField(max_length=255, blank=True, editable=False)
+    # Empty until a file uploaded straight to the bucket has been moved into a blob.
+    blob = models.ForeignKey(
+        Blob,
+        models.PROTECT,
+        related_name="cest_documents",
+        null=True,
+        blank=True,
+        editable=False,
+    )
 
     def __str__(self):
-        return Path(self.file.name).name
+        return self.file_name or Path(self.file.name).name
+
+    def save(self, *args, **kwargs):
+        # The blob stays locked until the row which refers to it is written, see
+        # `ContentAddressedStorage`.
+        with transaction.atomic():
+            if self.file and not self.file._committed:
+                self.file_name = Path(self.file.name).name
+                # Stored before the row is written, so that we know which blob it is.
+                self.file.save(self.file.name, self.file.file, save=False)
+
+            if self.file and (self.blob is None or self.blob.name != self.file.name):
+                self.blob = Blob.objects.filter(name=self.file.name).first()
+
+            super().save(*args, **kwargs)
 
     def get_absolute_url(self):
         return reverse(
@@ -0,0 +1,164 @@
+import base64
+import datetime
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from django.core.exceptions import BadRequest, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Keep the microseconds, which `DjangoJSONEncoder` drops.
+
+    Otherwise rows whose times differ by less than a millisecond could be skipped
+    between pages.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+
+        return super().default(o)
+
+
+@dataclass
+class KeysetPage:
+    object_list: list[models.Model]
+    next_cursor: Optional[str]
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """Paginate a queryset by seeking past the last row of the previous page.
+
+    Unlike offset pagination the cost of fetching a page does not grow with how deep
+    into the results you are, as long as an index backs the ordering.
+
+    The ordering must be unique and every field in it must be non-nullable, so it
+    should always end with the primary key.
+
+    Example:
+        paginator = KeysetPaginator(queryset, ordering=["-start_date", "-pk"])
+        page = paginator.get_page(request.GET.get("cursor"))
+    """
+
+    def __init__(self, queryset: models.QuerySet, ordering: list[str], per_page: int):
+        self.queryset = queryset
+        self.ordering = ordering
+        self.per_page = per_page
+
+    def get_page(self, cursor: Optional[str] = None) -> KeysetPage:
+        queryset = self.queryset.order_by(*self.ordering)
+
+        if cursor:
+            queryset = queryset.filter(self._get_seek_filter(self.decode(cursor)))
+
+        # Fetch an extra row to find out if there is a next page.
+        object_list = list(queryset[: self.per_page + 1])
+
+        next_cursor = None
+
+        if len(object_list) > self.per_page:
+            object_list = object_list[: self.per_page]
+            next_cursor = self.encode(self._get_values(object_list[-1]))
+
+        return KeysetPage(object_list=object_list, next_cursor=next_cursor)
+
+    def _get_values(self, obj: models.Model) -> list[Any]:
+        return [getattr(obj, field.lstrip("-")) for field in self.ordering]
+
+    def _get_seek_filter(self, values: list[Any]) -> Q:
+        # (a, b) > (x, y) becomes (a > x) OR (a = x AND b > y), taking into account
+        # the direction of each field.
+        seek_filter = Q()
+
+        for i, field in enumerate(self.ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+
+            previous = {
+                prev_field.lstrip("-"): value
+                for prev_field, value in zip(self.ordering[:i], values)
+            }
+
+            seek_filter |= Q(**previous, **{f"{name}__{lookup}": values[i]})
+
+        return seek_filter
+
+    def _get_field(self, name: str) -> models.Field:
+        if name in self.queryset.query.annotations:
+            return self.queryset.query.annotations[name].output_field
+
+        if name == "pk":
+            return self.queryset.model._meta.pk
+
+        return self.queryset.model._meta.get_field(name)
+
+    def encode(self, values: list[Any]) -> str:
+        data = json.dumps(values, cls=CursorEncoder).encode("utf-8")
+
+        return base64.urlsafe_b64encode(data).decode("ascii")
+
+    def decode(self, cursor: str) -> list[Any]:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except (ValueError, TypeError) as e:
+            raise InvalidCursor("Invalid cursor") from e
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise InvalidCursor("Invalid cursor")
+
+        try:
+            return [
+                self._get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (ValidationError, TypeError, ValueError) as e:
+            raise InvalidCursor("Invalid cursor") from e
+
+
+def paginate(request, queryset: models.QuerySet, ordering: list[str], per_page: int):
+    """Return the template context for a page of the queryset.
+
+    The cursor is read from the `cursor` query parameter, and the links to the first
+    and next pages keep the rest of the query string.
+
+    Raises:
+        BadRequest: If the cursor is invalid.
+    """
+    paginator = KeysetPaginator(queryset, ordering=ordering, per_page=per_page)
+
+    try:
+        page = paginator.get_page(request.GET.get("cursor"))
+    except InvalidCursor:
+        raise BadRequest("Invalid cursor")
+
+    query = request.GET.copy()
+    query.pop("cursor", None)
+
+    context = {
+        "page": page,
+        "first_page_query": query.urlencode(),
+    }
+
+    if page.has_next:
+        query["cursor"] = page.next_cursor
+        context["next_page_query"] = query.urlencode()
+
+    return context
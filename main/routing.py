@@ -0,0 +1,148 @@
+import functools
+import operator
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+from django.db import models
+
+
+@dataclass(frozen=True)
+class ApprovalState:
+    """The approvals of a resourcing request, as bitsets over the approval types."""
+
+    # The types which have an approval, including cleared ones.
+    recorded: int
+    # The types whose approval has been given.
+    approved: int
+
+
+@dataclass(frozen=True)
+class Route:
+    # The index of the current stage, which is the number of stages once the
+    # resourcing request has every approval.
+    stage: int
+    # The types in the current stage which have not been approved.
+    pending_types: tuple[models.TextChoices, ...]
+
+    @property
+    def is_approved(self) -> bool:
+        return not self.pending_types
+
+
+class ApprovalRouter:
+    """Work out where a resourcing request is in the approval stages.
+
+    The router is compiled once from the stages into bitmasks and a lookup table
+    with an entry for every combination of approvals, so routing a request never
+    walks the stages. Reordering the stages only means changing what the router is
+    compiled from.
+
+    Example:
+        router = ApprovalRouter(Approval.ORDER)
+        route = router.route(router.get_state(resourcing_request.get_approvals()))
+    """
+
+    def __init__(self, stages: Sequence[Sequence[models.TextChoices]]):
+        self.stages = [tuple(stage) for stage in stages]
+        self.types = [approval_type for stage in self.stages for approval_type in stage]
+        self.bits = {
+            approval_type: 1 << i for i, approval_type in enumerate(self.types)
+        }
+        self.type_stages = {
+            approval_type: i
+            for i, stage in enumerate(self.stages)
+            for approval_type in stage
+        }
+
+        self.stage_masks = [self._get_mask(stage) for stage in self.stages]
+        # The stages up to and including each stage.
+        self.prefix_masks = [
+            self._get_mask(self.types[: self.types.index(stage[-1]) + 1])
+            for stage in self.stages
+        ]
+
+        self._routes = tuple(
+            self._compile_route(approved) for approved in range(1 << len(self.types))
+        )
+
+    def _get_mask(self, approval_types) -> int:
+        return functools.reduce(operator.or_, (self.bits[x] for x in approval_types), 0)
+
+    def _compile_route(self, approved: int) -> Route:
+        for stage, mask in enumerate(self.stage_masks):
+            if approved & mask != mask:
+                return Route(
+                    stage=stage, pending_types=self.get_types(mask & ~approved)
+                )
+
+        return Route(stage=len(self.stages), pending_types=())
+
+    @property
+    def approved_stage(self) -> int:
+        """The stage of a resourcing request which has every approval."""
+        return len(self.stages)
+
+    def get_types(self, bitset: int) -> tuple[models.TextChoices, ...]:
+        """Return the approval types in the bitset, in stage order."""
+        return tuple(x for x in self.types if bitset & self.bits[x])
+
+    def get_stage(self, approval_type: models.TextChoices) -> int:
+        return self.type_stages[approval_type]
+
+    def get_stage_label(self, stage: int) -> str:
+        if stage == self.approved_stage:
+            return "Approved"
+
+        return ", ".join(x.label for x in self.stages[stage])
+
+    def get_stage_choices(self) -> list[tuple[int, str]]:
+        return [
+            (stage, self.get_stage_label(stage))
+            for stage in range(self.approved_stage + 1)
+        ]
+
+    def get_state(
+        self, approvals: Mapping[models.TextChoices, Optional[Any]]
+    ) -> ApprovalState:
+        """Return the state of the given approvals.
+
+        Args:
+            approvals: The approval, or `None`, for each type, as returned by
+                `ResourcingRequest.get_approvals`.
+        """
+        recorded = 0
+        approved = 0
+
+        for approval_type, approval in approvals.items():
+            if approval is None:
+                continue
+
+            recorded |= self.bits[approval_type]
+
+            if approval.approved:
+                approved |= self.bits[approval_type]
+
+        return ApprovalState(recorded=recorded, approved=approved)
+
+    def route(self, state: ApprovalState) -> Route:
+        return self._routes[state.approved]
+
+    def get_notification_targets(
+        self, state: ApprovalState, approval_type: models.TextChoices
+    ) -> tuple[models.TextChoices, ...]:
+        """Return the approval types to notify after an approval has been given.
+
+        Nobody is notified until every stage up to the given approval's stage has an
+        approval, and then only the types in the next stage without an approval are.
+        """
+        stage = self.type_stages[approval_type]
+        prefix_mask = self.prefix_masks[stage]
+
+        if state.recorded & prefix_mask != prefix_mask:
+            return ()
+
+        if stage + 1 == len(self.stages):
+            return ()
+
+        return self.get_types(self.stage_masks[stage + 1] & ~state.recorded)
@@ -0,0 +1,82 @@
+from django.db import transaction
+
+from main.models import Approval, ApprovalInboxItem, ResourcingRequest
+
+
+class ApprovalInboxService:
+    @staticmethod
+    def get_pending_approval_types(
+        resourcing_request: ResourcingRequest,
+    ) -> list[Approval.Type]:
+        """Return the approval types which have not been approved yet.
+
+        An approval is pending if it is missing, has been cleared or was rejected.
+        """
+        approval_pks = [
+            getattr(resourcing_request, f"{approval_type.value}_approval_id")
+            for approval_type in Approval.Type
+        ]
+
+        approved_types = set(
+            Approval.objects.filter(pk__in=approval_pks, approved=True).values_list(
+                "type", flat=True
+            )
+        )
+
+        return [x for x in Approval.Type if x not in approved_types]
+
+    @classmethod
+    def sync(cls, resourcing_request: ResourcingRequest) -> None:
+        """Bring the approval inbox in line with the given resourcing request.
+
+        Items which are still pending keep their `pending_since` timestamp.
+
+        Args:
+            resourcing_request: The resourcing request which has changed.
+        """
+        inbox = ApprovalInboxItem.objects.filter(resourcing_request=resourcing_request)
+
+        if not resourcing_request.is_awaiting_approvals:
+            inbox.delete()
+
+            return
+
+        pending_types = cls.get_pending_approval_types(resourcing_request)
+
+        inbox.exclude(approval_type__in=pending_types).delete()
+
+        ApprovalInboxItem.objects.bulk_create(
+            [
+                ApprovalInboxItem(
+                    resourcing_request=resourcing_request,
+                    approval_type=approval_type,
+                    stage=Approval.get_stage(approval_type),
+                )
+                for approval_type in pending_types
+            ],
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    @transaction.atomic
+    def rebuild(cls) -> int:
+        """Repair any drift between the approval inbox and the resourcing requests.
+
+        Returns:
+            The number of resourcing requests which were synced.
+        """
+        ApprovalInboxItem.objects.exclude(
+            resourcing_request__state=ResourcingRequest.State.AWAITING_APPROVALS
+        ).delete()
+
+        resourcing_requests = ResourcingRequest.objects.filter(
+            state=ResourcingRequest.State.AWAITING_APPROVALS
+        )
+
+        count = 0
+
+        for resourcing_request in resourcing_requests.iterator():
+            cls.sync(resourcing_request)
+            count += 1
+
+        return count
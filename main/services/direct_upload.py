@@ -0,0 +1,200 @@
+import uuid
+from dataclasses import dataclass
+from http.client import HTTPException
+from pathlib import Path
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import UploadFileException
+from django_chunk_upload_handlers.clam_av import ClamAVFileUploadHandler
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from main.models import (
+    CestDocument,
+    ResourcingRequest,
+    resourcing_request_directory_path,
+)
+from user.models import User
+
+
+# How long the browser has to upload the file, in seconds.
+UPLOAD_EXPIRES = 60 * 15
+SIGNING_SALT = "main.services.direct_upload"
+# The first bytes of every PDF.
+PDF_SIGNATURE = b"%PDF-"
+CLAM_AV_UPLOAD_HANDLER = "django_chunk_upload_handlers.clam_av.ClamAVFileUploadHandler"
+
+
+class DirectUploadError(Exception):
+    pass
+
+
+@dataclass
+class UploadPolicy:
+    """Where and how the browser should post the file."""
+
+    url: str
+    fields: dict[str, str]
+
+
+class DirectUploadService:
+    """Upload CEST documents straight to the bucket, without passing through the app.
+
+    The browser posts the file to S3 under a presigned policy, which only allows a
+    file up to the maximum size under a key made for the upload. S3 then redirects the
+    browser back to the app with the key. The object must start like a PDF, and is
+    scanned for viruses wherever form uploads are, before it is recorded.
+
+    Example:
+        policy = DirectUploadService.get_policy(resourcing_request, user, url)
+        # The browser posts the file to S3, which redirects to `url`.
+        name = DirectUploadService.confirm(resourcing_request, user, token, key)
+    """
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return isinstance(default_storage, S3Boto3Storage)
+
+    @staticmethod
+    def is_scanned() -> bool:
+        return CLAM_AV_UPLOAD_HANDLER in settings.FILE_UPLOAD_HANDLERS
+
+    @staticmethod
+    def _get_client():
+        return default_storage.connection.meta.client
+
+    @staticmethod
+    def _is_pdf(client, bucket: str, key: str) -> bool:
+        # The policy sets the Content-Type itself, so only the content can tell.
+        body = client.get_object(
+            Bucket=bucket, Key=key, Range=f"bytes=0-{len(PDF_SIGNATURE) - 1}"
+        )["Body"]
+
+        return body.read() == PDF_SIGNATURE
+
+    @staticmethod
+    def _scan(client, bucket: str, key: str, size: int) -> bool:
+        """Return whether ClamAV passed the object.
+
+        The object is streamed from the bucket through the same handler which scans
+        form uploads, so the result is recorded in the same way.
+        """
+        handler = ClamAVFileUploadHandler()
+        handler.new_file(
+            "file", Path(key).name, "application/pdf", size, content_type_extra={}
+        )
+
+        if handler.skip_av_check:
+            return True
+
+        body = client.get_object(Bucket=bucket, Key=key)["Body"]
+        start = 0
+
+        try:
+            for chunk in body.iter_chunks(handler.chunk_size):
+                handler.receive_data_chunk(chunk, start)
+                start += len(chunk)
+
+            handler.file_complete(start)
+        finally:
+            handler.av_conn.close()
+
+        results = handler.content_type_extra.get("clam_av_results", [])
+
+        return bool(results) and all(x["av_passed"] for x in results)
+
+    @classmethod
+    def get_policy(
+        cls, resourcing_request: ResourcingRequest, user: User, redirect_url: str
+    ) -> UploadPolicy:
+        """Return the policy for uploading a CEST document.
+
+        Args:
+            redirect_url: The absolute URL of the view which confirms the upload. A
+                token for the upload is added to it.
+        """
+        # A new directory for each upload keeps the uploads apart.
+        prefix = resourcing_request_directory_path(
+            CestDocument(resourcing_request=resourcing_request), f"{uuid.uuid4()}/"
+        )
+        token = signing.dumps(
+            {
+                "resourcing_request": resourcing_request.pk,
+                "user": user.pk,
+                "prefix": prefix,
+            },
+            salt=SIGNING_SALT,
+        )
+        fields = {
+            "Content-Type": "application/pdf",
+            "success_action_redirect": f"{redirect_url}?token={token}",
+        }
+
+        post = cls._get_client().generate_presigned_post(
+            Bucket=default_storage.bucket_name,
+            Key=prefix + "${filename}",
+            Fields=fields,
+            Conditions=[
+                ["starts-with", "$key", prefix],
+                ["content-length-range", 1, settings.CEST_DOCUMENT_MAX_UPLOAD_SIZE],
+                *({name: value} for name, value in fields.items()),
+            ],
+            ExpiresIn=UPLOAD_EXPIRES,
+        )
+
+        return UploadPolicy(url=post["url"], fields=post["fields"])
+
+    @classmethod
+    def confirm(
+        cls, resourcing_request: ResourcingRequest, user: User, token: str, key: str
+    ) -> str:
+        """Check the uploaded object and return its name in storage.
+
+        Raises:
+            DirectUploadError: If the upload can't be recorded. An object which was
+                uploaded but is not allowed is deleted.
+        """
+        try:
+            upload = signing.loads(token, salt=SIGNING_SALT, max_age=UPLOAD_EXPIRES)
+        except signing.BadSignature:
+            raise DirectUploadError("The upload has expired, please try again.")
+
+        if (
+            upload["resourcing_request"] != resourcing_request.pk
+            or upload["user"] != user.pk
+            or not key.startswith(upload["prefix"])
+        ):
+            raise DirectUploadError("The upload is not for this contractor request.")
+
+        client = cls._get_client()
+        bucket = default_storage.bucket_name
+
+        try:
+            head = client.head_object(Bucket=bucket, Key=key)
+        except ClientError:
+            raise DirectUploadError("The file was not uploaded, please try again.")
+
+        error = None
+
+        if head["ContentLength"] > settings.CEST_DOCUMENT_MAX_UPLOAD_SIZE:
+            error = "The CEST document is too large."
+        elif not key.lower().endswith(".pdf") or not cls._is_pdf(client, bucket, key):
+            error = "The CEST document must be a PDF."
+        elif cls.is_scanned():
+            try:
+                if not cls._scan(client, bucket, key, head["ContentLength"]):
+                    error = "A virus was found in the CEST document."
+            except (UploadFileException, HTTPException, OSError, ValueError):
+                error = (
+                    "The CEST document could not be checked for viruses, please try "
+                    "again."
+                )
+
+        if error:
+            client.delete_object(Bucket=bucket, Key=key)
+
+            raise DirectUploadError(error)
+
+        return key
@@ -0,0 +1,32 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+
+
+# How long before a signed URL expires to stop handing it out, in seconds.
+EXPIRY_MARGIN = 30
+
+
+def get_download_url_timeout() -> int:
+    # django-storages signs URLs for an hour unless told otherwise.
+    expire = getattr(settings, "AWS_QUERYSTRING_EXPIRE", 60 * 60)
+
+    return max(expire - EXPIRY_MARGIN, 0)
+
+
+def get_download_url(name: str) -> str:
+    """Return the URL to download a file, signing it at most once per timeout.
+
+    The URLs are cached by the file's name, which changes whenever a new file is
+    uploaded, so they never have to be invalidated.
+    """
+    cache_key = f"download-url:{hashlib.sha256(name.encode()).hexdigest()}"
+    url = cache.get(cache_key)
+
+    if url is None:
+        url = default_storage.url(name)
+        cache.set(cache_key, url, timeout=get_download_url_timeout())
+
+    return url
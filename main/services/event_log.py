@@ -1,9 +1,13 @@
+import threading
+from contextlib import contextmanager
 from enum import Enum, unique
 from typing import Any, Optional
 
-from django.db import models
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
 
 import event_log.models as event_log_models
+from main.models import ResourcingRequest
 from user.models import User
 
 
@@ -37,7 +41,92 @@ class EventType(Enum):
     APPROVAL_CLEARED = ("Cleared the approval for {group}", {"group"})
 
 
+class EventTypeRegistry:
+    """Map each `EventType` to the primary key of its row in the event type table.
+
+    The mapping is loaded on first use and cleared whenever the table might have
+    changed, see `main.signals`.
+    """
+
+    def __init__(self) -> None:
+        self._pks: Optional[dict[str, int]] = None
+
+    def get_pk(self, event_type: EventType) -> int:
+        if self._pks is None or event_type.name not in self._pks:
+            self._pks = dict(
+                event_log_models.EventType.objects.values_list("code", "pk")
+            )
+
+        try:
+            return self._pks[event_type.name]
+        except KeyError:
+            raise event_log_models.EventType.DoesNotExist(
+                f"No event type with the code {event_type.name}"
+            )
+
+    def clear(self, **kwargs) -> None:
+        self._pks = None
+
+
+event_type_registry = EventTypeRegistry()
+
+# The events buffered by `EventLogService.batch`.
+_buffer = threading.local()
+
+
 class EventLogService:
+    @staticmethod
+    @contextmanager
+    def batch():
+        """Buffer the events added in the block and write them in one query.
+
+        The block runs in a transaction and the events are written at the end of it,
+        so they are only saved along with the changes they describe.
+
+        Example:
+            with EventLogService.batch():
+                resourcing_request.save()
+                EventLogService.add_event(...)
+        """
+        events = getattr(_buffer, "events", None)
+
+        if events is not None:
+            # Nested, so the outermost block writes the events. If this block fails
+            # we drop its events along with its savepoint.
+            start = len(events)
+
+            try:
+                with transaction.atomic():
+                    yield
+            except Exception:
+                del events[start:]
+                raise
+
+            return
+
+        _buffer.events = events = []
+
+        try:
+            with transaction.atomic():
+                yield
+
+                event_log_models.Event.objects.bulk_create(events)
+
+                # The bulk write skips the signals which bump the versions.
+                resourcing_request_type = ContentType.objects.get_for_model(
+                    ResourcingRequest
+                )
+
+                ResourcingRequest.objects.filter(
+                    pk__in={
+                        event.object_id
+                        for event in events
+                        if event.content_type_id == resourcing_request_type.pk
+                    }
+                ).bump_version()
+        finally:
+            _buffer.events = None
+
     @classmethod
     def add_event(
         cls,
@@ -58,13 +147,13 @@ class EventLogService:
             ValueError: If the event_context is not correct.
 
         Returns:
-            The newly created event.
+            The newly created event. Inside `batch` the event is saved at the end of
+            the block.
         """
 
         if event_context is None:
             event_context = {}
 
-        code = event_type.name
         message, event_context_kwargs = event_type.value
 
         if event_context_kwargs:
@@ -73,13 +162,20 @@ class EventLogService:
 
             message = message.format(**event_context)
 
-        event = event_log_models.Event.objects.create(
+        event = event_log_models.Event(
             content_object=content_object,
-            event_type=event_log_models.EventType.objects.get(code=code),
+            event_type_id=event_type_registry.get_pk(event_type),
             user=user,
             description=message,
         )
 
+        events = getattr(_buffer, "events", None)
+
+        if events is None:
+            event.save()
+        else:
+            events.append(event)
+
         return event
 
 
@@ -122,25 +218,27 @@ class EventLogMixin:
         return super().form_valid(form)
 
     def dispatch(self, request, *args, **kwargs):
-        response = super().dispatch(request, *args, **kwargs)
-
         if request.method.lower() not in self.event_methods:
-            return response
+            return super().dispatch(request, *args, **kwargs)
 
-        if not self.event_success:
-            return response
+        # Log the event in the same transaction as the changes made by the view.
+        with EventLogService.batch():
+            response = super().dispatch(request, *args, **kwargs)
 
-        event_type = self.get_event_type()
+            if not self.event_success:
+                return response
 
-        if not event_type:
-            return response
+            event_type = self.get_event_type()
 
-        EventLogService.add_event(
-            content_object=self.get_event_content_object(),
-            user=request.user,
-            event_type=event_type,
-            event_context=self.get_event_context(),
-        )
+            if not event_type:
+                return response
+
+            EventLogService.add_event(
+                content_object=self.get_event_content_object(),
+                user=request.user,
+                event_type=event_type,
+                event_context=self.get_event_context(),
+            )
 
         return response
 
@@ -0,0 +1,224 @@
+import csv
+import datetime
+import io
+import itertools
+import json
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.utils import timezone
+
+from main.models import Approval, ResourcingRequest, approval_router
+
+
+# The exported columns, mapped to the lookup they are read from. The approvals are
+# added after these, see `ResourcingRequestExport.get_lookups`.
+FIELDS = {
+    "id": "pk",
+    "job_title": "job_title",
+    "project_name": "project_name",
+    "state": "state",
+    "approval_stage": "current_stage",
+    "requestor": "requestor__email",
+    "chief": "chief__email",
+    "profession": "profession__name",
+    "is_ir35": "is_ir35",
+    "start_date": "start_date",
+    "end_date": "end_date",
+    "group": "financial_information__group__group_name",
+    "directorate": "financial_information__directorate__directorate_name",
+    "cost_centre_code": "financial_information__cost_centre_code_id",
+    "cost_centre": "financial_information__cost_centre_code__cost_centre_name",
+    "programme_code": "financial_information__programme_code_id",
+    "programme": "financial_information__programme_code__programme_description",
+    "area_of_work": "financial_information__area_of_work",
+    "total_budget": "financial_information__total_budget",
+    "min_day_rate": "financial_information__min_day_rate",
+    "max_day_rate": "financial_information__max_day_rate",
+    "days_required": "financial_information__days_required",
+    "project_fees": "financial_information__project_fees",
+}
+
+# The status and date columns for each approval type, in the order of the types.
+APPROVAL_COLUMNS = [
+    (f"{approval_type.value}_approval_status", f"{approval_type.value}_approval_date")
+    for approval_type in Approval.Type
+]
+# The columns which hold text someone has typed in, see `escape_formula`.
+TEXT_COLUMNS = {
+    "job_title",
+    "project_name",
+    "requestor",
+    "chief",
+    "profession",
+    "group",
+    "directorate",
+    "cost_centre",
+    "programme",
+}
+
+STATE_LABELS = dict(ResourcingRequest.State.choices)
+# A cleared approval has to be given again.
+APPROVAL_STATUSES = {True: "Approved", False: "Rejected", None: "Cleared"}
+
+# Characters which make a spreadsheet treat a cell as a formula.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_formula(value):
+    """Stop a spreadsheet from evaluating a value which looks like a formula."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+
+    return value
+
+
+def flush(buffer: io.StringIO) -> str:
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    return value
+
+
+class ResourcingRequestExport:
+    """Stream resourcing requests with their financial and approval data.
+
+    The rows are read through a server side cursor and written out a chunk at a time,
+    so the export takes the same memory however many rows there are.
+
+    Example:
+        export = ResourcingRequestExport(ResourcingRequest.objects.all(), "csv")
+        response = StreamingHttpResponse(export, content_type=export.content_type)
+    """
+
+    FORMATS = {
+        "csv": "text/csv",
+        "jsonl": "application/x-ndjson",
+    }
+    # The number of rows fetched from the database, and written out, at a time.
+    CHUNK_SIZE = 2000
+
+    def __init__(self, queryset: models.QuerySet, format: str):
+        if format not in self.FORMATS:
+            raise ValueError(f"Unknown export format: {format}")
+
+        self.queryset = queryset
+        self.format = format
+        self.row_count = 0
+
+    @property
+    def content_type(self) -> str:
+        return self.FORMATS[self.format]
+
+    def get_filename(self) -> str:
+        return f"contractor-requests-{timezone.localdate().isoformat()}.{self.format}"
+
+    @staticmethod
+    def get_columns() -> list[str]:
+        return [*FIELDS, *itertools.chain.from_iterable(APPROVAL_COLUMNS)]
+
+    @staticmethod
+    def get_lookups() -> list[str]:
+        return [
+            *FIELDS.values(),
+            *[
+                lookup
+                for approval_type in Approval.Type
+                for lookup in (
+                    f"{approval_type.value}_approval",
+                    f"{approval_type.value}_approval__approved",
+                    f"{approval_type.value}_approval__timestamp",
+                )
+            ],
+        ]
+
+    def __iter__(self) -> Iterator[str]:
+        if self.format == "csv":
+            return self.iter_csv()
+
+        return self.iter_jsonl()
+
+    def iter_rows(self) -> Iterator[dict[str, Any]]:
+        values = self.queryset.values_list(*self.get_lookups()).iterator(
+            chunk_size=self.CHUNK_SIZE
+        )
+
+        # Outside of a transaction the server side cursor is declared `WITH HOLD`,
+        # and Postgres works out every row before returning the first.
+        with transaction.atomic():
+            for values_row in values:
+                self.row_count += 1
+
+                yield self.get_row(values_row)
+
+    def get_row(self, values_row: tuple) -> dict[str, Any]:
+        row = dict(zip(FIELDS, values_row))
+        approvals = values_row[len(FIELDS) :]
+
+        if row["state"] == ResourcingRequest.State.AWAITING_APPROVALS:
+            row["approval_stage"] = approval_router.get_stage_label(
+                row["approval_stage"]
+            )
+        else:
+            row["approval_stage"] = None
+
+        row["state"] = STATE_LABELS[row["state"]]
+        row["start_date"] = row["start_date"].isoformat()
+        row["end_date"] = row["end_date"].isoformat()
+
+        for i, (status_column, date_column) in enumerate(APPROVAL_COLUMNS):
+            approval, approved, timestamp = approvals[i * 3 : i * 3 + 3]
+
+            row[status_column] = APPROVAL_STATUSES[approved] if approval else None
+            row[date_column] = timestamp and self.format_datetime(timestamp)
+
+        return row
+
+    @staticmethod
+    def format_datetime(value: datetime.datetime) -> str:
+        return timezone.localtime(value).isoformat(timespec="seconds")
+
+    def iter_chunks(
+        self, buffer: io.StringIO, write_row: Callable[[dict[str, Any]], Any]
+    ) -> Iterator[str]:
+        for i, row in enumerate(self.iter_rows(), start=1):
+            write_row(row)
+
+            if i % self.CHUNK_SIZE == 0:
+                yield flush(buffer)
+
+        if chunk := flush(buffer):
+            yield chunk
+
+    def iter_csv(self) -> Iterator[str]:
+        columns = self.get_columns()
+        text_indexes = [i for i, x in enumerate(columns) if x in TEXT_COLUMNS]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def write_row(row):
+            values = [row[x] for x in columns]
+
+            for i in text_indexes:
+                values[i] = escape_formula(values[i])
+
+            writer.writerow(values)
+
+        writer.writerow(columns)
+        # The header goes out before the query runs, so the download starts
+        # straight away.
+        yield flush(buffer)
+
+        yield from self.iter_chunks(buffer, write_row)
+
+    def iter_jsonl(self) -> Iterator[str]:
+        buffer = io.StringIO()
+
+        def write_row(row):
+            buffer.write(json.dumps(row, cls=DjangoJSONEncoder))
+            buffer.write("\n")
+
+        yield from self.iter_chunks(buffer, write_row)
@@ -125,6 +125,9 @@ def create_full_test_resourcing_request(
         **create_sds_status_determination_test_data(),
     )
 
+    # The supporting documents have updated the completeness in the database.
+    resourcing_request.refresh_from_db(fields=["completeness"])
+
     return resourcing_request
 
 
@@ -5,8 +5,9 @@ from django.conf import settings
 from django.core.exceptions import PermissionDenied
 
 from main.models import Approval, Comment, ResourcingRequest
+from main.services.approval_inbox import ApprovalInboxService
 from main.services.event_log import EventLogService, EventType
-from main.tasks import notify_approvers, send_notification
+from main.tasks import notify_approvers, notify_user, send_notification
 from user.models import User
 
 
@@ -18,8 +19,9 @@ class ReviewAction(Enum):
 
 
 class ReviewService:
-    @staticmethod
+    @classmethod
     def add_review(
+        cls,
         user: User,
         resourcing_request: ResourcingRequest,
         resourcing_request_url: str,
@@ -68,7 +70,54 @@ class ReviewService:
             if not user.has_perm("main.add_comment"):
                 raise PermissionDenied("The user doesn't have permission to comment")
 
+        with EventLogService.batch():
+            approval = cls._save_review(
+                user=user,
+                resourcing_request=resourcing_request,
+                action=action,
+                approval_type=approval_type,
+                text=text,
+            )
+
+        if action == ReviewAction.APPROVE:
+            notify_approvers.delay(
+                resourcing_request.pk,
+                resourcing_request_url,
+                approval.pk,
+            )
+
+            send_notification.delay(
+                email_address=resourcing_request.requestor.contact_email,
+                template_id=settings.GOVUK_NOTIFY_APPROVAL_TEMPLATE_ID,
+                personalisation={
+                    "first_name": resourcing_request.requestor.first_name,
+                    "approved_or_rejected": "approved",
+                    "approver": user.get_full_name(),
+                    "resourcing_request_url": resourcing_request_url,
+                },
+            )
+
+        if action in (ReviewAction.COMMENT, ReviewAction.REQUEST_CHANGES):
+            notify_user(
+                resourcing_request.requestor,
+                settings.GOVUK_NOTIFY_COMMENT_LEFT_TEMPLATE_ID,
+                {
+                    "commenter": user.get_full_name(),
+                    "resourcing_request_url": resourcing_request_url,
+                },
+            )
+
+    @staticmethod
+    def _save_review(
+        user: User,
+        resourcing_request: ResourcingRequest,
+        action: ReviewAction,
+        approval_type: Optional[Approval.Type],
+        text: Optional[str],
+    ) -> Optional[Approval]:
+        """Save the review and log its events, returning the approval if any."""
         comment = None
+        approval = None
 
         if text:
             comment = Comment.objects.create(
@@ -102,6 +151,8 @@ class ReviewService:
                 event_context={"group": Approval.Type(approval.type).label},
             )
 
+            resourcing_request.update_current_stage()
+
             if resourcing_request.get_is_approved():
                 resourcing_request.state = resourcing_request.State.APPROVED
 
@@ -113,37 +164,13 @@ class ReviewService:
 
             resourcing_request.save()
 
-        if action == ReviewAction.APPROVE:
-            notify_approvers.delay(
-                resourcing_request.pk,
-                resourcing_request_url,
-                approval.pk,
-            )
-
-            send_notification.delay(
-                email_address=resourcing_request.requestor.contact_email,
-                template_id=settings.GOVUK_NOTIFY_APPROVAL_TEMPLATE_ID,
-                personalisation={
-                    "first_name": resourcing_request.requestor.first_name,
-                    "approved_or_rejected": "approved" if approved else "rejected",
-                    "approver": user.get_full_name(),
-                    "resourcing_request_url": resourcing_request_url,
-                },
-            )
+            ApprovalInboxService.sync(resourcing_request)
 
         if action in (ReviewAction.COMMENT, ReviewAction.REQUEST_CHANGES):
-            send_notification.delay(
-                email_address=resourcing_request.requestor.contact_email,
-                template_id=settings.GOVUK_NOTIFY_COMMENT_LEFT_TEMPLATE_ID,
-                personalisation={
-                    "first_name": resourcing_request.requestor.first_name,
-                    "commenter": user.get_full_name(),
-                    "resourcing_request_url": resourcing_request_url,
-                },
-            )
-
             EventLogService.add_event(
                 content_object=resourcing_request,
                 user=user,
                 event_type=EventType.COMMENTED,
             )
+
+        return approval
@@ -0,0 +1,139 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+import event_log.models as event_log_models
+from change_log.models import ChangeBuffer
+from change_log.signals import changes_applied
+from main.models import (
+    Approval,
+    CestDocument,
+    Comment,
+    FinancialInformation,
+    InterimRequest,
+    JobDescription,
+    ResourcingRequest,
+    SdsStatusDetermination,
+    SearchDocument,
+    StatementOfWork,
+    StatementOfWorkModule,
+    StatementOfWorkModuleDeliverable,
+)
+from main.services.event_log import event_type_registry
+
+
+# The supporting documents which affect `ResourcingRequest.completeness`, mapped to a
+# lookup from the resourcing request and the attribute on the document to match it
+# with. Parent ids are used so this still works after the document is deleted.
+COMPLETENESS_LOOKUPS = {
+    FinancialInformation: ("pk", "resourcing_request_id"),
+    JobDescription: ("pk", "resourcing_request_id"),
+    StatementOfWork: ("pk", "resourcing_request_id"),
+    StatementOfWorkModule: ("statement_of_work", "statement_of_work_id"),
+    StatementOfWorkModuleDeliverable: (
+        "statement_of_work__modules",
+        "statement_of_work_module_id",
+    ),
+    InterimRequest: ("pk", "resourcing_request_id"),
+    CestDocument: ("pk", "resourcing_request_id"),
+    SdsStatusDetermination: ("pk", "resourcing_request_id"),
+}
+
+
+def refresh_completeness(sender, instance, **kwargs):
+    lookup, attname = COMPLETENESS_LOOKUPS[sender]
+
+    ResourcingRequest.objects.filter(
+        **{lookup: getattr(instance, attname)}
+    ).refresh_completeness()
+
+
+# Everything shown with a resourcing request, mapped like `COMPLETENESS_LOOKUPS`.
+VERSION_LOOKUPS = {
+    **COMPLETENESS_LOOKUPS,
+    ResourcingRequest: ("pk", "pk"),
+    Approval: ("pk", "resourcing_request_id"),
+    Comment: ("pk", "resourcing_request_id"),
+}
+
+
+def bump_version(sender, instance, **kwargs):
+    lookup, attname = VERSION_LOOKUPS[sender]
+
+    ResourcingRequest.objects.filter(
+        **{lookup: getattr(instance, attname)}
+    ).bump_version()
+
+
+def bump_version_for_changes(sender, instances, **kwargs):
+    # The change projections shown with a resourcing request are written after its
+    # transaction has committed, and so after `bump_version`. Anything cached from
+    # the old projections in between has to be moved on from too.
+    filters = Q()
+
+    for instance in instances:
+        if type(instance) in VERSION_LOOKUPS:
+            lookup, attname = VERSION_LOOKUPS[type(instance)]
+            filters |= Q(**{lookup: getattr(instance, attname)})
+
+    if filters:
+        ResourcingRequest.objects.filter(filters).bump_version()
+
+
+# The models with searchable text, mapped to the attribute on them which holds the id
+# of their resourcing request, see `get_search_vector_expression`.
+SEARCH_DOCUMENT_LOOKUPS = {
+    ResourcingRequest: "pk",
+    JobDescription: "resourcing_request_id",
+    StatementOfWork: "resourcing_request_id",
+    InterimRequest: "resourcing_request_id",
+    SdsStatusDetermination: "resourcing_request_id",
+    Comment: "resourcing_request_id",
+}
+
+
+def create_search_document(sender, instance, created, **kwargs):
+    if created:
+        SearchDocument.objects.create(resourcing_request=instance)
+
+
+def refresh_search_document(sender, instance, **kwargs):
+    attname = SEARCH_DOCUMENT_LOOKUPS[sender]
+
+    SearchDocument.objects.filter(pk=getattr(instance, attname)).refresh()
+
+
+def bump_event_version(sender, instance, **kwargs):
+    if (
+        instance.content_type_id
+        == ContentType.objects.get_for_model(ResourcingRequest).pk
+    ):
+        ResourcingRequest.objects.filter(pk=instance.object_id).bump_version()
+
+
+def connect():
+    for model in COMPLETENESS_LOOKUPS:
+        post_save.connect(refresh_completeness, sender=model)
+        post_delete.connect(refresh_completeness, sender=model)
+
+    for model in VERSION_LOOKUPS:
+        post_save.connect(bump_version, sender=model)
+        post_delete.connect(bump_version, sender=model)
+
+    changes_applied.connect(bump_version_for_changes, sender=ChangeBuffer)
+
+    # The search document has to exist before it can be refreshed.
+    post_save.connect(create_search_document, sender=ResourcingRequest)
+
+    for model in SEARCH_DOCUMENT_LOOKUPS:
+        post_save.connect(refresh_search_document, sender=model)
+        post_delete.connect(refresh_search_document, sender=model)
+
+    # Events written in a batch are handled by `EventLogService.batch`.
+    post_save.connect(bump_event_version, sender=event_log_models.Event)
+    post_delete.connect(bump_event_version, sender=event_log_models.Event)
+
+    # Migrations and fixtures can change the event types.
+    post_migrate.connect(event_type_registry.clear)
+    post_save.connect(event_type_registry.clear, sender=event_log_models.EventType)
+    post_delete.connect(event_type_registry.clear, sender=event_log_models.EventType)
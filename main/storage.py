@@ -0,0 +1,163 @@
+import hashlib
+from pathlib import Path
+from typing import Iterable
+
+from django.core.files.storage import Storage, default_storage
+from django.db import transaction
+from django.utils.deconstruct import deconstructible
+from storages.backends.s3boto3 import S3Boto3Storage
+
+
+# The most keys S3 deletes in one request.
+S3_DELETE_BATCH_SIZE = 1000
+
+
+@deconstructible
+class ContentAddressedStorage(Storage):
+    """Store each file once, named by the SHA-256 of its content.
+
+    The files are stored as blobs in the default storage, and each blob is recorded
+    as a `Blob`. Saving a file which is already stored only hashes it, and returns
+    the name of the existing blob. Blobs which are no longer referred to are deleted
+    by the `delete_orphaned_blobs` command.
+
+    Save in the same transaction as the row which refers to the blob. The blob's row
+    is locked until that transaction ends, so that `delete_orphaned_blobs` can't
+    delete it in between.
+    """
+
+    location = "blobs/sha256"
+
+    @property
+    def storage(self) -> Storage:
+        return default_storage
+
+    def get_blob_name(self, digest: str, name: str) -> str:
+        # The extension is kept so that the blob is served with the right type.
+        return f"{self.location}/{digest[:2]}/{digest}{Path(name).suffix.lower()}"
+
+    def get_available_name(self, name, max_length=None):
+        # The name is chosen by `_save`.
+        return name
+
+    def _hash(self, content) -> tuple[str, int]:
+        sha256 = hashlib.sha256()
+        size = 0
+
+        for chunk in content.chunks():
+            sha256.update(chunk)
+            size += len(chunk)
+
+        return sha256.hexdigest(), size
+
+    def _get_blob(self, digest: str):
+        from main.models import Blob
+
+        # If `delete_orphaned_blobs` has the row locked this waits for it, and then
+        # finds the row gone, so the file is stored again.
+        return Blob.objects.select_for_update().filter(sha256=digest).first()
+
+    def _save(self, name, content):
+        from main.models import Blob
+
+        digest, size = self._hash(content)
+
+        with transaction.atomic():
+            if blob := self._get_blob(digest):
+                return blob.name
+
+            blob_name = self.storage.save(self.get_blob_name(digest, name), content)
+            blob, _ = Blob.objects.get_or_create(
+                sha256=digest, defaults={"name": blob_name, "size": size}
+            )
+
+        return blob.name
+
+    def adopt(self, name: str) -> str:
+        """Store a file which is already in the default storage as a blob.
+
+        The file is read to hash it, but in S3 a new blob is copied server side. The
+        file itself is left for the caller to delete once nothing refers to it. As
+        with saving, call this in the same transaction as the row which refers to
+        the blob.
+
+        Returns:
+            The name of the blob.
+        """
+        from main.models import Blob
+
+        with self.storage.open(name) as f:
+            digest, size = self._hash(f)
+
+        with transaction.atomic():
+            blob = self._get_blob(digest)
+
+            if blob is None:
+                blob_name = self.get_blob_name(digest, name)
+
+                if isinstance(self.storage, S3Boto3Storage):
+                    self.storage.bucket.copy(
+                        {"Bucket": self.storage.bucket_name, "Key": name}, blob_name
+                    )
+                else:
+                    with self.storage.open(name) as f:
+                        blob_name = self.storage.save(blob_name, f)
+
+                blob, _ = Blob.objects.get_or_create(
+                    sha256=digest, defaults={"name": blob_name, "size": size}
+                )
+
+        return blob.name
+
+    def delete_many(self, names: Iterable[str]) -> None:
+        """Delete the files, with as few requests as the storage allows."""
+        names = list(names)
+
+        if not isinstance(self.storage, S3Boto3Storage):
+            for name in names:
+                self.storage.delete(name)
+
+            return
+
+        for i in range(0, len(names), S3_DELETE_BATCH_SIZE):
+            self.storage.bucket.delete_objects(
+                Delete={
+                    "Objects": [
+                        {"Key": name} for name in names[i : i + S3_DELETE_BATCH_SIZE]
+                    ],
+                    "Quiet": True,
+                }
+            )
+
+    def _open(self, name, mode="rb"):
+        return self.storage.open(name, mode)
+
+    def delete(self, name):
+        self.storage.delete(name)
+
+    def exists(self, name):
+        return self.storage.exists(name)
+
+    def listdir(self, path):
+        return self.storage.listdir(path)
+
+    def size(self, name):
+        return self.storage.size(name)
+
+    def url(self, name):
+        return self.storage.url(name)
+
+    def path(self, name):
+        return self.storage.path(name)
+
+    def get_accessed_time(self, name):
+        return self.storage.get_accessed_time(name)
+
+    def get_created_time(self, name):
+        return self.storage.get_created_time(name)
+
+    def get_modified_time(self, name):
+        return self.storage.get_modified_time(name)
+
+
+content_addressed_storage = ContentAddressedStorage()
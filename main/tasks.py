@@ -1,14 +1,28 @@
+import itertools
 import logging
-from functools import partial
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from typing import Any, Optional, TypedDict
 
-from celery import group, shared_task
+import requests
+from celery import shared_task
 from django.conf import settings
+from django.db import transaction
 from django.db.models.query_utils import Q
+from notifications_python_client.errors import HTTPError
 from notifications_python_client.notifications import NotificationsAPIClient
 
 from main.constants import APPROVAL_TYPE_TO_GROUP, ApproverGroup
-from main.models import Approval, ResourcingRequest
+from main.models import (
+    Approval,
+    Blob,
+    CestDocument,
+    PendingNotification,
+    ResourcingRequest,
+    approval_router,
+)
+from main.storage import content_addressed_storage
 from user.models import User
 
 
@@ -21,16 +35,73 @@ class TestNotification(TypedDict):
     personalisation: Optional[dict[str, str]]
 
 
+class Recipient(TypedDict):
+    email_address: str
+    personalisation: dict[str, str]
+
+
 TEST_NOTIFICATION_BOX: list[TestNotification] = []
 
+# The final approval holds up the whole request, so it is never held for a digest.
+URGENT_APPROVAL_TYPES = {Approval.Type.DG_COO}
 
-@shared_task
-def send_notification(
-    email_address: str, template_id: str, personalisation: dict[str, str] = None
-):
-    if personalisation is None:
-        personalisation = {}
 
+class PooledNotificationsAPIClient(NotificationsAPIClient):
+    """A Notify client which keeps its connections alive between requests.
+
+    The upstream client opens a new connection for every request.
+    """
+
+    def __init__(self, *args, pool_size: int, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size
+        )
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+
+    # Mirrors `BaseAPIClient._perform_request`, but sends through the session.
+    def _perform_request(self, method, url, kwargs):
+        start_time = time.monotonic()
+
+        try:
+            response = self.session.request(method, url, **kwargs)
+            response.raise_for_status()
+
+            return response
+        except requests.RequestException as e:
+            raise HTTPError.create(e)
+        finally:
+            elapsed_time = time.monotonic() - start_time
+            logger.debug(f"API {method} request on {url} finished in {elapsed_time}")
+
+
+@lru_cache(maxsize=None)
+def get_notifications_client() -> PooledNotificationsAPIClient:
+    """Return the Notify client for this process."""
+    return PooledNotificationsAPIClient(
+        settings.GOVUK_NOTIFY_API_KEY,
+        pool_size=settings.GOVUK_NOTIFY_MAX_WORKERS,
+    )
+
+
+def is_retryable(error: Exception) -> bool:
+    """Return whether sending a notification could succeed if tried again.
+
+    Rate limiting, server errors and connection errors are worth retrying, but other
+    client errors like an invalid email address will never succeed.
+    """
+    if not isinstance(error, HTTPError):
+        return False
+
+    return error.status_code == 429 or error.status_code >= 500
+
+
+def deliver_notification(
+    email_address: str, template_id: str, personalisation: dict[str, str]
+) -> None:
     if settings.APP_ENV == "local":
         logging.info(
             "\n".join(
@@ -56,20 +127,124 @@ def send_notification(
 
         return
 
-    notifications_client = NotificationsAPIClient(settings.GOVUK_NOTIFY_API_KEY)
-    notifications_client.send_email_notification(
+    get_notifications_client().send_email_notification(
         email_address=email_address,
         template_id=template_id,
         personalisation=personalisation,
     )
 
 
+@shared_task
+def send_notification(
+    email_address: str, template_id: str, personalisation: dict[str, str] = None
+):
+    if personalisation is None:
+        personalisation = {}
+
+    deliver_notification(email_address, template_id, personalisation)
+
+
+@shared_task(bind=True, max_retries=3)
+def send_notifications(self, template_id: str, recipients: list[Recipient]):
+    """Send a notification to each of the recipients.
+
+    The notifications are sent concurrently. Recipients whose notification failed
+    with a retryable error are retried on their own, with a backoff.
+
+    Returns:
+        The email addresses which were sent to and which failed.
+    """
+
+    def deliver(recipient: Recipient) -> Optional[Exception]:
+        try:
+            deliver_notification(
+                recipient["email_address"], template_id, recipient["personalisation"]
+            )
+        except Exception as e:
+            return e
+
+        return None
+
+    with ThreadPoolExecutor(max_workers=settings.GOVUK_NOTIFY_MAX_WORKERS) as executor:
+        errors = list(executor.map(deliver, recipients))
+
+    sent = [r["email_address"] for r, e in zip(recipients, errors) if e is None]
+    failed = [r["email_address"] for r, e in zip(recipients, errors) if e is not None]
+    retry = [r for r, e in zip(recipients, errors) if e is not None and is_retryable(e)]
+
+    for recipient, error in zip(recipients, errors):
+        if error is not None:
+            logger.error(
+                f"Failed to send {template_id} to {recipient['email_address']}: "
+                f"{error}"
+            )
+
+    if retry and self.request.retries < self.max_retries:
+        raise self.retry(
+            kwargs={"template_id": template_id, "recipients": retry},
+            countdown=2**self.request.retries * 10,
+        )
+
+    return {"sent": sent, "failed": failed}
+
+
+def get_digest_templates() -> dict[str, str]:
+    """Return the templates which can be held for a digest, and their labels."""
+    return {
+        settings.GOVUK_NOTIFY_READY_FOR_APPROVAL_TEMPLATE_ID: "Ready for your approval",
+        settings.GOVUK_NOTIFY_RE_APPROVAL_TEMPLATE_ID: "Ready for your re-approval",
+        settings.GOVUK_NOTIFY_AMENDED_TEMPLATE_ID: "Amended and ready for review",
+        settings.GOVUK_NOTIFY_COMMENT_LEFT_TEMPLATE_ID: "New comment",
+    }
+
+
+def wants_digest(user: User, template_id: str) -> bool:
+    return (
+        settings.GOVUK_NOTIFY_DIGEST_TEMPLATE_ID is not None
+        and user.notification_mode == User.NotificationMode.DIGEST
+        and template_id in get_digest_templates()
+    )
+
+
+def notify_user(
+    user: User,
+    template_id: str,
+    personalisation: Optional[dict[str, Any]] = None,
+    *,
+    urgent: bool = False,
+) -> None:
+    """Send a notification to the user, or hold it for their digest.
+
+    Args:
+        user: The user to notify.
+        template_id: The Notify template to send.
+        personalisation: The template personalisation, `first_name` is added.
+        urgent: Send the notification straight away, even to users who receive a
+            digest.
+    """
+    personalisation = {**(personalisation or {}), "first_name": user.first_name}
+
+    if not urgent and wants_digest(user, template_id):
+        PendingNotification.objects.create(
+            user=user, template_id=template_id, personalisation=personalisation
+        )
+
+        return
+
+    send_notification.delay(
+        email_address=user.contact_email,
+        template_id=template_id,
+        personalisation=personalisation,
+    )
+
+
 def send_group_notification(
     approver_group: ApproverGroup,
     user_filter: Optional[Q] = None,
     *,
     template_id: str,
     personalisation: Optional[dict[str, Any]] = None,
+    urgent: bool = False,
 ) -> None:
     if personalisation is None:
         personalisation = {}
@@ -79,19 +254,111 @@ def send_group_notification(
     if user_filter:
         users = users.filter(user_filter)
 
-    tasks = [
-        send_notification.s(
-            email_address=user.contact_email,
-            template_id=template_id,
-            personalisation={
-                **personalisation,
-                "first_name": user.first_name,
-            },
+    recipients: list[Recipient] = []
+    pending_notifications: list[PendingNotification] = []
+
+    for user in users:
+        user_personalisation = {**personalisation, "first_name": user.first_name}
+
+        if not urgent and wants_digest(user, template_id):
+            pending_notifications.append(
+                PendingNotification(
+                    user=user,
+                    template_id=template_id,
+                    personalisation=user_personalisation,
+                )
+            )
+        else:
+            recipients.append(
+                {
+                    "email_address": user.contact_email,
+                    "personalisation": user_personalisation,
+                }
+            )
+
+    PendingNotification.objects.bulk_create(pending_notifications)
+
+    if recipients:
+        send_notifications.delay(template_id=template_id, recipients=recipients)
+
+
+@shared_task
+def send_notification_digests() -> int:
+    """Send each user with pending notifications a digest of them.
+
+    This runs periodically from the celery beat schedule.
+
+    Returns:
+        The number of users who were sent a digest.
+    """
+    with transaction.atomic():
+        pending_notifications = list(
+            PendingNotification.objects.select_for_update(
+                skip_locked=True, of=("self",)
+            )
+            .select_related("user")
+            .order_by("user", "created_at", "pk")
+        )
+
+        PendingNotification.objects.filter(
+            pk__in=[x.pk for x in pending_notifications]
+        ).delete()
+
+    digest_template_id = settings.GOVUK_NOTIFY_DIGEST_TEMPLATE_ID
+
+    # The digest template has been unset since the notifications were held, so send
+    # them as they are.
+    if digest_template_id is None:
+        pending_notifications.sort(key=lambda x: x.template_id)
+
+        for template_id, notifications in itertools.groupby(
+            pending_notifications, key=lambda x: x.template_id
+        ):
+            send_notifications.delay(
+                template_id=template_id,
+                recipients=[
+                    {
+                        "email_address": x.user.contact_email,
+                        "personalisation": x.personalisation,
+                    }
+                    for x in notifications
+                ],
+            )
+
+        return 0
+
+    digest_templates = get_digest_templates()
+    recipients: list[Recipient] = []
+
+    for _, notifications in itertools.groupby(
+        pending_notifications, key=lambda x: x.user_id
+    ):
+        notifications = list(notifications)
+        user = notifications[0].user
+
+        # The same notification can be held more than once, e.g. for re-approvals.
+        lines = dict.fromkeys(
+            "{}: {}".format(
+                digest_templates.get(x.template_id, "Update"),
+                x.personalisation.get("resourcing_request_url", ""),
+            )
+            for x in notifications
+        )
+
+        recipients.append(
+            {
+                "email_address": user.contact_email,
+                "personalisation": {
+                    "first_name": user.first_name,
+                    "notifications": list(lines),
+                },
+            }
         )
-        for user in users
-    ]
 
-    group(tasks).apply_async()
+    if recipients:
+        send_notifications.delay(template_id=digest_template_id, recipients=recipients)
+
+    return len(recipients)
 
 
 @shared_task
@@ -145,36 +412,37 @@ def notify_approvers(
 
         return
 
-    approval_index = next(
-        i for i, approvals in enumerate(Approval.ORDER) if approval.type in approvals
-    )
-
-    # Do nothing if the request does not have the correct approvals.
-    for approvals in Approval.ORDER[: approval_index + 1]:
-        for approval_type in approvals:
-            if resourcing_request.get_approval(approval_type) is None:
-                return
-
     # Notify the correct approvers that the request is ready for their approval.
-    try:
-        next_approval_types = Approval.ORDER[approval_index + 1]
-    except IndexError:
-        next_approval_types = []
+    next_approval_types = approval_router.get_notification_targets(
+        resourcing_request.get_approval_state(), approval.type
+    )
 
     for next_approval_type in next_approval_types:
-        if resourcing_request.get_approval(next_approval_type) is not None:
-            continue
+        urgent = next_approval_type in URGENT_APPROVAL_TYPES
 
         if next_approval_type == Approval.Type.CHIEF:
-            send_notification.delay(
-                email_address=resourcing_request.chief.contact_email,
-                template_id=settings.GOVUK_NOTIFY_READY_FOR_APPROVAL_TEMPLATE_ID,
-                personalisation={
-                    **personalisation,
-                    "first_name": resourcing_request.chief.first_name,
-                },
+            notify_user(
+                resourcing_request.chief,
+                settings.GOVUK_NOTIFY_READY_FOR_APPROVAL_TEMPLATE_ID,
+                personalisation,
+                urgent=urgent,
             )
         else:
             send_ready_for_approval_group_notification(
-                APPROVAL_TYPE_TO_GROUP[next_approval_type]
+                APPROVAL_TYPE_TO_GROUP[next_approval_type], urgent=urgent
             )
+
+
+@shared_task
+def store_cest_document_blob(cest_document_pk: int, name: str) -> None:
+    """Move a CEST document which was uploaded straight to the bucket into a blob."""
+    with transaction.atomic():
+        blob_name = content_addressed_storage.adopt(name)
+
+        # The document may have been replaced since, in which case the upload is
+        # simply deleted and the blob is left for `delete_orphaned_blobs`.
+        CestDocument.objects.filter(pk=cest_document_pk, file=name).update(
+            file=blob_name, blob=Blob.objects.get(name=blob_name)
+        )
+
+    content_addressed_storage.storage.delete(name)
@@ -1,9 +1,12 @@
 import datetime
 
+import boto3
 import pytest
+from django.core.cache import cache
 from django.core.management import call_command
 from django.test import Client
 from django.urls import reverse
+from moto import mock_s3
 
 from main import tasks
 from main.models import ResourcingRequest
@@ -11,6 +14,9 @@ from main.services.resourcing_request import create_full_test_resourcing_request
 from user.models import User
 
 
+BUCKET = "test-bucket"
+
+
 @pytest.fixture(scope="session")
 def django_db_setup(django_db_setup, django_db_blocker):
     with django_db_blocker.unblock():
@@ -82,6 +88,26 @@ def full_resourcing_request(db):
     )
 
 
+@pytest.fixture
+def s3(settings):
+    # An in-process S3, with the default storage pointed at it.
+    settings.DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
+    settings.AWS_STORAGE_BUCKET_NAME = BUCKET
+    settings.AWS_S3_REGION_NAME = "eu-west-2"
+    settings.AWS_ACCESS_KEY_ID = "testing"
+    settings.AWS_SECRET_ACCESS_KEY = "testing"
+    settings.CEST_DOCUMENT_MAX_UPLOAD_SIZE = 1024
+
+    with mock_s3():
+        client = boto3.client("s3", region_name="eu-west-2")
+        client.create_bucket(
+            Bucket=BUCKET,
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+
+        yield client
+
+
 def login(client, username):
     user = User.objects.get(username=username)
     client.force_login(user)
@@ -92,3 +118,15 @@ def login(client, username):
 @pytest.fixture(autouse=True)
 def _empty_test_notification_box():
     tasks.TEST_NOTIFICATION_BOX = []
+
+
+@pytest.fixture(autouse=True)
+def _media_root(settings, tmp_path):
+    # Keep the files the tests upload out of the repo.
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    # The database is rolled back between tests but the cache isn't.
+    cache.clear()
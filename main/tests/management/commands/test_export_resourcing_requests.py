@@ -0,0 +1,29 @@
+import csv
+import io
+
+from django.core.management import call_command
+
+
+def test_command(full_resourcing_request, tmp_path):
+    path = tmp_path / "export.csv"
+
+    call_command("export_resourcing_requests", "--output", path, stderr=io.StringIO())
+
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    assert [row["id"] for row in rows] == [str(full_resourcing_request.pk)]
+
+    stdout = io.StringIO()
+
+    call_command(
+        "export_resourcing_requests",
+        "--format",
+        "jsonl",
+        "--state",
+        "approved",
+        stdout=stdout,
+        stderr=io.StringIO(),
+    )
+
+    assert stdout.getvalue() == ""
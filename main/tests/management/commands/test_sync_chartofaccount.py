@@ -0,0 +1,98 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+from chartofaccount.index import get_index
+from chartofaccount.models import CostCentre, Directorate
+
+
+def _write(tmp_path, name, lines):
+    path = tmp_path / name
+    path.write_text("\n".join(lines) + "\n")
+
+    return path
+
+
+def test_sync_csv(db, tmp_path):
+    version = get_index().version
+    path = _write(
+        tmp_path,
+        "directorates.csv",
+        [
+            "directorate_code,directorate_name,group",
+            "11111A,Social Media,1111AA",
+            "11111C,Podcasts,1111AA",
+            "22222A,Europe,2222BB",
+            "22222D,Africa,2222BB",
+        ],
+    )
+
+    call_command("sync_chartofaccount", "directorate", path)
+
+    assert Directorate.objects.get(pk="11111C").directorate_name == "Podcasts"
+    assert Directorate.objects.get(pk="22222D").group_id == "2222BB"
+    # Retired codes are kept unless asked to delete them.
+    assert Directorate.objects.filter(pk="22222B").exists()
+    # The index is rebuilt even though no signals were sent, and the shared version
+    # has moved on for the other processes.
+    assert ("22222D", "Africa") in get_index().directorates["2222BB"]
+    assert get_index().version != version
+
+
+def test_sync_report(db, tmp_path, capsys):
+    path = _write(
+        tmp_path,
+        "cost-centres.jsonl",
+        [
+            '{"cost_centre_code": "111111", "cost_centre_name": "Radio 4"}',
+            '{"cost_centre_code": "111112", "cost_centre_name": "Radio 3"}',
+            "",
+            '{"cost_centre_code": "999999", "cost_centre_name": "Television"}',
+        ],
+    )
+
+    call_command("sync_chartofaccount", "costcentre", path, verbosity=2)
+
+    out = capsys.readouterr().out
+    assert "Inserted 999999" in out
+    assert "Updated 111112" in out
+    assert "Retired 222221" in out
+    assert "(1 inserted, 1 updated, 1 unchanged, 5 retired, 0 deleted)" in out
+
+
+def test_sync_delete_retired(db, tmp_path, full_resourcing_request):
+    path = _write(
+        tmp_path,
+        "cost-centres.csv",
+        ["cost_centre_code,cost_centre_name", "111111,Radio 4"],
+    )
+
+    call_command("sync_chartofaccount", "costcentre", path, delete_retired=True)
+
+    # The cost centre of the resourcing request is still in use.
+    assert set(CostCentre.objects.values_list("pk", flat=True)) == {
+        "111111",
+        "111113",
+    }
+
+
+def test_sync_invalid_rows_roll_back(db, tmp_path):
+    path = _write(
+        tmp_path,
+        "directorates.csv",
+        [
+            "directorate_code,directorate_name,group",
+            "11111C,Podcasts,1111AA",
+            "33333A,Arctic,3333CC",
+            "1234567,Too long,1111AA",
+            "11111C,Podcasts,1111AA",
+        ],
+    )
+
+    with pytest.raises(CommandError) as excinfo:
+        call_command("sync_chartofaccount", "directorate", path, batch_size=2)
+
+    message = str(excinfo.value)
+    assert "Line 3: Unknown group 3333CC" in message
+    assert "Line 4: directorate_code: Ensure this value" in message
+    assert "Line 5: Duplicate directorate_code 11111C" in message
+    assert Directorate.objects.get(pk="11111C").directorate_name == "Radio"
@@ -0,0 +1,66 @@
+from django.urls import reverse
+
+from main.models import Approval, ApprovalInboxItem
+from main.services.approval_inbox import ApprovalInboxService
+from main.services.review import ReviewAction, ReviewService
+from main.tests.conftest import login
+from user.models import User
+
+
+class TestApprovalInboxService:
+    # Helpers
+    def _send_for_approval(self, client, resourcing_request):
+        client.post(
+            reverse(
+                "resourcing-request-send-for-approval",
+                kwargs={"resourcing_request_pk": resourcing_request.pk},
+            )
+        )
+
+    def _inbox_types(self, resourcing_request):
+        return set(
+            ApprovalInboxItem.objects.filter(
+                resourcing_request=resourcing_request
+            ).values_list("approval_type", flat=True)
+        )
+
+    # Tests
+    def test_draft_has_empty_inbox(self, full_resourcing_request):
+        ApprovalInboxService.sync(full_resourcing_request)
+
+        assert self._inbox_types(full_resourcing_request) == set()
+
+    def test_send_for_approval_fills_inbox(
+        self, client, hiring_manager, full_resourcing_request
+    ):
+        self._send_for_approval(client, full_resourcing_request)
+
+        assert self._inbox_types(full_resourcing_request) == set(Approval.Type)
+
+    def test_approval_removes_item(self, client, full_resourcing_request):
+        login(client, "hiring-manager")
+        self._send_for_approval(client, full_resourcing_request)
+        full_resourcing_request.refresh_from_db()
+
+        ReviewService.add_review(
+            user=User.objects.get(username="head-of-profession"),
+            resourcing_request=full_resourcing_request,
+            resourcing_request_url="http://www.example.com",
+            action=ReviewAction.APPROVE,
+            approval_type=Approval.Type.HEAD_OF_PROFESSION,
+            text=None,
+        )
+
+        assert Approval.Type.HEAD_OF_PROFESSION not in self._inbox_types(
+            full_resourcing_request
+        )
+
+    def test_rebuild_repairs_drift(
+        self, client, hiring_manager, full_resourcing_request
+    ):
+        self._send_for_approval(client, full_resourcing_request)
+        ApprovalInboxItem.objects.all().delete()
+
+        ApprovalInboxService.rebuild()
+
+        assert self._inbox_types(full_resourcing_request) == set(Approval.Type)
@@ -2,7 +2,7 @@ import pytest
 
 import event_log.models as event_log_models
 from event_log.models import Event
-from main.services.event_log import EventLogService, EventType
+from main.services.event_log import EventLogService, EventType, event_type_registry
 
 
 def test_event_type_enum_in_sync_with_migrations(db):
@@ -31,3 +31,45 @@ def test_add_event_invalid_message_context(db, resourcing_request, admin_user):
             admin_user,
             EventType.GROUP_APPROVED,
         )
+
+
+def test_batch_writes_events_in_one_query(
+    db, resourcing_request, admin_user, django_assert_num_queries
+):
+    prev_count = Event.objects.count()
+    # Warm up the event type registry.
+    event_type_registry.get_pk(EventType.COMMENTED)
+
+    # The savepoint, the insert, the version bump and the release.
+    with django_assert_num_queries(4):
+        with EventLogService.batch():
+            for _ in range(3):
+                EventLogService.add_event(
+                    resourcing_request, admin_user, EventType.COMMENTED
+                )
+
+    assert Event.objects.count() == prev_count + 3
+
+
+def test_batch_discards_events_on_error(db, resourcing_request, admin_user):
+    prev_count = Event.objects.count()
+
+    with pytest.raises(RuntimeError):
+        with EventLogService.batch():
+            EventLogService.add_event(
+                resourcing_request, admin_user, EventType.COMMENTED
+            )
+
+            raise RuntimeError
+
+    assert Event.objects.count() == prev_count
+
+
+def test_event_type_registry_is_cleared(db):
+    event_type = event_log_models.EventType.objects.get(code=EventType.COMMENTED.name)
+    event_type_registry.get_pk(EventType.COMMENTED)
+
+    event_type.delete()
+
+    with pytest.raises(event_log_models.EventType.DoesNotExist):
+        event_type_registry.get_pk(EventType.COMMENTED)
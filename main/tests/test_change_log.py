@@ -1,3 +1,10 @@
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+
+from change_log.models import ChangeProjection
+from chartofaccount.models import CostCentre
+from main.models import FinancialInformation
 from main.services.resourcing_request import create_full_test_resourcing_request
 
 
@@ -42,3 +49,145 @@ def test_change_log(db, django_capture_on_commit_callbacks):
     changes = rr.interim_request.change_log.get_changes()
 
     assert changes == {"equivalent_civil_servant_grade": "G7"}
+
+    for instance in (rr, rr.financial_information, rr.interim_request):
+        previous_values = ChangeProjection.objects.get_previous_values(instance)
+
+        assert previous_values == instance.change_log.get_changes()
+
+
+def test_change_log_related_object(db, django_capture_on_commit_callbacks):
+    rr = create_full_test_resourcing_request(
+        job_title="Python Developer",
+        project_name="JML",
+        inside_ir35=True,
+    )
+    financial_information = FinancialInformation.objects.get(resourcing_request=rr)
+    previous_cost_centre = str(financial_information.cost_centre_code)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        financial_information.cost_centre_code = CostCentre.objects.exclude(
+            pk=financial_information.cost_centre_code_id
+        ).first()
+        financial_information.save()
+
+    changes = financial_information.change_log.get_changes()
+
+    assert changes == {"cost_centre_code": previous_cost_centre}
+
+
+def test_change_log_rolled_back(db, django_capture_on_commit_callbacks):
+    rr = create_full_test_resourcing_request(
+        job_title="Python Developer",
+        project_name="JML",
+        inside_ir35=True,
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(ValueError):
+            with transaction.atomic():
+                rr.job_title = "QA"
+                rr.save()
+
+                raise ValueError
+
+        rr.refresh_from_db()
+        rr.project_name = "Testing"
+        rr.save()
+
+    assert rr.change_log.get_changes() == {"project_name": "JML"}
+
+
+def test_change_log_nested_rolled_back(db, django_capture_on_commit_callbacks):
+    rr = create_full_test_resourcing_request(
+        job_title="Python Developer",
+        project_name="JML",
+        inside_ir35=True,
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            rr.project_name = "Testing"
+            rr.save()
+
+            with pytest.raises(ValueError):
+                with transaction.atomic():
+                    rr.job_title = "QA"
+                    rr.save()
+
+                    raise ValueError
+
+            rr.refresh_from_db()
+
+            with transaction.atomic():
+                rr.is_ir35 = False
+                rr.save()
+
+    # The change made in the rolled back savepoint was never saved.
+    assert rr.change_log.get_changes() == {"project_name": "JML", "is_ir35": "Yes"}
+
+
+def test_change_log_num_queries(
+    db, django_capture_on_commit_callbacks, django_assert_num_queries
+):
+    rr = create_full_test_resourcing_request(
+        job_title="Python Developer",
+        project_name="JML",
+        inside_ir35=True,
+    )
+    financial_information = FinancialInformation.objects.get(resourcing_request=rr)
+    cost_centre = CostCentre.objects.exclude(
+        pk=financial_information.cost_centre_code_id
+    ).first()
+
+    # The update, the completeness refresh and the version bump. Then on commit, the
+    # label lookup and a savepoint to write the change, to create, lock and update its
+    # projection, and to bump the version again.
+    with django_assert_num_queries(11):
+        with django_capture_on_commit_callbacks(execute=True):
+            financial_information.cost_centre_code = cost_centre
+            financial_information.min_day_rate = 600
+            financial_information.save()
+
+
+def test_change_projection_created_by_another_transaction(
+    db, django_capture_on_commit_callbacks
+):
+    rr = create_full_test_resourcing_request(
+        job_title="Python Developer",
+        project_name="JML",
+        inside_ir35=True,
+    )
+    # As if another transaction created the projection after this one started.
+    ChangeProjection.objects.create(
+        content_object=rr, previous_values={"project_name": "JML"}
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        rr.job_title = "QA"
+        rr.save()
+
+    assert ChangeProjection.objects.get_previous_values(rr) == {
+        "project_name": "JML",
+        "job_title": "Python Developer",
+    }
+
+
+def test_rebuild_change_projections(db, django_capture_on_commit_callbacks):
+    rr = create_full_test_resourcing_request(
+        job_title="Python Developer",
+        project_name="JML",
+        inside_ir35=True,
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        rr.job_title = "QA"
+        rr.save()
+
+    ChangeProjection.objects.all().delete()
+
+    call_command("rebuild_change_projections")
+
+    assert ChangeProjection.objects.get_previous_values(rr) == {
+        "job_title": "Python Developer"
+    }
@@ -0,0 +1,61 @@
+from main.models import Completeness, ResourcingRequest
+
+
+def _get_computed_completeness(resourcing_request):
+    return (
+        ResourcingRequest.objects.annotate_completeness()
+        .values_list("computed_completeness", flat=True)
+        .get(pk=resourcing_request.pk)
+    )
+
+
+def test_new_resourcing_request_is_incomplete(resourcing_request):
+    assert resourcing_request.completeness == 0
+    assert _get_computed_completeness(resourcing_request) == 0
+    assert not resourcing_request.is_complete
+
+
+def test_full_resourcing_request_is_complete(full_resourcing_request):
+    assert full_resourcing_request.is_complete
+    assert full_resourcing_request.completeness == _get_computed_completeness(
+        full_resourcing_request
+    )
+
+
+def test_module_without_deliverables_is_incomplete(full_resourcing_request):
+    full_resourcing_request.is_ir35 = False
+    full_resourcing_request.save()
+    assert full_resourcing_request.is_complete
+
+    module = full_resourcing_request.statement_of_work.modules.first()
+    module.deliverables.all().delete()
+    full_resourcing_request.refresh_from_db()
+
+    assert not full_resourcing_request.is_complete
+    assert not full_resourcing_request.completeness & Completeness.STATEMENT_OF_WORK
+
+    module.delete()
+    full_resourcing_request.refresh_from_db()
+
+    assert full_resourcing_request.is_complete
+
+
+def test_deleting_supporting_document(full_resourcing_request):
+    full_resourcing_request.cest_document.delete()
+    full_resourcing_request.refresh_from_db()
+
+    assert not full_resourcing_request.is_complete
+    assert full_resourcing_request.completeness == _get_computed_completeness(
+        full_resourcing_request
+    )
+
+
+def test_save_does_not_overwrite_completeness(full_resourcing_request):
+    stale = ResourcingRequest.objects.get(pk=full_resourcing_request.pk)
+    full_resourcing_request.sds_status_determination.delete()
+
+    stale.job_title = "QA"
+    stale.save()
+    stale.refresh_from_db()
+
+    assert not stale.is_complete
@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+from main.models import Approval, approval_router
+from main.services.review import ReviewAction, ReviewService
+from main.tests.conftest import login
+from user.models import User
+
+
+def _state(**approved):
+    return approval_router.get_state(
+        {
+            Approval.Type(approval_type): SimpleNamespace(approved=value)
+            for approval_type, value in approved.items()
+        }
+    )
+
+
+def test_route_without_approvals():
+    route = approval_router.route(_state())
+
+    assert route.stage == 0
+    assert route.pending_types == (Approval.Type.HEAD_OF_PROFESSION,)
+    assert not route.is_approved
+
+
+def test_route_parallel_stage():
+    route = approval_router.route(
+        _state(head_of_profession=True, chief=True, busops=True, finance=True)
+    )
+
+    assert route.stage == 3
+    assert route.pending_types == (Approval.Type.HRBP, Approval.Type.COMMERCIAL)
+
+
+def test_route_cleared_approval_is_pending():
+    route = approval_router.route(_state(head_of_profession=None, chief=True))
+
+    assert route.stage == 0
+
+
+def test_route_all_approved():
+    route = approval_router.route(_state(**{x.value: True for x in Approval.Type}))
+
+    assert route.stage == approval_router.approved_stage
+    assert route.is_approved
+
+
+def test_notification_targets():
+    state = _state(head_of_profession=True, chief=True, busops=True, hrbp=None)
+
+    assert approval_router.get_notification_targets(state, Approval.Type.BUSOPS) == (
+        Approval.Type.FINANCE,
+        Approval.Type.COMMERCIAL,
+    )
+    # The finance stage is not complete.
+    assert approval_router.get_notification_targets(state, Approval.Type.HRBP) == ()
+
+
+def test_review_updates_current_stage(client, full_resourcing_request):
+    login(client, "hiring-manager")
+    full_resourcing_request.state = full_resourcing_request.State.AWAITING_APPROVALS
+    full_resourcing_request.save()
+
+    ReviewService.add_review(
+        user=User.objects.get(username="head-of-profession"),
+        resourcing_request=full_resourcing_request,
+        resourcing_request_url="http://www.example.com",
+        action=ReviewAction.APPROVE,
+        approval_type=Approval.Type.HEAD_OF_PROFESSION,
+        text=None,
+    )
+
+    full_resourcing_request.refresh_from_db()
+
+    assert full_resourcing_request.current_stage == 1
+    assert full_resourcing_request.get_current_stage_display() == "Chief"
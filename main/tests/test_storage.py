@@ -0,0 +1,148 @@
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from main.models import Blob, CestDocument
+from main.services.resourcing_request import create_full_test_resourcing_request
+from main.storage import content_addressed_storage
+from main.tasks import store_cest_document_blob
+from main.tests.conftest import BUCKET
+
+
+def _create_resourcing_request():
+    return create_full_test_resourcing_request(
+        job_title="Python Developer", project_name="Unit Test", inside_ir35=True
+    )
+
+
+def _create_cest_document(name, content):
+    cest_document = _create_resourcing_request().cest_document
+    cest_document.file = SimpleUploadedFile(name, content)
+    cest_document.save()
+
+    return cest_document
+
+
+def test_duplicate_uploads_share_a_blob(db):
+    cest_document_1 = _create_cest_document("cest.pdf", b"%PDF-1.4 one")
+    cest_document_2 = _create_cest_document("amended-cest.pdf", b"%PDF-1.4 one")
+    cest_document_3 = _create_cest_document("cest.pdf", b"%PDF-1.4 two")
+
+    assert cest_document_1.file.name == cest_document_2.file.name
+    assert cest_document_1.file.name != cest_document_3.file.name
+    assert cest_document_1.file.name.startswith("blobs/sha256/")
+    assert str(cest_document_2) == "amended-cest.pdf"
+
+    blob = Blob.objects.with_ref_count().get(pk=cest_document_1.blob_id)
+    assert blob.ref_count == 2
+    assert blob.size == len(b"%PDF-1.4 one")
+    assert cest_document_2.file.read() == b"%PDF-1.4 one"
+
+
+def test_delete_orphaned_blobs(db):
+    cest_document_1 = _create_cest_document("cest.pdf", b"%PDF-1.4 one")
+    cest_document_2 = _create_cest_document("cest.pdf", b"%PDF-1.4 two")
+    name = cest_document_1.file.name
+
+    cest_document_1.resourcing_request.delete()
+    call_command("delete_orphaned_blobs", min_age=0)
+
+    assert not Blob.objects.filter(name=name).exists()
+    assert not default_storage.exists(name)
+    assert default_storage.exists(cest_document_2.file.name)
+
+
+def test_duplicate_upload_locks_the_blob(db):
+    _create_cest_document("cest.pdf", b"%PDF-1.4 one")
+
+    with CaptureQueriesContext(connection) as ctx:
+        _create_cest_document("amended-cest.pdf", b"%PDF-1.4 one")
+
+    # Otherwise `delete_orphaned_blobs` could delete it before the document refers
+    # to it.
+    assert any(
+        '"main_blob"' in query["sql"] and query["sql"].endswith("FOR UPDATE")
+        for query in ctx.captured_queries
+    )
+
+
+def test_delete_orphaned_blobs_fails(db, monkeypatch):
+    cest_document = _create_cest_document("cest.pdf", b"%PDF-1.4 one")
+    name = cest_document.file.name
+    cest_document.resourcing_request.delete()
+
+    def delete_many(names):
+        raise OSError
+
+    monkeypatch.setattr(content_addressed_storage, "delete_many", delete_many)
+
+    with pytest.raises(OSError):
+        call_command("delete_orphaned_blobs", min_age=0)
+
+    # The row is kept while the file might still be there.
+    assert Blob.objects.filter(name=name).exists()
+
+
+def test_upload_after_blob_deleted(db):
+    cest_document = _create_cest_document("cest.pdf", b"%PDF-1.4 one")
+    name = cest_document.file.name
+    cest_document.resourcing_request.delete()
+    call_command("delete_orphaned_blobs", min_age=0)
+
+    cest_document = _create_cest_document("cest.pdf", b"%PDF-1.4 one")
+
+    assert cest_document.file.name == name
+    assert cest_document.blob.name == name
+    assert default_storage.exists(name)
+
+
+def test_store_direct_upload_as_blob(db, s3):
+    names = []
+
+    for i in range(2):
+        name = f"resourcing_request/{i}/upload/cest.pdf"
+        s3.put_object(Bucket=BUCKET, Key=name, Body=b"%PDF-1.4")
+        cest_document = _create_resourcing_request().cest_document
+        cest_document.file.name = name
+        cest_document.save()
+        assert cest_document.blob is None
+
+        store_cest_document_blob(cest_document.pk, name)
+
+        cest_document.refresh_from_db()
+        names.append(cest_document.file.name)
+        assert cest_document.blob.name == cest_document.file.name
+
+    assert names[0] == names[1]
+    keys = [x["Key"] for x in s3.list_objects_v2(Bucket=BUCKET)["Contents"]]
+    assert names[0] in keys
+    # The uploads were deleted once they were stored as blobs.
+    assert not [key for key in keys if key.startswith("resourcing_request/")]
+
+    CestDocument.objects.all().delete()
+    call_command("delete_orphaned_blobs", min_age=0)
+
+    assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 0
+
+
+def test_store_existing_cest_documents_as_blobs(db):
+    names = []
+
+    for i in range(2):
+        name = default_storage.save(
+            f"resourcing_request/{i}/cest.pdf", ContentFile(b"%PDF-1.4")
+        )
+        cest_document = _create_resourcing_request().cest_document
+        CestDocument.objects.filter(pk=cest_document.pk).update(file=name, blob=None)
+        names.append(name)
+
+    call_command("store_cest_document_blobs")
+
+    blob = Blob.objects.with_ref_count().get(size=len(b"%PDF-1.4"))
+    assert blob.ref_count == 2
+    assert not CestDocument.objects.filter(blob__isnull=True).exists()
+    assert not any(default_storage.exists(name) for name in names)
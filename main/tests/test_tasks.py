@@ -0,0 +1,157 @@
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from notifications_python_client.errors import HTTPError
+
+from main import tasks
+from main.constants import ApproverGroup
+from main.models import PendingNotification
+from user.models import User
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def json(self):
+        return {"message": "error"}
+
+
+class FakeNotificationsClient:
+    def __init__(self, errors):
+        # Email address -> the status codes to fail with, one per attempt.
+        self.errors = errors
+        self.sent = []
+
+    def send_email_notification(self, email_address, template_id, personalisation):
+        if self.errors.get(email_address):
+            status_code = self.errors[email_address].pop(0)
+            raise HTTPError(FakeResponse(status_code))
+
+        self.sent.append(email_address)
+
+
+@pytest.fixture
+def notifications_client(settings):
+    settings.APP_ENV = "production"
+
+    client = FakeNotificationsClient({})
+
+    with mock.patch.object(tasks, "get_notifications_client", return_value=client):
+        yield client
+
+
+def _recipient(email_address):
+    return {"email_address": email_address, "personalisation": {}}
+
+
+def test_send_group_notification_is_one_task(db):
+    with mock.patch.object(
+        tasks.send_notifications, "delay", wraps=tasks.send_notifications.delay
+    ) as delay:
+        tasks.send_group_notification(ApproverGroup.BUSOPS, template_id="TEMPLATE")
+
+    assert delay.call_count == 1
+    assert len(tasks.TEST_NOTIFICATION_BOX) == len(delay.call_args[1]["recipients"])
+    assert len(tasks.TEST_NOTIFICATION_BOX) > 0
+
+
+def test_send_notifications_retries_only_failures(notifications_client):
+    notifications_client.errors = {"b@example.com": [500]}
+
+    result = tasks.send_notifications.apply(
+        kwargs={
+            "template_id": "TEMPLATE",
+            "recipients": [_recipient("a@example.com"), _recipient("b@example.com")],
+        }
+    )
+
+    assert result.successful()
+    assert notifications_client.sent.count("a@example.com") == 1
+    assert notifications_client.sent.count("b@example.com") == 1
+
+
+def test_send_notifications_does_not_retry_client_errors(notifications_client):
+    notifications_client.errors = {"b@example.com": [400]}
+
+    result = tasks.send_notifications.apply(
+        kwargs={
+            "template_id": "TEMPLATE",
+            "recipients": [_recipient("a@example.com"), _recipient("b@example.com")],
+        }
+    )
+
+    assert result.get() == {"sent": ["a@example.com"], "failed": ["b@example.com"]}
+
+
+@pytest.fixture
+def digest_user(settings, db):
+    settings.GOVUK_NOTIFY_DIGEST_TEMPLATE_ID = "DIGEST"
+
+    user = User.objects.get(username="busops")
+    user.notification_mode = User.NotificationMode.DIGEST
+    user.save()
+
+    return user
+
+
+def test_digest_user_notifications_are_held(settings, digest_user):
+    url = "http://www.example.com/1"
+
+    for _ in range(2):
+        tasks.send_group_notification(
+            ApproverGroup.BUSOPS,
+            template_id=settings.GOVUK_NOTIFY_AMENDED_TEMPLATE_ID,
+            personalisation={"resourcing_request_url": url},
+        )
+
+    emails = [x["email_address"] for x in tasks.TEST_NOTIFICATION_BOX]
+
+    assert digest_user.contact_email not in emails
+    assert PendingNotification.objects.filter(user=digest_user).count() == 2
+
+    assert tasks.send_notification_digests() == 1
+
+    [digest] = [x for x in tasks.TEST_NOTIFICATION_BOX if x["template_id"] == "DIGEST"]
+
+    assert digest["email_address"] == digest_user.contact_email
+    assert digest["personalisation"]["notifications"] == [
+        f"Amended and ready for review: {url}"
+    ]
+    assert not PendingNotification.objects.exists()
+
+
+def test_digests_only_lock_the_notifications(settings, digest_user):
+    tasks.notify_user(digest_user, settings.GOVUK_NOTIFY_COMMENT_LEFT_TEMPLATE_ID)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert tasks.send_notification_digests() == 1
+
+    # A locked user, e.g. one who is logging in, mustn't hold up their digest.
+    [sql] = [x["sql"] for x in queries.captured_queries if "FOR UPDATE" in x["sql"]]
+
+    assert 'FOR UPDATE OF "main_pendingnotification" SKIP LOCKED' in sql
+
+
+def test_urgent_notifications_are_not_held(settings, digest_user):
+    tasks.notify_user(
+        digest_user,
+        settings.GOVUK_NOTIFY_READY_FOR_APPROVAL_TEMPLATE_ID,
+        urgent=True,
+    )
+
+    assert not PendingNotification.objects.exists()
+    assert tasks.TEST_NOTIFICATION_BOX[0]["email_address"] == (
+        digest_user.contact_email
+    )
+
+
+def test_digest_needs_a_template(settings, digest_user):
+    settings.GOVUK_NOTIFY_DIGEST_TEMPLATE_ID = None
+
+    tasks.notify_user(digest_user, settings.GOVUK_NOTIFY_COMMENT_LEFT_TEMPLATE_ID)
+
+    assert not PendingNotification.objects.exists()
+    assert len(tasks.TEST_NOTIFICATION_BOX) == 1
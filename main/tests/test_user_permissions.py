@@ -0,0 +1,80 @@
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+
+from main.models import Approval
+from user.models import User
+from user.permissions import _get_cache_key, build_permission_snapshot
+
+
+def _get_user(username):
+    # A fresh instance so nothing is cached on it.
+    return User.objects.get(username=username)
+
+
+def test_approver_properties(db):
+    user = _get_user("head-of-profession")
+
+    assert user.is_approver
+    assert user.is_in_approver_group
+    assert user.is_head_of_profession
+    assert user.has_approval_perm(Approval.Type.HEAD_OF_PROFESSION)
+    assert not user.has_approval_perm(Approval.Type.BUSOPS)
+
+    user = _get_user("hiring-manager")
+
+    assert not user.is_approver
+    assert not user.is_in_approver_group
+
+
+def test_no_queries_after_warm_up(db, django_assert_num_queries):
+    _get_user("busops").is_approver
+
+    user = _get_user("busops")
+
+    with django_assert_num_queries(0):
+        assert user.is_approver
+        assert user.is_busops
+        assert user.is_in_approver_group
+        assert user.has_perm("main.view_all_resourcingrequests")
+
+
+def test_user_groups_changed(db):
+    _get_user("hiring-manager").groups.add(Group.objects.get(name="Finance"))
+
+    assert _get_user("hiring-manager").has_approval_perm(Approval.Type.FINANCE)
+
+    Group.objects.get(name="Finance").user_set.remove(_get_user("hiring-manager"))
+
+    assert not _get_user("hiring-manager").has_approval_perm(Approval.Type.FINANCE)
+
+
+def test_group_permissions_changed(db):
+    assert _get_user("finance").has_approval_perm(Approval.Type.FINANCE)
+
+    Group.objects.get(name="Finance").permissions.remove(
+        Permission.objects.get(codename="can_give_finance_approval")
+    )
+
+    assert not _get_user("finance").has_approval_perm(Approval.Type.FINANCE)
+
+
+def test_user_saved(db):
+    assert _get_user("finance").is_approver
+
+    user = _get_user("finance")
+    user.is_active = False
+    user.save()
+
+    assert not _get_user("finance").is_approver
+
+
+def test_invalidated_again_on_commit(db, django_capture_on_commit_callbacks):
+    user = _get_user("hiring-manager")
+    stale_snapshot = build_permission_snapshot(user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.groups.add(Group.objects.get(name="Finance"))
+        # Another process caches the snapshot before the change is committed.
+        cache.set(_get_cache_key(user.pk), stale_snapshot)
+
+    assert _get_user("hiring-manager").has_approval_perm(Approval.Type.FINANCE)
@@ -4,10 +4,13 @@ from django.core.exceptions import ValidationError
 from django.urls import reverse
 
 from main import tasks
-from main.models import Approval, ResourcingRequest
-from main.services.review import ReviewAction
+from main.models import Approval, Comment, ResourcingRequest
+from main.pagination import KeysetPaginator
+from main.services.review import ReviewAction, ReviewService
 from main.tests.conftest import login
 from main.tests.constants import USERNAME_APPROVAL_ORDER
+from main.views.resourcing_request.resourcing_request import ResourcingRequestListView
+from user.models import User
 
 
 class TestResourcingRequestCreateView:
@@ -25,6 +28,94 @@ class TestResourcingRequestListView:
         r = client.get(reverse("resourcing-request-list"))
         assert r.status_code == 403
 
+    def test_filter_by_state(self, client, busops, resourcing_request):
+        r = client.get(
+            reverse("resourcing-request-list"),
+            {"state": ResourcingRequest.State.AWAITING_APPROVALS.value},
+        )
+        assert list(r.context["object_list"]) == []
+
+        r = client.get(
+            reverse("resourcing-request-list"),
+            {"state": ResourcingRequest.State.DRAFT.value},
+        )
+        assert list(r.context["object_list"]) == [resourcing_request]
+
+    def test_pagination(self, client, busops, resourcing_request, monkeypatch):
+        monkeypatch.setattr(ResourcingRequestListView, "per_page", 2)
+
+        for _ in range(2):
+            resourcing_request.pk = None
+            resourcing_request._state.adding = True
+            resourcing_request.save()
+
+        pks = list(
+            ResourcingRequest.objects.order_by("-pk").values_list("pk", flat=True)
+        )
+
+        r = client.get(reverse("resourcing-request-list"))
+        assert [x.pk for x in r.context["object_list"]] == pks[:2]
+        assert r.context["page"].has_next
+
+        r = client.get(
+            reverse("resourcing-request-list"),
+            {"cursor": r.context["page"].next_cursor},
+        )
+        assert [x.pk for x in r.context["object_list"]] == pks[2:]
+        assert not r.context["page"].has_next
+
+    def test_invalid_cursor(self, client, busops):
+        r = client.get(reverse("resourcing-request-list"), {"cursor": "invalid"})
+        assert r.status_code == 400
+
+    def test_cursor_value_of_the_wrong_type(self, client, busops):
+        paginator = KeysetPaginator(
+            ResourcingRequest.objects.all(), ordering=["start_date", "pk"], per_page=1
+        )
+
+        r = client.get(
+            reverse("resourcing-request-list"),
+            {"sort": "start_date", "cursor": paginator.encode([1, 1])},
+        )
+        assert r.status_code == 400
+
+    def test_invalid_filter(self, client, busops, resourcing_request):
+        r = client.get(
+            reverse("resourcing-request-list"),
+            {
+                "state": ResourcingRequest.State.AWAITING_APPROVALS.value,
+                "start_date": "not a date",
+            },
+        )
+
+        assert r.status_code == 200
+        assert "start_date" in r.context["filter_form"].errors
+        # The valid filters still apply.
+        assert list(r.context["object_list"]) == []
+        assert "govuk-form-group--error" in r.content.decode("utf-8")
+
+    def test_num_queries(
+        self, client, busops, resourcing_request, django_assert_num_queries
+    ):
+        for _ in range(5):
+            resourcing_request.pk = None
+            resourcing_request._state.adding = True
+            resourcing_request.save()
+
+        ResourcingRequest.objects.update(
+            state=ResourcingRequest.State.AWAITING_APPROVALS
+        )
+
+        # Cache the user's permissions.
+        client.get(reverse("resourcing-request-list"))
+
+        # The session, the user, the filter choices and the page, however many rows
+        # are shown.
+        with django_assert_num_queries(7):
+            r = client.get(reverse("resourcing-request-list"))
+
+        assert len(r.context["object_list"]) == 6
+
 
 class TestResourcingRequestDetailView:
     def test_hiring_manager_can_view(self, client, hiring_manager, resourcing_request):
@@ -36,6 +127,121 @@ class TestResourcingRequestDetailView:
         )
         assert r.status_code == 200
 
+    def test_num_queries(
+        self, client, hiring_manager, full_resourcing_request, django_assert_num_queries
+    ):
+        url = reverse(
+            "resourcing-request-detail",
+            kwargs={"resourcing_request_pk": full_resourcing_request.pk},
+        )
+        # Warm up the permission snapshot and the cached fragments.
+        client.get(url)
+
+        # Session, user and resourcing request, everything else is cached.
+        with django_assert_num_queries(3):
+            r = client.get(url)
+        assert r.status_code == 200
+
+    @pytest.mark.parametrize("username", ["head-of-profession", "chief", "busops"])
+    def test_approver_num_queries(
+        self, client, full_resourcing_request, django_assert_num_queries, username
+    ):
+        login(client, "hiring-manager")
+        client.post(
+            reverse(
+                "resourcing-request-send-for-approval",
+                kwargs={"resourcing_request_pk": full_resourcing_request.pk},
+            )
+        )
+        full_resourcing_request.refresh_from_db()
+        ReviewService.add_review(
+            user=User.objects.get(username="head-of-profession"),
+            resourcing_request=full_resourcing_request,
+            resourcing_request_url="http://www.example.com",
+            action=ReviewAction.APPROVE,
+            approval_type=Approval.Type.HEAD_OF_PROFESSION,
+            text=None,
+        )
+
+        url = reverse(
+            "resourcing-request-detail",
+            kwargs={"resourcing_request_pk": full_resourcing_request.pk},
+        )
+        login(client, username)
+        client.get(url)
+
+        # Working out whether the user can approve doesn't load anything either.
+        with django_assert_num_queries(3):
+            r = client.get(url)
+        assert r.context["can_user_approve"]
+
+    def test_conditional_get(
+        self, client, hiring_manager, full_resourcing_request, django_assert_num_queries
+    ):
+        url = reverse(
+            "resourcing-request-detail",
+            kwargs={"resourcing_request_pk": full_resourcing_request.pk},
+        )
+        # The first response sets the CSRF cookie, which the ETag depends on.
+        client.get(url)
+        etag = client.get(url)["ETag"]
+
+        # Session, user and resourcing request.
+        with django_assert_num_queries(3):
+            r = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert r.status_code == 304
+
+        full_resourcing_request.job_title = "QA"
+        full_resourcing_request.save()
+
+        r = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert r.status_code == 200
+        assert r["ETag"] != etag
+
+    def test_cached_fragments_are_invalidated(
+        self, client, hiring_manager, full_resourcing_request
+    ):
+        url = reverse(
+            "resourcing-request-detail",
+            kwargs={"resourcing_request_pk": full_resourcing_request.pk},
+        )
+        client.get(url)
+
+        Comment.objects.create(
+            resourcing_request=full_resourcing_request,
+            user=hiring_manager,
+            text="A new comment",
+        )
+
+        r = client.get(url)
+        assert "A new comment" in r.content.decode("utf-8")
+
+    def test_object_changes_are_invalidated(
+        self,
+        client,
+        hiring_manager,
+        full_resourcing_request,
+        django_capture_on_commit_callbacks,
+    ):
+        url = reverse(
+            "resourcing-request-detail",
+            kwargs={"resourcing_request_pk": full_resourcing_request.pk},
+        )
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            full_resourcing_request.job_title = "QA"
+            full_resourcing_request.save()
+
+        # Read after the change is committed, but before its projection is written.
+        r = client.get(url)
+        assert r.context["object_changes"] == {}
+
+        for callback in callbacks:
+            callback()
+
+        r = client.get(url)
+        assert "job_title" in r.context["object_changes"]
+
 
 class TestResourcingRequestSendForApprovalView:
     # Helpers
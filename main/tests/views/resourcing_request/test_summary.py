@@ -20,6 +20,20 @@ def test_model_summary_fields_exist_on_model():
         cls.get_fields()
 
 
+def test_summary_rows(full_resourcing_request):
+    summary = ResourcingRequestSummary(
+        instance=full_resourcing_request,
+        summary_fields=["state", "job_title", "removed_field"],
+    )
+
+    state, job_title = summary.get_rows()
+
+    assert state[0].accessor == "get_state_display"
+    assert state[1] == full_resourcing_request.get_state_display()
+    assert job_title[1] == full_resourcing_request.job_title
+    assert summary.get_field_plan() is ResourcingRequestSummary.get_field_plan()
+
+
 class TestResourcingRequestSummaryView:
     def test_without_summary_fields(self, client, dg_coo, full_resourcing_request):
         r = client.get(
@@ -53,6 +67,23 @@ class TestResourcingRequestSummaryView:
         assert "Project fee and invoicing" in html
         assert "UK based" in html
 
+    def test_etag_varies_by_summary_fields(
+        self, client, dg_coo, full_resourcing_request
+    ):
+        url = reverse(
+            "resourcing-request-summary-view",
+            kwargs={"resourcing_request_pk": full_resourcing_request.pk},
+        )
+        client.get(url)
+        etag = client.get(url)["ETag"]
+
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        dg_coo.summary_fields = {"resourcing_request": ["type"]}
+        dg_coo.save()
+
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
 
 class TestResourcingRequestEditSummaryView:
     def test_form_loads(self, client, dg_coo, full_resourcing_request):
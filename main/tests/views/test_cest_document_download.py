@@ -0,0 +1,62 @@
+from django.contrib.auth.models import Group
+from django.urls import reverse
+
+from main.models import CestDocument
+from main.tests.conftest import BUCKET
+from user.models import User
+
+
+def _create_cest_document(s3, resourcing_request):
+    key = f"resourcing_request/{resourcing_request.pk}/cest.pdf"
+    s3.put_object(
+        Bucket=BUCKET, Key=key, Body=b"%PDF-1.4", ContentType="application/pdf"
+    )
+
+    return CestDocument.objects.create(resourcing_request=resourcing_request, file=key)
+
+
+def test_download(client, hiring_manager, resourcing_request, s3):
+    cest_document = _create_cest_document(s3, resourcing_request)
+    url = reverse("cest-document-download", kwargs={"pk": cest_document.pk})
+
+    r = client.get(url)
+
+    assert r.status_code == 302
+    assert "Signature=" in r["Location"]
+    assert "no-cache" in r["Cache-Control"]
+    # The signed URL is reused until just before it expires.
+    assert client.get(url)["Location"] == r["Location"]
+
+
+def test_other_hiring_manager_cannot_download(client, resourcing_request, s3):
+    cest_document = _create_cest_document(s3, resourcing_request)
+    other_hiring_manager = User.objects.create(username="other-hiring-manager")
+    other_hiring_manager.groups.add(Group.objects.get(name="Hiring Manager"))
+    client.force_login(other_hiring_manager)
+
+    r = client.get(reverse("cest-document-download", kwargs={"pk": cest_document.pk}))
+
+    assert r.status_code == 403
+
+
+def test_approver_can_download(client, busops, resourcing_request, s3):
+    cest_document = _create_cest_document(s3, resourcing_request)
+
+    r = client.get(reverse("cest-document-download", kwargs={"pk": cest_document.pk}))
+
+    assert r.status_code == 302
+
+
+def test_detail_links_to_download(client, hiring_manager, resourcing_request, s3):
+    cest_document = _create_cest_document(s3, resourcing_request)
+
+    r = client.get(
+        reverse(
+            "resourcing-request-detail",
+            kwargs={"resourcing_request_pk": resourcing_request.pk},
+        )
+    )
+    html = r.content.decode("utf-8")
+
+    assert reverse("cest-document-download", kwargs={"pk": cest_document.pk}) in html
+    assert "Signature=" not in html
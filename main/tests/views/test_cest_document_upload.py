@@ -0,0 +1,194 @@
+import json
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import django_chunk_upload_handlers.clam_av as clam_av_module
+import pytest
+import requests
+from django.urls import reverse
+from django_chunk_upload_handlers.models import ScannedFile
+
+from event_log.models import Event
+from main.models import CestDocument
+from main.services.direct_upload import CLAM_AV_UPLOAD_HANDLER
+from main.tests.conftest import BUCKET
+
+
+def _get_upload_policy(client, resourcing_request):
+    r = client.get(
+        reverse(
+            "cest-document-create",
+            kwargs={"resourcing_request_pk": resourcing_request.pk},
+        )
+    )
+
+    return r.context["upload_policy"]
+
+
+def _upload(policy, content=b"%PDF-1.4", filename="cest.pdf", **fields):
+    r = requests.post(
+        policy.url,
+        data=policy.fields | fields,
+        files={"file": (filename, content)},
+        allow_redirects=False,
+    )
+    assert r.status_code == 303
+
+    # Where S3 redirects the browser to.
+    location = urlparse(r.headers["Location"])
+
+    return location.path, {k: v[0] for k, v in parse_qs(location.query).items()}
+
+
+def test_direct_upload(client, hiring_manager, resourcing_request, s3):
+    policy = _get_upload_policy(client, resourcing_request)
+    assert policy.url.startswith(f"https://{BUCKET}.s3")
+
+    path, query = _upload(policy)
+    assert path == reverse(
+        "cest-document-confirm-upload",
+        kwargs={"resourcing_request_pk": resourcing_request.pk},
+    )
+
+    r = client.get(path, query)
+
+    assert r.status_code == 302
+    cest_document = CestDocument.objects.get(resourcing_request=resourcing_request)
+    assert cest_document.file.name == query["key"]
+    assert cest_document.file.name.startswith(
+        f"resourcing_request/{resourcing_request.pk}/"
+    )
+    assert Event.objects.filter(
+        object_id=resourcing_request.pk, description="Created a CEST document"
+    ).exists()
+
+
+def test_direct_upload_not_a_pdf(client, hiring_manager, resourcing_request, s3):
+    policy = _get_upload_policy(client, resourcing_request)
+    path, query = _upload(policy, filename="cest.exe")
+
+    r = client.get(path, query, follow=True)
+
+    assert "The CEST document must be a PDF." in r.content.decode("utf-8")
+    assert not CestDocument.objects.filter(resourcing_request=resourcing_request)
+    assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 0
+
+
+def test_direct_upload_other_key(client, hiring_manager, resourcing_request, s3):
+    policy = _get_upload_policy(client, resourcing_request)
+    path, query = _upload(policy)
+    s3.put_object(
+        Bucket=BUCKET,
+        Key="resourcing_request/0/other.pdf",
+        Body=b"%PDF-1.4",
+        ContentType="application/pdf",
+    )
+
+    r = client.get(path, query | {"key": "resourcing_request/0/other.pdf"})
+
+    assert r.status_code == 302
+    assert not CestDocument.objects.filter(resourcing_request=resourcing_request)
+
+
+def test_direct_upload_disabled(client, hiring_manager, resourcing_request):
+    r = client.get(
+        reverse(
+            "cest-document-create",
+            kwargs={"resourcing_request_pk": resourcing_request.pk},
+        )
+    )
+
+    assert "upload_policy" not in r.context
+
+
+def test_direct_upload_not_pdf_content(client, hiring_manager, resourcing_request, s3):
+    policy = _get_upload_policy(client, resourcing_request)
+    # The Content-Type is set by the policy, whatever the file is.
+    path, query = _upload(policy, content=b"MZ\x90\x00")
+
+    r = client.get(path, query, follow=True)
+
+    assert "The CEST document must be a PDF." in r.content.decode("utf-8")
+    assert not CestDocument.objects.filter(resourcing_request=resourcing_request)
+    assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 0
+
+
+class FakeClamAVConnection:
+    result = {"malware": False}
+    # The connection for the latest scan.
+    last = None
+
+    def __init__(self, *args, **kwargs):
+        self.body = b""
+        FakeClamAVConnection.last = self
+
+    def connect(self):
+        pass
+
+    def putrequest(self, method, path):
+        pass
+
+    def putheader(self, name, value):
+        pass
+
+    def endheaders(self):
+        pass
+
+    def send(self, data):
+        self.body += data
+
+    def getresponse(self):
+        return mock.Mock(status=200, read=lambda: json.dumps(self.result).encode())
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def clam_av(settings, monkeypatch):
+    settings.FILE_UPLOAD_HANDLERS = [CLAM_AV_UPLOAD_HANDLER]
+    monkeypatch.setattr(clam_av_module, "HTTPSConnection", FakeClamAVConnection)
+
+    return FakeClamAVConnection
+
+
+def test_direct_upload_is_scanned(
+    client, hiring_manager, resourcing_request, s3, clam_av
+):
+    policy = _get_upload_policy(client, resourcing_request)
+    path, query = _upload(policy)
+
+    r = client.get(path, query)
+
+    assert r.status_code == 302
+    assert CestDocument.objects.filter(resourcing_request=resourcing_request)
+    assert b"%PDF-1.4" in clam_av.last.body
+    assert ScannedFile.objects.get().av_passed
+
+
+def test_direct_upload_virus(
+    client, hiring_manager, resourcing_request, s3, clam_av, monkeypatch
+):
+    monkeypatch.setattr(clam_av, "result", {"malware": True, "reason": "Eicar"})
+    policy = _get_upload_policy(client, resourcing_request)
+    path, query = _upload(policy)
+
+    r = client.get(path, query, follow=True)
+
+    assert "A virus was found in the CEST document." in r.content.decode("utf-8")
+    assert not CestDocument.objects.filter(resourcing_request=resourcing_request)
+    assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 0
+
+
+def test_direct_upload_scan_failed(
+    client, hiring_manager, resourcing_request, s3, clam_av, monkeypatch
+):
+    monkeypatch.setattr(clam_av, "result", {"error": "Unavailable"})
+    policy = _get_upload_policy(client, resourcing_request)
+    path, query = _upload(policy)
+
+    r = client.get(path, query, follow=True)
+
+    assert "could not be checked for viruses" in r.content.decode("utf-8")
+    assert not CestDocument.objects.filter(resourcing_request=resourcing_request)
+    assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 0
@@ -1,6 +1,23 @@
 from django.urls import reverse
 
+from main.tests.conftest import login
+
 
 def test_dashboard_page_loads_successfully(client, hiring_manager):
     r = client.get(reverse("dashboard"))
     assert r.status_code == 200
+
+
+def test_awaiting_your_approval(client, full_resourcing_request):
+    login(client, "hiring-manager")
+    client.post(
+        reverse(
+            "resourcing-request-send-for-approval",
+            kwargs={"resourcing_request_pk": full_resourcing_request.pk},
+        )
+    )
+
+    login(client, "head-of-profession")
+    r = client.get(reverse("dashboard"))
+
+    assert list(r.context["awaiting_your_approval"]) == [full_resourcing_request]
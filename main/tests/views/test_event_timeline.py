@@ -0,0 +1,112 @@
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+from django.utils import timezone
+
+import event_log.models as event_log_models
+from main.pagination import KeysetPaginator
+from main.services.event_log import EventLogService, EventType
+from main.views.event_log import ResourcingRequestTimelineView
+
+
+class TestResourcingRequestTimelineView:
+    # Helpers
+    def _get(self, client, resourcing_request, data=None):
+        return client.get(
+            reverse(
+                "resourcing-request-timeline",
+                kwargs={"resourcing_request_pk": resourcing_request.pk},
+            ),
+            data,
+        )
+
+    # Tests
+    def test_hiring_manager_can_view(self, client, hiring_manager, resourcing_request):
+        r = self._get(client, resourcing_request)
+        assert r.status_code == 200
+        assert [x.description for x in r.context["page"]] == [
+            "Created a contractor request"
+        ]
+
+    def test_filter_by_event_type(self, client, hiring_manager, resourcing_request):
+        EventLogService.add_event(
+            resourcing_request, hiring_manager, EventType.COMMENTED
+        )
+        event_type = event_log_models.EventType.objects.get(
+            code=EventType.COMMENTED.name
+        )
+
+        r = self._get(client, resourcing_request, {"event_type": event_type.pk})
+        assert [x.event_type for x in r.context["page"]] == [event_type]
+
+    def test_pagination(self, client, hiring_manager, resourcing_request, monkeypatch):
+        monkeypatch.setattr(ResourcingRequestTimelineView, "per_page", 1)
+        EventLogService.add_event(
+            resourcing_request, hiring_manager, EventType.COMMENTED
+        )
+
+        r = self._get(client, resourcing_request)
+        assert r.context["page"].has_next
+        first_page = list(r.context["page"])
+
+        r = self._get(
+            client, resourcing_request, {"cursor": r.context["page"].next_cursor}
+        )
+        assert not r.context["page"].has_next
+        assert list(r.context["page"]) != first_page
+
+    def test_pagination_same_timestamp(
+        self, client, hiring_manager, resourcing_request, monkeypatch
+    ):
+        monkeypatch.setattr(ResourcingRequestTimelineView, "per_page", 1)
+
+        for _ in range(2):
+            EventLogService.add_event(
+                resourcing_request, hiring_manager, EventType.COMMENTED
+            )
+
+        events = event_log_models.Event.objects.filter(
+            content_type=ContentType.objects.get_for_model(resourcing_request),
+            object_id=resourcing_request.pk,
+        )
+        # Within the same millisecond.
+        events.update(timestamp=timezone.now().replace(microsecond=123456))
+
+        seen = []
+        data = {}
+
+        while True:
+            r = self._get(client, resourcing_request, data)
+            seen.extend(r.context["page"])
+
+            if not r.context["page"].has_next:
+                break
+
+            data = {"cursor": r.context["page"].next_cursor}
+
+        assert len(seen) == events.count() == 3
+        assert len(set(seen)) == 3
+
+    def test_invalid_cursor(self, client, hiring_manager, resourcing_request):
+        paginator = KeysetPaginator(
+            event_log_models.Event.objects.all(),
+            ordering=["-timestamp", "-pk"],
+            per_page=1,
+        )
+
+        r = self._get(
+            client,
+            resourcing_request,
+            {"cursor": paginator.encode(["not a timestamp", 1])},
+        )
+        assert r.status_code == 400
+
+
+class TestEventTimelineView:
+    def test_busops_can_view(self, client, busops, resourcing_request):
+        r = client.get(reverse("event-timeline"))
+        assert r.status_code == 200
+        assert len(r.context["page"]) >= 1
+
+    def test_hiring_manager_cannot_view(self, client, hiring_manager):
+        r = client.get(reverse("event-timeline"))
+        assert r.status_code == 403
@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+
+from django.urls import reverse
+
+from main.models import Approval, ResourcingRequest
+from main.services.resourcing_request import create_full_test_resourcing_request
+from main.tests.conftest import login
+
+
+def _export(client, **params):
+    r = client.get(reverse("resourcing-request-export"), params)
+    assert r.status_code == 200
+
+    return b"".join(r.streaming_content).decode("utf-8")
+
+
+def test_export_csv(client, busops, full_resourcing_request):
+    full_resourcing_request.job_title = "=HYPERLINK(1)"
+    full_resourcing_request.state = ResourcingRequest.State.AWAITING_APPROVALS
+    full_resourcing_request.save()
+
+    approval = Approval.objects.create(
+        resourcing_request=full_resourcing_request,
+        user=busops,
+        type=Approval.Type.HEAD_OF_PROFESSION,
+        approved=True,
+    )
+    full_resourcing_request.head_of_profession_approval = approval
+    full_resourcing_request.save()
+
+    rows = list(csv.DictReader(io.StringIO(_export(client))))
+
+    assert len(rows) == 1
+    row = rows[0]
+    assert row["id"] == str(full_resourcing_request.pk)
+    assert row["job_title"] == "'=HYPERLINK(1)"
+    assert row["state"] == "Awaiting approvals"
+    assert (
+        row["group"] == full_resourcing_request.financial_information.group.group_name
+    )
+    assert row["cost_centre_code"] == "111113"
+    assert row["head_of_profession_approval_status"] == "Approved"
+    assert row["head_of_profession_approval_date"]
+    assert row["chief_approval_status"] == ""
+
+
+def test_export_jsonl_with_filters(client, busops, full_resourcing_request):
+    approved = create_full_test_resourcing_request(
+        job_title="Approved", project_name="Export", inside_ir35=False
+    )
+    approved.state = ResourcingRequest.State.APPROVED
+    approved.save()
+
+    content = _export(client, format="jsonl", state=ResourcingRequest.State.DRAFT.value)
+    rows = [json.loads(line) for line in content.splitlines()]
+
+    assert [row["id"] for row in rows] == [full_resourcing_request.pk]
+    assert rows[0]["total_budget"] == 500_000
+    assert rows[0]["start_date"] == full_resourcing_request.start_date.isoformat()
+
+    assert _export(client, format="jsonl", end_date="2000-01-01") == ""
+
+
+def test_export_errors(client, hiring_manager):
+    url = reverse("resourcing-request-export")
+
+    assert client.get(url).status_code == 403
+
+    login(client, "busops")
+
+    assert client.get(url, {"format": "xml"}).status_code == 400
+    assert client.get(url, {"start_date": "tomorrow"}).status_code == 400
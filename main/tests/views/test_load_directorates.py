@@ -0,0 +1,63 @@
+from django.urls import reverse
+
+from chartofaccount.index import get_index
+from chartofaccount.models import DepartmentalGroup, Directorate
+
+
+URL = reverse("htmx-load-directorates")
+
+
+def test_load_directorates(client, hiring_manager):
+    r = client.get(URL, {"group": "1111AA"})
+    html = r.content.decode("utf-8")
+
+    assert '<option value="11111A">Social Media</option>' in html
+    assert r.has_header("ETag")
+
+
+def test_load_directorates_from_index(
+    client, hiring_manager, django_assert_num_queries
+):
+    client.get(URL, {"group": "1111AA"})
+
+    # Session and user.
+    with django_assert_num_queries(2):
+        r = client.get(URL, {"group": "1111AA"})
+    assert r.status_code == 200
+
+    with django_assert_num_queries(2):
+        r = client.get(URL, {"group": "1111AA"}, HTTP_IF_NONE_MATCH=r["ETag"])
+    assert r.status_code == 304
+
+
+def test_load_directorates_is_invalidated(client, hiring_manager):
+    etag = client.get(URL, {"group": "1111AA"})["ETag"]
+
+    Directorate.objects.create(
+        directorate_code="11111Z",
+        directorate_name="Podcasts",
+        group=DepartmentalGroup.objects.get(pk="1111AA"),
+    )
+
+    r = client.get(URL, {"group": "1111AA"}, HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 200
+    assert "Podcasts" in r.content.decode("utf-8")
+
+
+def test_index_version_moves_on_after_commit(db, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        Directorate.objects.create(
+            directorate_code="11111Z",
+            directorate_name="Podcasts",
+            group=DepartmentalGroup.objects.get(pk="1111AA"),
+        )
+        # As if another process rebuilt the index before the commit.
+        version = get_index().version
+
+    assert get_index().version != version
+
+
+def test_load_directorates_unknown_group(client, hiring_manager):
+    r = client.get(URL, {"group": "UNKNOWN"})
+
+    assert r.content.decode("utf-8").strip() == '<option value="">---------</option>'
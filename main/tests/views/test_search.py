@@ -0,0 +1,99 @@
+from django.urls import reverse
+
+from main.models import Comment, ResourcingRequest, SearchDocument
+from main.services.resourcing_request import create_full_test_resourcing_request
+from main.tests.conftest import login
+from main.views.resourcing_request import ResourcingRequestSearchView
+from user.models import User
+
+
+def _search(client, query, **params):
+    r = client.get(reverse("resourcing-request-search"), {"q": query, **params})
+    assert r.status_code == 200
+
+    return r
+
+
+def _create_resourcing_request(job_title, project_name="Search"):
+    return create_full_test_resourcing_request(
+        job_title=job_title, project_name=project_name, inside_ir35=True
+    )
+
+
+def test_search_ranks_titles_above_comments(client, busops):
+    in_title = _create_resourcing_request("Kubernetes Engineer")
+    in_comment = _create_resourcing_request("Python Developer")
+    _create_resourcing_request("Data Analyst")
+
+    Comment.objects.create(
+        resourcing_request=in_comment, user=busops, text="Knows some kubernetes."
+    )
+
+    r = _search(client, "kubernetes")
+
+    assert list(r.context["object_list"]) == [in_title, in_comment]
+
+
+def test_search_is_kept_up_to_date(client, busops):
+    resourcing_request = _create_resourcing_request("Python Developer")
+
+    assert not _search(client, "blockchain").context["object_list"]
+
+    statement_of_work = resourcing_request.statement_of_work
+    statement_of_work.project_description = "Migrating the ledger to a blockchain."
+    statement_of_work.save()
+
+    assert list(_search(client, "blockchains").context["object_list"]) == [
+        resourcing_request
+    ]
+
+    statement_of_work.delete()
+
+    assert not _search(client, "blockchain").context["object_list"]
+    assert SearchDocument.objects.filter(pk=resourcing_request.pk).exists()
+
+
+def test_search_only_shows_accessible_requests(client, hiring_manager):
+    own = _create_resourcing_request("Python Developer")
+    other = _create_resourcing_request("Python Developer")
+    other.requestor = User.objects.get(username="admin")
+    other.save()
+
+    assert list(_search(client, "python").context["object_list"]) == [own]
+
+    login(client, "busops")
+    assert set(_search(client, "python").context["object_list"]) == {own, other}
+
+
+def test_search_paginates_by_rank(client, busops, monkeypatch):
+    monkeypatch.setattr(ResourcingRequestSearchView, "per_page", 2)
+
+    for i in range(5):
+        _create_resourcing_request(f"Python Developer {i}")
+
+    expected = list(
+        ResourcingRequest.objects.search("python").order_by("-search_rank", "-pk")
+    )
+
+    results = []
+    params = {}
+
+    while True:
+        r = _search(client, "python", **params)
+        results.extend(r.context["page"])
+
+        if not r.context["page"].has_next:
+            break
+
+        params = {"cursor": r.context["page"].next_cursor}
+
+    assert results == expected
+
+
+def test_search_without_a_query(client, hiring_manager):
+    _create_resourcing_request("Python Developer")
+
+    r = _search(client, "")
+
+    assert "page" not in r.context
+    assert not r.context["object_list"]
@@ -23,3 +23,27 @@ def test_hiring_manager_can_view_create_supporting_document(
         )
     )
     assert r.status_code == 200
+
+
+def test_job_description_detail_renders_stored_html(
+    client, hiring_manager, full_resourcing_request
+):
+    job_description = full_resourcing_request.job_description
+    job_description.description = {
+        "delta": {
+            "ops": [
+                {"insert": "Role"},
+                {"insert": "\n", "attributes": {"header": 1}},
+                {"insert": "Builds things\n"},
+            ]
+        }
+    }
+    job_description.save()
+
+    assert job_description.description_text == "Role\nBuilds things\n"
+
+    r = client.get(job_description.get_absolute_url())
+
+    assert r.status_code == 200
+    assert "<h1>Role</h1><p>Builds things</p>" in r.content.decode()
+    assert "quill" not in r.content.decode()
@@ -0,0 +1,65 @@
+from django.urls import reverse
+
+from chartofaccount.index import ChoiceSearch
+from chartofaccount.models import CostCentre
+
+
+def test_choice_search():
+    search = ChoiceSearch(
+        [
+            ("222221", "222221 - France"),
+            ("111112", "111112 - Radio 2"),
+            ("111111", "111111 - Radio 4"),
+            ("456711", "456711 - China"),
+            ("765444", "765444 - Western Australia"),
+        ]
+    )
+
+    assert [code for code, _ in search.search("11", limit=5)] == [
+        "111111",
+        "111112",
+        "456711",
+    ]
+    assert [code for code, _ in search.search("RADIO", limit=5)] == [
+        "111111",
+        "111112",
+    ]
+    assert [code for code, _ in search.search("", limit=2)] == ["111111", "111112"]
+    assert search.search("Scotland", limit=5) == []
+
+
+def test_typeahead(client, hiring_manager):
+    url = reverse("htmx-typeahead", kwargs={"code_type": "cost-centres"})
+
+    r = client.get(url, {"cost_centre_code": "radio"})
+    html = r.content.decode("utf-8")
+
+    assert '<option value="111111">111111 - Radio 4</option>' in html
+    assert "India" not in html
+    assert r.has_header("ETag")
+
+
+def test_typeahead_unknown_code_type(client, hiring_manager):
+    r = client.get(reverse("htmx-typeahead", kwargs={"code_type": "groups"}))
+
+    assert r.status_code == 404
+
+
+def test_financial_information_form_lists_no_codes(
+    client, hiring_manager, resourcing_request
+):
+    CostCentre.objects.bulk_create(
+        CostCentre(cost_centre_code=f"9{i:05d}", cost_centre_name=f"Team {i}")
+        for i in range(500)
+    )
+
+    r = client.get(
+        reverse(
+            "financial-information-create",
+            kwargs={"resourcing_request_pk": resourcing_request.pk},
+        )
+    )
+    html = r.content.decode("utf-8")
+
+    assert 'list="id_cost_centre_code_options"' in html
+    assert "Team 1" not in html
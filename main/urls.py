@@ -7,12 +7,14 @@ from main.views.detail_views import (
     SdsStatusDeterminationDetailView,
     StatementOfWorkDetailView,
 )
+from main.views.event_log import EventTimelineView, ResourcingRequestTimelineView
 from main.views.getting_started import getting_started
 from main.views.interim_request_views import (
     InterimRequestCreateView,
     InterimRequestDetailView,
     InterimRequestUpdateView,
     load_directorates,
+    typeahead,
 )
 from main.views.resourcing_request import (
     ResourcingRequestAmendView,
@@ -20,10 +22,12 @@ from main.views.resourcing_request import (
     ResourcingRequestDeleteView,
     ResourcingRequestDetailView,
     ResourcingRequestEditSummaryView,
+    ResourcingRequestExportView,
     ResourcingRequestFinishAmendmentsReviewView,
     ResourcingRequestListView,
     ResourcingRequestMarkAsCompleteView,
     ResourcingRequestReviewView,
+    ResourcingRequestSearchView,
     ResourcingRequestSendForApprovalView,
     ResourcingRequestSendForReviewView,
     ResourcingRequestSummaryView,
@@ -40,7 +44,9 @@ from main.views.statement_of_work_views import (
     StatementOfWorkUpdateView,
 )
 from main.views.supporting_documents import (
+    CestDocumentConfirmUploadView,
     CestDocumentCreateView,
+    CestDocumentDownloadView,
     CestDocumentUpdateView,
     FinancialInformationCreateView,
     FinancialInformationDetailView,
@@ -173,11 +179,18 @@ interim_request_urls = supporting_document_urls(
     InterimRequestDetailView,
 )
 
-cest_document_urls = supporting_document_urls(
-    "cest-document",
-    CestDocumentCreateView,
-    CestDocumentUpdateView,
-)
+cest_document_urls = [
+    *supporting_document_urls(
+        "cest-document",
+        CestDocumentCreateView,
+        CestDocumentUpdateView,
+    ),
+    path(
+        "confirm-upload",
+        CestDocumentConfirmUploadView.as_view(),
+        name="cest-document-confirm-upload",
+    ),
+]
 
 sds_status_determination_urls = supporting_document_urls(
     "sds-status-determination",
@@ -203,6 +216,11 @@ request_urls = [
         name="resourcing-request-delete",
     ),
     path("summary/", include(summary_urls)),
+    path(
+        "timeline",
+        ResourcingRequestTimelineView.as_view(),
+        name="resourcing-request-timeline",
+    ),
     # Supporting documents
     path("financial-information/", include(financial_information_urls)),
     path("job-description/", include(job_description_urls)),
@@ -247,6 +265,7 @@ urlpatterns = [
     path("", index, name="index"),
     path("getting-started/", getting_started, name="getting-started"),
     path("dashboard/", DashboardView.as_view(), name="dashboard"),
+    path("audit-log/", EventTimelineView.as_view(), name="event-timeline"),
     # Resourcing request
     path(
         "contractor-request/",
@@ -262,6 +281,16 @@ urlpatterns = [
                     ResourcingRequestCreateView.as_view(),
                     name="resourcing-request-create",
                 ),
+                path(
+                    "export/",
+                    ResourcingRequestExportView.as_view(),
+                    name="resourcing-request-export",
+                ),
+                path(
+                    "search/",
+                    ResourcingRequestSearchView.as_view(),
+                    name="resourcing-request-search",
+                ),
                 path(
                     "<int:resourcing_request_pk>/",
                     include(request_urls),
@@ -269,8 +298,14 @@ urlpatterns = [
             ]
         ),
     ),
+    path(
+        "cest/<int:pk>/download",
+        CestDocumentDownloadView.as_view(),
+        name="cest-document-download",
+    ),
     # htmx
     path("htmx/load-directorates/", load_directorates, name="htmx-load-directorates"),
+    path("htmx/typeahead/<slug:code_type>/", typeahead, name="htmx-typeahead"),
     path(
         "htmx/total-budget-calculator/",
         total_budget_calculator,
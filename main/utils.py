@@ -1,3 +1,4 @@
+from chartofaccount.index import get_index
 from chartofaccount.models import Directorate
 from main.models import Approval
 
@@ -8,13 +9,27 @@ def get_user_related_approval_types(user, resourcing_request=None):
         if (
             resourcing_request
             and resourcing_request.can_clear_approval
-            and user.has_perm("main.can_give_busops_approval")
+            and user.has_approval_perm(Approval.Type.BUSOPS)
         ):
             yield approval_type
-        elif user.has_perm(f"main.can_give_{approval_type.value}_approval"):
+        elif user.has_approval_perm(approval_type):
             yield approval_type
 
 
+def set_index_choices(form, field_name, choices) -> None:
+    """Render a model choice field from choices held in memory.
+
+    The queryset is still used to validate the field, but not to render it.
+    """
+    if field_name not in form.fields:
+        return
+
+    field = form.fields[field_name]
+    empty_choices = [] if field.empty_label is None else [("", field.empty_label)]
+
+    field.widget.choices = [*empty_choices, *choices]
+
+
 def syncronise_cost_centre_dropdowns(
     form,
     group_field="group",
@@ -23,30 +38,24 @@ def syncronise_cost_centre_dropdowns(
 
     # The two dropdowns group/directorate are linked.
     # The group selection  is used to filter the directorate list.
+    index = get_index()
 
-    clear_directorate = True
+    group_code = None
 
     if group_field in form.data:
         # if a group has been selected, we can populate the other lists.
         if directorate_field in form.data:
-            try:
-                # Populate the directorate
-                group_code = form.data.get(group_field)
-                form.fields[directorate_field].queryset = Directorate.objects.filter(
-                    group=group_code
-                ).order_by("directorate_name")
-                clear_directorate = False
-            except (ValueError, TypeError):
-                pass
+            group_code = form.data.get(group_field)
     elif form.instance.pk:
         # Update case: set the directorate dropdown using the instance values
-        try:
-            form.fields[
-                directorate_field
-            ].queryset = form.instance.group.directorates.order_by("directorate_name")
-            clear_directorate = False
-        except (ValueError, TypeError):
-            pass
-
-    if clear_directorate:
+        group_code = form.instance.group_id
+
+    if group_code:
+        form.fields[directorate_field].queryset = Directorate.objects.filter(
+            group=group_code
+        )
+    else:
         form.fields[directorate_field].queryset = Directorate.objects.none()
+
+    set_index_choices(form, group_field, index.groups)
+    set_index_choices(form, directorate_field, index.directorates.get(group_code, []))
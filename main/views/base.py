@@ -1,18 +1,170 @@
+import hashlib
+from typing import ClassVar, Optional
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.views import View
 
 from main.models import ResourcingRequest
+from user.permissions import get_permission_fingerprint
 
 
 class ResourcingRequestBaseView(View):
+    # The parts of the resourcing request to load up front, see
+    # `ResourcingRequestQuerySet.select_related_parts`.
+    resourcing_request_parts: ClassVar[list[str]] = ["approvals"]
+    # Only load the resourcing request row in `setup`, the view then loads the parts
+    # with `load_resourcing_request_parts` once it knows it needs them.
+    defer_resourcing_request_parts: ClassVar[bool] = False
+
     def setup(self, request, *args, **kwargs):
         super().setup(request, *args, **kwargs)
 
-        self.resourcing_request = (
-            ResourcingRequest.objects.select_related_approvals().get(
-                pk=self.kwargs["resourcing_request_pk"]
-            )
+        parts = (
+            [] if self.defer_resourcing_request_parts else self.resourcing_request_parts
         )
 
+        self.resourcing_request = ResourcingRequest.objects.select_related_parts(
+            *parts
+        ).get(pk=self.kwargs["resourcing_request_pk"])
+
         self.resourcing_request_url = self.request.build_absolute_uri(
             self.resourcing_request.get_absolute_url()
         )
+
+    def load_resourcing_request_parts(self) -> None:
+        if not self.resourcing_request_parts:
+            return
+
+        self.resourcing_request = ResourcingRequest.objects.select_related_parts(
+            *self.resourcing_request_parts
+        ).get(pk=self.resourcing_request.pk)
+
+
+class ResourcingRequestConditionalMixin:
+    """Answer conditional GET requests with the resourcing request's version.
+
+    Everything the ETag depends on is known from the resourcing request row and the
+    user, so a 304 is returned before any related objects are loaded or templates
+    rendered. The mixin should come after the permission mixins.
+    """
+
+    defer_resourcing_request_parts = True
+
+    def get_etag_data(self) -> list[str]:
+        """Return what the page depends on, other than the resourcing request."""
+        user = self.request.user
+
+        return [
+            settings.APP_VERSION,
+            str(user.pk),
+            str(user.profession_id),
+            get_permission_fingerprint(user),
+            # The forms on the page carry a CSRF token for the user's session.
+            self.request.META.get("CSRF_COOKIE", ""),
+        ]
+
+    def get_etag(self) -> Optional[str]:
+        # The messages are shown on the page, so it can't be reused from the cache.
+        if len(messages.get_messages(self.request)):
+            return None
+
+        data = [
+            str(self.resourcing_request.pk),
+            str(self.resourcing_request.version),
+            *self.get_etag_data(),
+        ]
+        digest = hashlib.sha256(":".join(data).encode("utf-8")).hexdigest()
+
+        return f'"{digest[:32]}"'
+
+    def dispatch(self, request, *args, **kwargs):
+        etag = None
+
+        if request.method in ("GET", "HEAD"):
+            etag = self.get_etag()
+
+            if etag is not None:
+                response = get_conditional_response(request, etag=etag)
+
+                if response is not None:
+                    response["ETag"] = etag
+
+                    return response
+
+        self.load_resourcing_request_parts()
+
+        response = super().dispatch(request, *args, **kwargs)
+
+        if etag is not None and response.status_code == 200:
+            response["ETag"] = etag
+            # Browsers have to revalidate the page, and shared caches can't keep it.
+            patch_cache_control(response, private=True, no_cache=True)
+
+        return response
+
+
+class ResourcingRequestObjectMixin:
+    """Use the already loaded resourcing request as the view's object."""
+
+    def get_object(self, queryset=None):
+        return self.resourcing_request
+
+
+class ResourcingRequestFragmentCacheMixin:
+    """Cache parts of the page under the resourcing request's version.
+
+    The template caches each of `cached_fragments` with `{% cache %}`, varying on
+    `fragment_vary_on`. The related objects only the fragments need are loaded
+    when one of them has to be rendered, so a page whose fragments are all cached
+    only needs the resourcing request itself.
+
+    Example:
+        {% cache fragment_cache_timeout approvals fragment_vary_on %}
+    """
+
+    cached_fragments: ClassVar[list[str]] = []
+    # The parts of the resourcing request to load when a fragment is rendered.
+    cached_fragment_parts: ClassVar[list[str]] = []
+    fragment_cache_timeout = 60 * 60
+
+    def get_fragment_vary_on(self) -> str:
+        # Joined so the templates only need to pass one variable.
+        return ":".join(
+            [
+                str(self.resourcing_request.pk),
+                str(self.resourcing_request.version),
+                get_permission_fingerprint(self.request.user),
+            ]
+        )
+
+    def get_cached_fragments(self) -> list[str]:
+        """Return the fragments which the template renders for this request."""
+        return self.cached_fragments
+
+    def are_fragments_cached(self) -> bool:
+        vary_on = [self.get_fragment_vary_on()]
+        keys = [
+            make_template_fragment_key(x, vary_on) for x in self.get_cached_fragments()
+        ]
+
+        return len(cache.get_many(keys)) == len(keys)
+
+    def get_object(self, queryset=None):
+        if not self.are_fragments_cached():
+            self.resourcing_request = ResourcingRequest.objects.select_related_parts(
+                *self.resourcing_request_parts, *self.cached_fragment_parts
+            ).get(pk=self.resourcing_request.pk)
+
+        return super().get_object(queryset)
+
+    def get_context_data(self, **kwargs):
+        context = {
+            "fragment_cache_timeout": self.fragment_cache_timeout,
+            "fragment_vary_on": self.get_fragment_vary_on(),
+        }
+
+        return super().get_context_data(**kwargs) | context
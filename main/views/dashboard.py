@@ -1,9 +1,8 @@
-from django.db.models import Q
 from django.shortcuts import redirect
 from django.urls.base import reverse
 from django.views.generic.base import TemplateView
 
-from main.models import ResourcingRequest
+from main.models import Approval, ApprovalInboxItem, ResourcingRequest
 from main.utils import get_user_related_approval_types
 
 
@@ -26,7 +25,7 @@ class DashboardView(TemplateView):
         context["awaiting_your_approval"] = self._get_awaiting_approval_context_data()
         context["approved_by_you"] = self._get_approved_by_you_context_data()
 
-        if user.has_perm("main.can_give_busops_approval"):
+        if user.has_approval_perm(Approval.Type.BUSOPS):
             context["amended_resourcing_requests"] = ResourcingRequest.objects.filter(
                 state=ResourcingRequest.State.AMENDMENTS_REVIEW
             )
@@ -34,25 +33,22 @@ class DashboardView(TemplateView):
         return context
 
     def _get_awaiting_approval_context_data(self):
-        approval_filter = Q()
+        approval_types = list(get_user_related_approval_types(self.request.user))
 
-        for approval_type in get_user_related_approval_types(self.request.user):
-            approval_filter |= (
-                Q(**{f"{approval_type}_approval__isnull": True})
-                | Q(**{f"{approval_type}_approval__approved__isnull": True})
-                | Q(**{f"{approval_type}_approval__approved": False})
-            )
-
-        if not approval_filter:
+        if not approval_types:
             return
 
-        query = ResourcingRequest.objects.filter(
-            Q(state=ResourcingRequest.State.AWAITING_APPROVALS) & approval_filter
-        ).distinct()
+        # The approval inbox only holds pending approvals for requests which are
+        # awaiting approvals.
+        inbox = ApprovalInboxItem.objects.filter(approval_type__in=approval_types)
 
-        return query
+        return ResourcingRequest.objects.filter(
+            pk__in=inbox.values("resourcing_request")
+        )
 
     def _get_approved_by_you_context_data(self):
+        approvals = Approval.objects.filter(user=self.request.user)
+
         return ResourcingRequest.objects.filter(
-            approvals__user=self.request.user
-        ).distinct()
+            pk__in=approvals.values("resourcing_request")
+        )
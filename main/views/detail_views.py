@@ -4,9 +4,14 @@ from main.views.supporting_documents import SupportingDocumentDetailView
 
 class JobDescriptionDetailView(SupportingDocumentDetailView):
     model = JobDescription
-    template_name = "main/jobdescription_detail.html"
     permission_required = "main.view_jobdescription"
     title = "Job description"
+    excluded_fields = [
+        "id",
+        "resourcing_request",
+        "description_text",
+        "description_html",
+    ]
     stacked_fields = [
         "role_purpose",
         "key_accountabilities",
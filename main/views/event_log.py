@@ -0,0 +1,80 @@
+from django.contrib.auth.mixins import PermissionRequiredMixin
+from django.contrib.contenttypes.models import ContentType
+from django.views.generic.base import TemplateView
+
+from event_log.models import Event
+from main.forms.forms import EventFilterForm
+from main.models import ResourcingRequest
+from main.pagination import paginate
+from main.views.base import ResourcingRequestBaseView
+from main.views.resourcing_request.resourcing_request import (
+    CanAccessResourcingRequestMixin,
+)
+
+
+class EventTimelineMixin:
+    """A view mixin for a filterable, paginated timeline of events."""
+
+    template_name = "main/event_timeline.html"
+    per_page = 50
+    title: str
+
+    def get_events(self):
+        raise NotImplementedError
+
+    def get_context_data(self, **kwargs):
+        filter_form = EventFilterForm(data=self.request.GET)
+        # The page is still shown for invalid filters, with their errors.
+        filter_form.is_valid()
+
+        events = filter_form.filter(
+            self.get_events().select_related("event_type", "user")
+        )
+
+        context = paginate(
+            self.request,
+            events,
+            ordering=["-timestamp", "-pk"],
+            per_page=self.per_page,
+        )
+        context["filter_form"] = filter_form
+        context["title"] = self.title
+        context["resourcing_request_content_type"] = ContentType.objects.get_for_model(
+            ResourcingRequest
+        )
+
+        return super().get_context_data(**kwargs) | context
+
+
+class EventTimelineView(PermissionRequiredMixin, EventTimelineMixin, TemplateView):
+    permission_required = "main.view_all_resourcingrequests"
+    title = "Audit log"
+
+    def get_events(self):
+        return Event.objects.all()
+
+
+class ResourcingRequestTimelineView(
+    CanAccessResourcingRequestMixin,
+    PermissionRequiredMixin,
+    EventTimelineMixin,
+    TemplateView,
+    ResourcingRequestBaseView,
+):
+    permission_required = "main.view_resourcingrequest"
+    resourcing_request_parts = []
+
+    @property
+    def title(self):
+        return f"History of {self.resourcing_request}"
+
+    def get_events(self):
+        return Event.objects.filter(
+            content_type=ContentType.objects.get_for_model(ResourcingRequest),
+            object_id=self.resourcing_request.pk,
+        )
+
+    def get_context_data(self, **kwargs):
+        context = {"resourcing_request": self.resourcing_request}
+
+        return super().get_context_data(**kwargs) | context
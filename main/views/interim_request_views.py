@@ -1,6 +1,10 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.views.decorators.http import condition
 
-from chartofaccount.models import Directorate
+from chartofaccount.index import get_index
 from main.forms.interim_request_form import InterimRequestNewForm
 from main.models import InterimRequest, ResourcingRequest
 from main.views.supporting_documents import (
@@ -42,13 +46,49 @@ class InterimRequestUpdateView(InterimRequestViewMixin, SupportingDocumentUpdate
     event_context = {"object": "interim request"}
 
 
+def get_chart_of_accounts_etag(request, **kwargs) -> str:
+    # The options only change with the chart of accounts, or a deploy.
+    return f"{settings.APP_VERSION}-{get_index().version}"
+
+
+@condition(etag_func=get_chart_of_accounts_etag)
 def load_directorates(request):
-    group_code = request.GET.get("group")
-    directorates = Directorate.objects.filter(group=group_code).order_by(
-        "directorate_name"
+    index = get_index()
+    group_code = request.GET.get("group", "")
+
+    # Only known groups are kept, so unknown codes can't fill up the index.
+    if group_code not in index.directorates:
+        group_code = ""
+
+    options = index.render(
+        f"directorate-options:{group_code}",
+        lambda: render_to_string(
+            "main/partials/directorate_list_options.html",
+            {"directorates": index.directorates.get(group_code, [])},
+        ),
     )
-    return render(
-        request,
-        "main/partials/directorate_list_options.html",
-        {"directorates": directorates},
+
+    return HttpResponse(options)
+
+
+# The index attribute and query parameter of each typeahead, where the parameter is
+# the name of the field the typeahead is for.
+TYPEAHEADS = {
+    "cost-centres": ("cost_centres", "cost_centre_code"),
+    "programme-codes": ("programme_codes", "programme_code"),
+    "project-codes": ("project_codes", "project_code"),
+}
+TYPEAHEAD_LIMIT = 20
+
+
+@condition(etag_func=get_chart_of_accounts_etag)
+def typeahead(request, code_type):
+    if code_type not in TYPEAHEADS:
+        raise Http404
+
+    index_name, param = TYPEAHEADS[code_type]
+    choices = getattr(get_index(), index_name).search(
+        request.GET.get(param, ""), limit=TYPEAHEAD_LIMIT
     )
+
+    return render(request, "main/partials/typeahead_options.html", {"choices": choices})
@@ -4,10 +4,12 @@ from .resourcing_request import (  # noqa: F401
     ResourcingRequestCreateView,
     ResourcingRequestDeleteView,
     ResourcingRequestDetailView,
+    ResourcingRequestExportView,
     ResourcingRequestFinishAmendmentsReviewView,
     ResourcingRequestListView,
     ResourcingRequestMarkAsCompleteView,
     ResourcingRequestReviewView,
+    ResourcingRequestSearchView,
     ResourcingRequestSendForApprovalView,
     ResourcingRequestSendForReviewView,
     ResourcingRequestUpdateView,
@@ -1,32 +1,48 @@
+from functools import partial
+
 from django.conf import settings
 from django.contrib.auth.mixins import PermissionRequiredMixin, UserPassesTestMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.core.exceptions import ValidationError
-from django.db import models
-from django.http import HttpResponse
+from django.core.cache import cache
+from django.core.exceptions import BadRequest, ValidationError
+from django.db import models, transaction
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse, reverse_lazy
+from django.views import View
 from django.views.generic.detail import DetailView
 from django.views.generic.edit import CreateView, DeleteView, FormView, UpdateView
 from django.views.generic.list import ListView
 
+from change_log.models import ChangeProjection
 from main.constants import APPROVAL_TYPE_TO_GROUP, ApproverGroup
-from main.forms.forms import ResourcingRequestForm
+from main.forms.forms import (
+    ResourcingRequestFilterForm,
+    ResourcingRequestForm,
+    ResourcingRequestSearchForm,
+)
 from main.forms.review import ReviewForm
-from main.models import ResourcingRequest
+from main.models import RESOURCING_REQUEST_PARTS, ResourcingRequest
+from main.pagination import paginate
+from main.services.approval_inbox import ApprovalInboxService
 from main.services.event_log import EventLogMixin, EventType
+from main.services.export import ResourcingRequestExport
 from main.services.review import ReviewAction, ReviewService
 from main.tasks import notify_approvers, send_group_notification, send_notification
-from main.views.base import ResourcingRequestBaseView
+from main.views.base import (
+    ResourcingRequestBaseView,
+    ResourcingRequestConditionalMixin,
+    ResourcingRequestFragmentCacheMixin,
+    ResourcingRequestObjectMixin,
+)
 from main.views.mixins import FormMixin
 
 
-# TODO: Adds 2 queries.
 class CanAccessResourcingRequestMixin(UserPassesTestMixin):
     def test_func(self):
         user = self.request.user
 
-        return user == self.resourcing_request.requestor or user.is_approver
+        return user.pk == self.resourcing_request.requestor_id or user.is_approver
 
 
 class CanEditResourcingRequestMixin:
@@ -63,12 +79,31 @@ class ResourcingRequestCreateView(
 class ResourcingRequestDetailView(
     CanAccessResourcingRequestMixin,
     PermissionRequiredMixin,
+    ResourcingRequestConditionalMixin,
+    ResourcingRequestFragmentCacheMixin,
+    ResourcingRequestObjectMixin,
     DetailView,
     ResourcingRequestBaseView,
 ):
     pk_url_kwarg = "resourcing_request_pk"
     model = ResourcingRequest
     permission_required = "main.view_resourcingrequest"
+    resourcing_request_parts = []
+    cached_fragments = [
+        "resourcing_request_overview",
+        "resourcing_request_approvals",
+        "resourcing_request_comments",
+        "resourcing_request_event_log",
+    ]
+    cached_fragment_parts = list(RESOURCING_REQUEST_PARTS)
+
+    def get_cached_fragments(self) -> list[str]:
+        if not self.request.user.has_perm("main.view_comment"):
+            return [
+                x for x in self.cached_fragments if x != "resourcing_request_comments"
+            ]
+
+        return self.cached_fragments
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -84,7 +119,12 @@ class ResourcingRequestDetailView(
             self.request.user
         )
 
-        context["object_changes"] = resourcing_request.change_log.get_changes()
+        context["object_changes"] = cache.get_or_set(
+            f"resourcing-request:{resourcing_request.pk}:object-changes:"
+            f"{resourcing_request.version}",
+            lambda: ChangeProjection.objects.get_previous_values(resourcing_request),
+            timeout=self.fragment_cache_timeout,
+        )
 
         return context
 
@@ -95,6 +135,7 @@ class ResourcingRequestUpdateView(
     CanAccessResourcingRequestMixin,
     PermissionRequiredMixin,
     FormMixin,
+    ResourcingRequestObjectMixin,
     UpdateView,
     ResourcingRequestBaseView,
 ):
@@ -113,6 +154,7 @@ class ResourcingRequestUpdateView(
 class ResourcingRequestDeleteView(
     CanAccessResourcingRequestMixin,
     PermissionRequiredMixin,
+    ResourcingRequestObjectMixin,
     DeleteView,
     ResourcingRequestBaseView,
 ):
@@ -125,6 +167,126 @@ class ResourcingRequestDeleteView(
 class ResourcingRequestListView(PermissionRequiredMixin, ListView):
     model = ResourcingRequest
     permission_required = "main.view_all_resourcingrequests"
+    per_page = 50
+    # Only load the columns shown in the table.
+    table_fields = [
+        "job_title",
+        "project_name",
+        "state",
+        "current_stage",
+        "is_ir35",
+        "completeness",
+        "start_date",
+        "end_date",
+        "requestor",
+        "requestor__username",
+        "requestor__first_name",
+        "requestor__last_name",
+    ]
+
+    def get(self, request, *args, **kwargs):
+        self.filter_form = ResourcingRequestFilterForm(data=request.GET)
+        # The page is still shown for invalid filters, with their errors.
+        self.filter_form.is_valid()
+
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        queryset = (
+            super().get_queryset().select_related("requestor").only(*self.table_fields)
+        )
+
+        return self.filter_form.filter(queryset)
+
+    def get_context_data(self, **kwargs):
+        context = paginate(
+            self.request,
+            self.object_list,
+            ordering=self.filter_form.get_ordering(),
+            per_page=self.per_page,
+        )
+        context["filter_form"] = self.filter_form
+
+        return (
+            super().get_context_data(object_list=context["page"].object_list, **kwargs)
+            | context
+        )
+
+
+class ResourcingRequestExportView(PermissionRequiredMixin, View):
+    """Download the resourcing requests, with the filters of the list page.
+
+    The `format` query parameter is either `csv`, the default, or `jsonl`.
+    """
+
+    permission_required = "main.export_resourcingrequests"
+
+    def get(self, request):
+        filter_form = ResourcingRequestFilterForm(data=request.GET)
+
+        if not filter_form.is_valid():
+            raise BadRequest("Invalid filters")
+
+        export_format = request.GET.get("format", "csv")
+
+        if export_format not in ResourcingRequestExport.FORMATS:
+            raise BadRequest("Invalid format")
+
+        queryset = filter_form.filter(ResourcingRequest.objects.all()).order_by(
+            *filter_form.get_ordering()
+        )
+        export = ResourcingRequestExport(queryset, export_format)
+
+        response = StreamingHttpResponse(export, content_type=export.content_type)
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="{export.get_filename()}"'
+
+        return response
+
+
+class ResourcingRequestSearchView(PermissionRequiredMixin, ListView):
+    model = ResourcingRequest
+    permission_required = "main.view_resourcingrequest"
+    template_name = "main/resourcingrequest_search.html"
+    per_page = 20
+    # The best matches first, see `ResourcingRequestQuerySet.search`.
+    ordering = ["-search_rank", "-pk"]
+
+    def get(self, request, *args, **kwargs):
+        self.search_form = ResourcingRequestSearchForm(data=request.GET)
+        # An invalid search is shown with its errors and no results.
+        self.search_form.is_valid()
+
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        query = self.search_form.cleaned_data.get("q")
+
+        if not query:
+            return ResourcingRequest.objects.none()
+
+        return (
+            ResourcingRequest.objects.visible_to(self.request.user)
+            .search(query)
+            .select_related("requestor")
+            .only(*ResourcingRequestListView.table_fields)
+        )
+
+    def get_context_data(self, **kwargs):
+        context = {"search_form": self.search_form}
+        object_list = []
+
+        if self.search_form.cleaned_data.get("q"):
+            context |= paginate(
+                self.request,
+                self.object_list,
+                ordering=self.ordering,
+                per_page=self.per_page,
+            )
+            object_list = context["page"].object_list
+
+        return super().get_context_data(object_list=object_list, **kwargs) | context
 
 
 class ResourcingRequestActionView(
@@ -145,6 +307,8 @@ class ResourcingRequestActionView(
 
         self.action(self.resourcing_request)
 
+        ApprovalInboxService.sync(self.resourcing_request)
+
         return redirect(
             reverse(
                 "resourcing-request-detail",
@@ -167,7 +331,14 @@ class ResourcingRequestSendForApprovalView(ResourcingRequestActionView):
         resourcing_request.state = ResourcingRequest.State.AWAITING_APPROVALS
         resourcing_request.save()
 
-        notify_approvers.delay(resourcing_request.pk, self.resourcing_request_url)
+        # The view runs in a transaction, see `EventLogMixin`.
+        transaction.on_commit(
+            partial(
+                notify_approvers.delay,
+                resourcing_request.pk,
+                self.resourcing_request_url,
+            )
+        )
 
 
 class ResourcingRequestAmendView(ResourcingRequestActionView):
@@ -193,10 +364,13 @@ class ResourcingRequestSendForReviewView(ResourcingRequestActionView):
         resourcing_request.state = ResourcingRequest.State.AMENDMENTS_REVIEW
         resourcing_request.save()
 
-        send_group_notification(
-            ApproverGroup.BUSOPS,
-            template_id=settings.GOVUK_NOTIFY_AMENDED_TEMPLATE_ID,
-            personalisation={"resourcing_request_url": self.resourcing_request_url},
+        transaction.on_commit(
+            partial(
+                send_group_notification,
+                ApproverGroup.BUSOPS,
+                template_id=settings.GOVUK_NOTIFY_AMENDED_TEMPLATE_ID,
+                personalisation={"resourcing_request_url": self.resourcing_request_url},
+            )
         )
 
 
@@ -212,10 +386,13 @@ class ResourcingRequestFinishAmendmentsReviewView(ResourcingRequestActionView):
         resourcing_request.save()
 
         # Notify the requestor that the amendments have been reviewed.
-        send_notification.delay(
-            email_address=resourcing_request.requestor.contact_email,
-            template_id=settings.GOVUK_NOTIFY_FINISHED_AMENDMENTS_REVIEW_TEMPLATE_ID,
-            personalisation={"resourcing_request_url": self.resourcing_request_url},
+        transaction.on_commit(
+            partial(
+                send_notification.delay,
+                email_address=resourcing_request.requestor.contact_email,
+                template_id=settings.GOVUK_NOTIFY_FINISHED_AMENDMENTS_REVIEW_TEMPLATE_ID,
+                personalisation={"resourcing_request_url": self.resourcing_request_url},
+            )
         )
 
         # Notify all the approval groups which had their approvals cleared.
@@ -226,15 +403,23 @@ class ResourcingRequestFinishAmendmentsReviewView(ResourcingRequestActionView):
         ]
 
         for group in re_approval_groups:
-            send_group_notification(
-                group,
-                template_id=settings.GOVUK_NOTIFY_RE_APPROVAL_TEMPLATE_ID,
-                personalisation={"resourcing_request_url": self.resourcing_request_url},
+            transaction.on_commit(
+                partial(
+                    send_group_notification,
+                    group,
+                    template_id=settings.GOVUK_NOTIFY_RE_APPROVAL_TEMPLATE_ID,
+                    personalisation={
+                        "resourcing_request_url": self.resourcing_request_url
+                    },
+                )
             )
 
 
 class ResourcingRequestReviewView(
-    SuccessMessageMixin, FormView, ResourcingRequestBaseView
+    SuccessMessageMixin,
+    ResourcingRequestConditionalMixin,
+    FormView,
+    ResourcingRequestBaseView,
 ):
     form_class = ReviewForm
     template_name = "main/partials/review_form.html"
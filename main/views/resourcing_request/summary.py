@@ -1,3 +1,8 @@
+import functools
+import json
+from dataclasses import dataclass
+from typing import Any
+
 from django import forms
 from django.db import models
 from django.shortcuts import redirect
@@ -12,7 +17,17 @@ from main.models import (
     ResourcingRequest,
     StatementOfWork,
 )
-from main.views.base import ResourcingRequestBaseView
+from main.views.base import ResourcingRequestBaseView, ResourcingRequestConditionalMixin
+
+
+@dataclass(frozen=True)
+class SummaryField:
+    name: str
+    verbose_name: str
+    help_text: str
+    # The attribute which holds the value, or the method which returns it.
+    accessor: str
+    stacked: bool
 
 
 class ModelSummary:
@@ -21,6 +36,8 @@ class ModelSummary:
     fields: list[str] = []
     stacked_fields: list[str] = []
 
+    template_name = "main/partials/summary/section.html"
+
     def __init__(self, instance, summary_fields):
         self.instance = instance
         self.summary_fields = summary_fields
@@ -29,37 +46,57 @@ class ModelSummary:
     def get_fields(cls):
         return [cls.model._meta.get_field(field) for field in cls.fields]
 
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def get_field_plan(cls) -> dict[str, SummaryField]:
+        """Return how to render each of the fields, worked out once per class."""
+        plan = {}
+
+        for field in cls.get_fields():
+            accessor = field.name
+
+            if hasattr(cls.model, f"get_{field.name}_display"):
+                accessor = f"get_{field.name}_display"
+
+            plan[field.name] = SummaryField(
+                name=field.name,
+                verbose_name=capfirst(field.verbose_name),
+                help_text=field.help_text,
+                accessor=accessor,
+                stacked=field.name in cls.stacked_fields,
+            )
+
+        return plan
+
     @classmethod
     def get_choices(cls):
         return [
-            (field.name, capfirst(field.verbose_name)) for field in cls.get_fields()
+            (field.name, field.verbose_name) for field in cls.get_field_plan().values()
         ]
 
-    def get_value(self, field_name):
-        if hasattr(self.instance, f"get_{field_name}_display"):
-            return getattr(self.instance, f"get_{field_name}_display")
+    def get_rows(self) -> list[tuple[SummaryField, Any]]:
+        plan = self.get_field_plan()
+        rows = []
 
-        return getattr(self.instance, field_name)
+        for field_name in self.summary_fields:
+            # The field may have been removed since the user chose it.
+            if field_name not in plan:
+                continue
 
-    def get_field_template(self, field_name):
-        if field_name in self.stacked_fields:
-            return "main/partials/summary/stacked.html"
+            field = plan[field_name]
+            value = getattr(self.instance, field.accessor)
 
-        return "main/partials/summary/inline.html"
+            if callable(value):
+                value = value()
 
-    def render_fields(self):
-        for field_name in self.summary_fields:
-            template = self.get_field_template(field_name)
-            field = self.model._meta.get_field(field_name)
-
-            yield render_to_string(
-                template,
-                {
-                    "name": field.verbose_name,
-                    "help_text": field.help_text,
-                    "value": self.get_value(field_name),
-                },
-            )
+            rows.append((field, value))
+
+        return rows
+
+    def render(self) -> str:
+        return render_to_string(
+            self.template_name, {"heading": self.heading, "rows": self.get_rows()}
+        )
 
 
 class ResourcingRequestSummary(ModelSummary):
@@ -149,8 +186,16 @@ class InterimRequestSummary(ModelSummary):
     ]
 
 
-class ResourcingRequestSummaryView(TemplateView, ResourcingRequestBaseView):
+class ResourcingRequestSummaryView(
+    ResourcingRequestConditionalMixin, TemplateView, ResourcingRequestBaseView
+):
     template_name = "main/resourcingrequest_summary_view.html"
+    resourcing_request_parts = ["people", "supporting_documents", "financial_codes"]
+
+    def get_etag_data(self) -> list[str]:
+        summary_fields = json.dumps(self.request.user.summary_fields, sort_keys=True)
+
+        return [*super().get_etag_data(), summary_fields]
 
     def get_context_data(self, **kwargs):
         summary_fields = self.request.user.summary_fields
@@ -220,6 +265,7 @@ class EditSummaryForm(forms.Form):
 
 class ResourcingRequestEditSummaryView(TemplateView, ResourcingRequestBaseView):
     template_name = "main/resourcingrequest_summary_edit.html"
+    resourcing_request_parts = []
 
     def get_context_data(self, **kwargs):
         fields = self.request.user.summary_fields
@@ -1,10 +1,19 @@
+from functools import partial
+from pathlib import Path
 from typing import ClassVar
 
+from django.contrib import messages
 from django.contrib.auth.mixins import PermissionRequiredMixin
-from django.db import models
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db import models, transaction
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
+from django.utils.cache import add_never_cache_headers
+from django.views import View
 from django.views.generic.detail import DetailView
 from django.views.generic.edit import CreateView, DeleteView, UpdateView
 
+from change_log.models import ChangeProjection
 from main.forms.forms import (
     CestDocumentForm,
     FinancialInformationForm,
@@ -17,8 +26,11 @@ from main.models import (
     JobDescription,
     SdsStatusDetermination,
 )
+from main.services.direct_upload import DirectUploadError, DirectUploadService
+from main.services.download import get_download_url
 from main.services.event_log import EventLogMixin, EventType
-from main.views.base import ResourcingRequestBaseView
+from main.tasks import store_cest_document_blob
+from main.views.base import ResourcingRequestBaseView, ResourcingRequestConditionalMixin
 from main.views.mixins import FormMixin
 
 from .resourcing_request import CanEditResourcingRequestMixin
@@ -41,7 +53,10 @@ class SupportingDocumentCreateView(
 
 
 class SupportingDocumentDetailView(
-    PermissionRequiredMixin, DetailView, ResourcingRequestBaseView
+    PermissionRequiredMixin,
+    ResourcingRequestConditionalMixin,
+    DetailView,
+    ResourcingRequestBaseView,
 ):
     # Class attributes
     # Django
@@ -57,7 +72,9 @@ class SupportingDocumentDetailView(
         obj = context["object"]
 
         object_changes = (
-            obj.change_log.get_changes() if hasattr(obj, "change_log") else {}
+            ChangeProjection.objects.get_previous_values(obj)
+            if hasattr(obj, "change_log")
+            else {}
         )
 
         context_ext = {
@@ -151,7 +168,40 @@ class JobDescriptionUpdateView(SupportingDocumentUpdateView):
     title = "Job description"
 
 
-class CestDocumentCreateView(SupportingDocumentCreateView):
+class CestDocumentDirectUploadMixin:
+    """Upload the file straight to the bucket when files are stored in S3.
+
+    The form then posts to S3 instead of the view, and S3 redirects to
+    `CestDocumentConfirmUploadView` once the file is uploaded.
+    """
+
+    def get_template_names(self):
+        if DirectUploadService.is_enabled():
+            return ["main/cest_document_form.html"]
+
+        return super().get_template_names()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        if DirectUploadService.is_enabled():
+            context["upload_policy"] = DirectUploadService.get_policy(
+                self.resourcing_request,
+                self.request.user,
+                self.request.build_absolute_uri(
+                    reverse(
+                        "cest-document-confirm-upload",
+                        kwargs={"resourcing_request_pk": self.resourcing_request.pk},
+                    )
+                ),
+            )
+
+        return context
+
+
+class CestDocumentCreateView(
+    CestDocumentDirectUploadMixin, SupportingDocumentCreateView
+):
     model = CestDocument
     form_class = CestDocumentForm
     permission_required = "main.add_cestdocument"
@@ -159,7 +209,9 @@ class CestDocumentCreateView(SupportingDocumentCreateView):
     title = "CEST document"
 
 
-class CestDocumentUpdateView(SupportingDocumentUpdateView):
+class CestDocumentUpdateView(
+    CestDocumentDirectUploadMixin, SupportingDocumentUpdateView
+):
     model = CestDocument
     form_class = CestDocumentForm
     permission_required = "main.change_cestdocument"
@@ -167,6 +219,105 @@ class CestDocumentUpdateView(SupportingDocumentUpdateView):
     title = "CEST document"
 
 
+class CestDocumentConfirmUploadView(
+    EventLogMixin,
+    PermissionRequiredMixin,
+    ResourcingRequestBaseView,
+):
+    """Record a CEST document which was uploaded straight to the bucket."""
+
+    event_methods = ["get"]
+    event_context = {"object": "CEST document"}
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+
+        self.cest_document = CestDocument.objects.filter(
+            resourcing_request=self.resourcing_request
+        ).first()
+        self.event_type = EventType.UPDATED if self.cest_document else EventType.CREATED
+
+    def get_permission_required(self):
+        if self.cest_document:
+            return ["main.change_cestdocument"]
+
+        return ["main.add_cestdocument"]
+
+    def get(self, request, *args, **kwargs):
+        if self.cest_document and not self.resourcing_request.can_update:
+            raise ValidationError("Cannot edit contractor request")
+
+        try:
+            name = DirectUploadService.confirm(
+                self.resourcing_request,
+                request.user,
+                token=request.GET.get("token", ""),
+                key=request.GET.get("key", ""),
+            )
+        except DirectUploadError as e:
+            self.event_success = False
+            messages.error(request, str(e))
+
+            if self.cest_document:
+                return redirect(
+                    "cest-document-update",
+                    resourcing_request_pk=self.resourcing_request.pk,
+                    supporting_document_pk=self.cest_document.pk,
+                )
+
+            return redirect(
+                "cest-document-create",
+                resourcing_request_pk=self.resourcing_request.pk,
+            )
+
+        if self.cest_document is None:
+            self.cest_document = CestDocument(
+                resourcing_request=self.resourcing_request
+            )
+
+        self.cest_document.file.name = name
+        self.cest_document.file_name = Path(name).name
+        self.cest_document.save()
+
+        # The upload is moved into a blob by a worker, as that has to read the file.
+        transaction.on_commit(
+            partial(store_cest_document_blob.delay, self.cest_document.pk, name)
+        )
+
+        return redirect(self.cest_document)
+
+    def get_event_content_object(self) -> models.Model:
+        return self.resourcing_request
+
+
+class CestDocumentDownloadView(PermissionRequiredMixin, View):
+    """Redirect to a signed URL for the CEST document.
+
+    Pages link here rather than to the file, so rendering them doesn't sign URLs and
+    the links don't expire.
+    """
+
+    permission_required = "main.view_cestdocument"
+
+    def get(self, request, pk):
+        cest_document = get_object_or_404(
+            CestDocument.objects.select_related("resourcing_request"), pk=pk
+        )
+        user = request.user
+
+        # The same check as `CanAccessResourcingRequestMixin`.
+        if not (
+            user.pk == cest_document.resourcing_request.requestor_id or user.is_approver
+        ):
+            raise PermissionDenied
+
+        response = redirect(get_download_url(cest_document.file.name))
+        # The signed URL expires, so the redirect mustn't be reused.
+        add_never_cache_headers(response)
+
+        return response
+
+
 SDS_FORM_HELP_TEXT = (
     "This form is not required until after approvals, and the person has been hired."
 )
@@ -1,7 +1,9 @@
 from django.db.models import JSONField
+from django.db.models.signals import pre_save
 
 import quill.forms.fields as fields
-from quill.utils import validate_value
+from quill.renderer import render_html
+from quill.utils import extract_text, validate_value
 
 
 class QuillField(JSONField):
@@ -10,12 +12,51 @@ class QuillField(JSONField):
     - The default is fixed to an empty dict.
     - The associated form field and widget will normalize empty values to an empty dict.
     - `null=True` is supported if you need it.
+    - `text_field` and `html_field` name fields on the model which are kept up to
+      date with the plain text and the rendered HTML of the delta when it is saved,
+      so reading either doesn't need the delta. Include them in `update_fields`
+      along with this field.
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, text_field=None, html_field=None, **kwargs):
+        self.text_field = text_field
+        self.html_field = html_field
+
         kwargs["default"] = dict
         super().__init__(*args, **kwargs)
 
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+
+        if self.text_field:
+            kwargs["text_field"] = self.text_field
+
+        if self.html_field:
+            kwargs["html_field"] = self.html_field
+
+        return name, path, args, kwargs
+
+    # Django provides this method as a hook for modifying the model class.
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+
+        if cls._meta.abstract or not (self.text_field or self.html_field):
+            return
+
+        pre_save.connect(self.update_derived_fields, sender=cls, weak=False)
+
+    def update_derived_fields(self, sender, instance, raw=False, **kwargs):
+        if raw:
+            return
+
+        value = getattr(instance, self.attname)
+
+        if self.text_field:
+            setattr(instance, self.text_field, extract_text(value))
+
+        if self.html_field:
+            setattr(instance, self.html_field, "".join(render_html(value)))
+
     def validate(self, value, model_instance):
         super().validate(value, model_instance)
 
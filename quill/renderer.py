@@ -0,0 +1,174 @@
+"""Render Quill deltas to HTML on the server.
+
+Only the formats offered by the editor's toolbar are rendered, each to a fixed tag.
+Anything else in the delta, such as embeds or unknown attributes, is dropped.
+"""
+from collections.abc import Iterable, Iterator
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from django.utils.html import escape
+
+
+# Line formats, keyed by the value of their attribute.
+HEADER_TAGS = {1: "h1", 2: "h2", 3: "h3"}
+LIST_TAGS = {"bullet": "ul", "ordered": "ol"}
+PARAGRAPH_TAG = "p"
+
+# Inline formats, outermost first.
+INLINE_TAGS = {
+    "bold": "strong",
+    "italic": "em",
+    "underline": "u",
+    "strike": "s",
+}
+LINK_SCHEMES = {"http", "https", "mailto"}
+# The editor's limit on indenting lists.
+MAX_INDENT = 8
+
+Line = tuple[list[tuple[str, dict[str, Any]]], dict[str, Any]]
+
+
+def get_ops(value) -> list[dict[str, Any]]:
+    if value in ({}, None):
+        return []
+
+    return value["delta"]["ops"]
+
+
+def iter_text(value) -> Iterator[str]:
+    """Yield the text of each op in a Quill field's value."""
+    for op in get_ops(value):
+        if isinstance(op.get("insert"), str):
+            yield op["insert"]
+
+
+def iter_lines(ops: Iterable[dict[str, Any]]) -> Iterator[Line]:
+    """Yield the inline text and attributes, and the line attributes, of each line.
+
+    Quill puts a line's format on the newline which ends it, so only the current
+    line is held on to.
+    """
+    segments = []
+
+    for op in ops:
+        insert = op.get("insert")
+
+        if not isinstance(insert, str):
+            continue
+
+        attributes = op.get("attributes") or {}
+        text, *rest = insert.split("\n")
+
+        if text:
+            segments.append((text, attributes))
+
+        for text in rest:
+            yield segments, attributes
+            segments = []
+
+            if text:
+                segments.append((text, attributes))
+
+    if segments:
+        yield segments, {}
+
+
+def get_link(attributes: dict[str, Any]) -> Optional[str]:
+    link = attributes.get("link")
+
+    if not isinstance(link, str):
+        return None
+
+    try:
+        scheme = urlsplit(link).scheme
+    except ValueError:
+        return None
+
+    if scheme.lower() not in LINK_SCHEMES:
+        return None
+
+    return link
+
+
+def render_inline(text: str, attributes: dict[str, Any]) -> Iterator[str]:
+    tags = [tag for name, tag in INLINE_TAGS.items() if attributes.get(name)]
+    link = get_link(attributes)
+
+    if link:
+        yield f'<a href="{escape(link)}">'
+
+    for tag in tags:
+        yield f"<{tag}>"
+
+    yield escape(text)
+
+    for tag in reversed(tags):
+        yield f"</{tag}>"
+
+    if link:
+        yield "</a>"
+
+
+def render_line(segments: list[tuple[str, dict[str, Any]]]) -> Iterator[str]:
+    if not segments:
+        yield "<br>"
+
+    for text, attributes in segments:
+        yield from render_inline(text, attributes)
+
+
+def get_tag(tags: dict, value) -> Optional[str]:
+    # Attribute values come from the client, so they might not be hashable.
+    return tags.get(value) if isinstance(value, (str, int)) else None
+
+
+def get_indent(attributes: dict[str, Any]) -> int:
+    indent = attributes.get("indent")
+
+    if not isinstance(indent, int) or isinstance(indent, bool):
+        return 0
+
+    return max(0, min(indent, MAX_INDENT))
+
+
+def render_html(value) -> Iterator[str]:
+    """Yield the HTML for a Quill field's value, a piece at a time.
+
+    Example:
+        html = "".join(render_html(job_description.description))
+    """
+    # The tag of each open list, outermost first. Every open list has an open item.
+    lists = []
+
+    for segments, attributes in iter_lines(get_ops(value)):
+        list_tag = get_tag(LIST_TAGS, attributes.get("list"))
+
+        if list_tag is None:
+            while lists:
+                yield f"</li></{lists.pop()}>"
+
+            tag = get_tag(HEADER_TAGS, attributes.get("header")) or PARAGRAPH_TAG
+
+            yield f"<{tag}>"
+            yield from render_line(segments)
+            yield f"</{tag}>"
+
+            continue
+
+        depth = get_indent(attributes) + 1
+
+        while len(lists) > depth or (len(lists) == depth and lists[-1] != list_tag):
+            yield f"</li></{lists.pop()}>"
+
+        if len(lists) == depth:
+            yield "</li><li>"
+
+        while len(lists) < depth:
+            yield f"<{list_tag}><li>"
+            lists.append(list_tag)
+
+        yield from render_line(segments)
+
+    while lists:
+        yield f"</li></{lists.pop()}>"
@@ -1,7 +1,8 @@
 import pytest
 from django.core.exceptions import ValidationError
 
-from quill.utils import validate_value
+from quill.renderer import render_html
+from quill.utils import extract_text, validate_value
 
 
 @pytest.mark.parametrize(
@@ -26,3 +27,65 @@ def test_validate_value_with_valid_value(value):
 def test_validate_value_with_invalid_value(value, message):
     with pytest.raises(ValidationError, match=message):
         validate_value(value)
+
+
+def _value(*ops):
+    return {"delta": {"ops": list(ops)}}
+
+
+@pytest.mark.parametrize(
+    ["value", "html"],
+    [
+        ({}, ""),
+        (_value({"insert": "Hello\n"}), "<p>Hello</p>"),
+        (_value({"insert": "No newline"}), "<p>No newline</p>"),
+        (_value({"insert": "a\n\nb\n"}), "<p>a</p><p><br></p><p>b</p>"),
+        (
+            _value({"insert": "Title"}, {"insert": "\n", "attributes": {"header": 2}}),
+            "<h2>Title</h2>",
+        ),
+        (
+            _value(
+                {"insert": "bold", "attributes": {"bold": True, "italic": True}},
+                {"insert": " <script>\n"},
+            ),
+            "<p><strong><em>bold</em></strong> &lt;script&gt;</p>",
+        ),
+        (
+            _value(
+                {"insert": "link", "attributes": {"link": "https://a.com?b=1&c=2"}},
+                {"insert": "bad", "attributes": {"link": "javascript:alert(1)"}},
+                {"insert": "\n"},
+            ),
+            '<p><a href="https://a.com?b=1&amp;c=2">link</a>bad</p>',
+        ),
+        (
+            _value(
+                {"insert": "one"},
+                {"insert": "\n", "attributes": {"list": "bullet"}},
+                {"insert": "nested"},
+                {"insert": "\n", "attributes": {"list": "ordered", "indent": 1}},
+                {"insert": "two"},
+                {"insert": "\n", "attributes": {"list": "bullet"}},
+                {"insert": "after\n"},
+            ),
+            "<ul><li>one<ol><li>nested</li></ol></li><li>two</li></ul><p>after</p>",
+        ),
+        (
+            _value(
+                {"insert": {"image": "https://a.com/a.png"}},
+                {"insert": "text", "attributes": {"color": "red", "script": "sub"}},
+                {"insert": "\n", "attributes": {"header": [1], "align": "center"}},
+            ),
+            "<p>text</p>",
+        ),
+    ],
+)
+def test_render_html(value, html):
+    assert "".join(render_html(value)) == html
+
+
+def test_extract_text_skips_embeds():
+    value = _value({"insert": "a"}, {"insert": {"image": "a.png"}}, {"insert": "b\n"})
+
+    assert extract_text(value) == "ab\n"
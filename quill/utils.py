@@ -1,5 +1,7 @@
 from django.core.exceptions import ValidationError
 
+from quill.renderer import iter_text
+
 
 def validate_value(value):
     if value is None:
@@ -24,13 +26,4 @@ def validate_value(value):
 
 
 def extract_text(value) -> str:
-    if value in ({}, None):
-        return ""
-
-    ops = value["delta"]["ops"]
-
-    text = []
-    for op in ops:
-        text.append(op["insert"])
-
-    return "".join(text)
+    return "".join(iter_text(value))
@@ -0,0 +1,13 @@
+from django.contrib.auth import backends
+
+from user.permissions import get_permission_snapshot
+
+
+class ModelBackend(backends.ModelBackend):
+    """A `ModelBackend` which reads the permissions from the permission snapshot."""
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return super().get_all_permissions(user_obj, obj=obj)
+
+        return get_permission_snapshot(user_obj).permissions
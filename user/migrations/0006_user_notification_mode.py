@@ -0,0 +1,25 @@
+# Generated by Django 3.2.13 on 2026-10-18 14:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0005_user_preferred_email"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="notification_mode",
+            field=models.CharField(
+                choices=[
+                    ("immediate", "Send each notification straight away"),
+                    ("digest", "Send a digest of my notifications"),
+                ],
+                default="immediate",
+                max_length=20,
+            ),
+        ),
+    ]
@@ -4,8 +4,8 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.urls import reverse
 
-from main.constants import GROUP_APPROVER_PK
 from main.models import Approval
+from user.permissions import get_permission_snapshot
 
 
 SummaryConfigFields = dict[str, list[str]]
@@ -16,12 +16,21 @@ class SummaryConfig(TypedDict):
 
 
 class User(AbstractUser):
+    class NotificationMode(models.TextChoices):
+        IMMEDIATE = "immediate", "Send each notification straight away"
+        DIGEST = "digest", "Send a digest of my notifications"
+
     profession = models.ForeignKey(
         "main.Profession", models.PROTECT, null=True, blank=True
     )
 
     summary_config = models.JSONField(default=dict)
     preferred_email = models.EmailField(null=True, blank=True)
+    notification_mode = models.CharField(
+        max_length=20,
+        choices=NotificationMode.choices,
+        default=NotificationMode.IMMEDIATE,
+    )
 
     def __str__(self):
         return self.get_full_name() or self.get_username()
@@ -31,16 +40,16 @@ class User(AbstractUser):
 
     @property
     def is_in_approver_group(self):
-        return self.groups.filter(pk=GROUP_APPROVER_PK).exists()
+        return get_permission_snapshot(self).is_in_approver_group
 
     @property
     def is_approver(self):
-        return any(
-            self.has_perm(f"main.can_give_{x.value}_approval") for x in Approval.Type
-        )
+        return self.is_active and get_permission_snapshot(self).is_approver
 
     def has_approval_perm(self, approval_type):
-        return self.has_perm(f"main.can_give_{approval_type.value}_approval")
+        return self.is_active and get_permission_snapshot(self).has_approval_perm(
+            approval_type
+        )
 
     @property
     def is_head_of_profession(self):
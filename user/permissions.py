@@ -0,0 +1,126 @@
+import functools
+import hashlib
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db import transaction
+
+from main.constants import GROUP_APPROVER_PK
+from main.models import Approval
+
+
+APPROVAL_TYPES = list(Approval.Type)
+
+# The snapshots are kept in the shared cache and invalidated explicitly, the timeout
+# only bounds how long a missed invalidation can last.
+CACHE_TIMEOUT = 60 * 60
+VERSION_CACHE_KEY = "user:permission-snapshot:version"
+
+
+@dataclass(frozen=True)
+class PermissionSnapshot:
+    """Everything we need to know about what a user is allowed to do."""
+
+    permissions: frozenset[str]
+    # Bit `i` is set if the user can give the `APPROVAL_TYPES[i]` approval.
+    approval_types: int
+    is_in_approver_group: bool
+
+    def has_approval_perm(self, approval_type: Approval.Type) -> bool:
+        return bool(self.approval_types & 1 << APPROVAL_TYPES.index(approval_type))
+
+    @property
+    def is_approver(self) -> bool:
+        return self.approval_types != 0
+
+    @functools.cached_property
+    def fingerprint(self) -> str:
+        """A short hash which is the same for users with the same permissions."""
+        data = "\n".join(sorted(self.permissions)).encode("utf-8")
+
+        return hashlib.sha256(data).hexdigest()[:16]
+
+
+def build_permission_snapshot(user) -> PermissionSnapshot:
+    # Imported here as `user.models` depends on this module.
+    from django.contrib.auth.backends import ModelBackend
+
+    permissions = frozenset(ModelBackend().get_all_permissions(user))
+
+    approval_types = 0
+
+    for i, approval_type in enumerate(APPROVAL_TYPES):
+        if f"main.can_give_{approval_type.value}_approval" in permissions:
+            approval_types |= 1 << i
+
+    return PermissionSnapshot(
+        permissions=permissions,
+        approval_types=approval_types,
+        is_in_approver_group=user.groups.filter(pk=GROUP_APPROVER_PK).exists(),
+    )
+
+
+def _get_cache_key(user_pk: int) -> str:
+    # Seed the version with the time so a lost version key can't bring back
+    # snapshots from an earlier version.
+    version = cache.get_or_set(VERSION_CACHE_KEY, int(time.time()), timeout=None)
+
+    return f"user:{user_pk}:permission-snapshot:{version}"
+
+
+def get_permission_snapshot(user) -> PermissionSnapshot:
+    """Return the user's permission snapshot.
+
+    The snapshot is kept on the user instance and in the cache, so after the first
+    request it can be read without any queries.
+    """
+    if hasattr(user, "_permission_snapshot"):
+        return user._permission_snapshot
+
+    cache_key = _get_cache_key(user.pk)
+    snapshot = cache.get(cache_key)
+
+    if snapshot is None:
+        snapshot = build_permission_snapshot(user)
+        cache.set(cache_key, snapshot, timeout=CACHE_TIMEOUT)
+
+    user._permission_snapshot = snapshot
+
+    return snapshot
+
+
+def get_permission_fingerprint(user) -> str:
+    """Return a key for things which depend on what the user is allowed to see.
+
+    Superusers and inactive users are told apart from users with the same
+    permissions, as `has_perm` treats them differently.
+    """
+    snapshot = get_permission_snapshot(user)
+
+    return f"{int(user.is_active)}{int(user.is_superuser)}{snapshot.fingerprint}"
+
+
+def _delete_permission_snapshot(user_pk: int) -> None:
+    cache.delete(_get_cache_key(user_pk))
+
+
+def _increment_version() -> None:
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        # The version key has gone, so the next read will start a new version.
+        pass
+
+
+def invalidate_permission_snapshot(user_pk: int) -> None:
+    _delete_permission_snapshot(user_pk)
+    # Another process could cache a snapshot built from what it reads before the
+    # change is committed, so it is invalidated again once it is.
+    transaction.on_commit(lambda: _delete_permission_snapshot(user_pk))
+
+
+def invalidate_all_permission_snapshots() -> None:
+    _increment_version()
+    # See `invalidate_permission_snapshot`.
+    transaction.on_commit(_increment_version)
@@ -0,0 +1,47 @@
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from user.models import User
+from user.permissions import (
+    invalidate_all_permission_snapshots,
+    invalidate_permission_snapshot,
+)
+
+
+def user_m2m_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate snapshots when a user's groups or permissions change."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        instance.__dict__.pop("_permission_snapshot", None)
+        invalidate_permission_snapshot(instance.pk)
+    elif pk_set is None:
+        # A reverse clear doesn't tell us which users were affected.
+        invalidate_all_permission_snapshots()
+    else:
+        for user_pk in pk_set:
+            invalidate_permission_snapshot(user_pk)
+
+
+def group_permissions_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_all_permission_snapshots()
+
+
+def user_saved(sender, instance, **kwargs):
+    # For example `is_active` or `is_superuser` might have changed.
+    instance.__dict__.pop("_permission_snapshot", None)
+    invalidate_permission_snapshot(instance.pk)
+
+
+def group_deleted(sender, **kwargs):
+    invalidate_all_permission_snapshots()
+
+
+def connect():
+    m2m_changed.connect(user_m2m_changed, sender=User.groups.through)
+    m2m_changed.connect(user_m2m_changed, sender=User.user_permissions.through)
+    m2m_changed.connect(group_permissions_changed, sender=Group.permissions.through)
+    post_save.connect(user_saved, sender=User)
+    post_delete.connect(group_deleted, sender=Group)
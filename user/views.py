@@ -6,7 +6,7 @@ from user.models import User
 
 class EditUserView(SuccessMessageMixin, UpdateView):
     model = User
-    fields = ["profession", "preferred_email"]
+    fields = ["profession", "preferred_email", "notification_mode"]
     template_name = "user/edit-user.html"
     context_object_name = "user"
     success_message = "User updated"